@@ -0,0 +1,368 @@
+"""
+Simulates many concurrent Nexus clients against a Python agent to find where it saturates.
+
+The agent runs in a subprocess on localhost with a synthetic extension. Each simulated client
+performs the real connection handshake (36-byte connection ID + 4-byte connection type on the
+comm and data channels), initializes the connection, sets the context and then issues a
+configurable mix of metadata and read calls. For each concurrency level the throughput,
+the p50/p99/p999 latencies and the agent's resident set size are reported.
+
+Usage: python benchmarks/python/load_test.py [--concurrency 1,4,16,64] [--duration 10] [--read-ratio 0.5]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import struct
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "agent"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "remoting", "python"))
+
+from apollo3zehn_package_management import PackageReference  # noqa: E402
+from nexus_extensibility import (CatalogItem, CatalogRegistration,  # noqa: E402
+                                 CatalogTimeRange, DataSourceContext,
+                                 IDataSource, NexusDataType, ReadRequest,
+                                 Representation, ResourceBuilder,
+                                 ResourceCatalog, ResourceCatalogBuilder)
+from nexus_remoting import set_status  # noqa: E402
+from nexus_remoting._encoder import JsonEncoder  # noqa: E402
+from nexus_remoting._protocol import (MESSAGE_TYPE_READ_SINGLE,  # noqa: E402
+                                      READ_REQUEST_HEADER,
+                                      READ_RESPONSE_HEADER, to_ticks)
+from nexus_remoting._remoting import _json_encoder_options  # noqa: E402
+
+SAMPLE_PERIOD = timedelta(seconds=1)
+BEGIN = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+#region Agent
+
+@dataclass(frozen=True)
+class SyntheticSettings:
+    read_delay: float = 0
+
+class SyntheticSource(IDataSource[SyntheticSettings]):
+    """A data source that serves zero-filled data without touching any storage."""
+
+    async def set_context(self, context: DataSourceContext[SyntheticSettings], logger):
+        self._context = context
+
+    async def get_catalog_registrations(self, path: str):
+        return [CatalogRegistration("/SYNTHETIC", "Synthetic catalog.")] if path == "/" else []
+
+    async def enrich_catalog(self, catalog: ResourceCatalog):
+        return _create_catalog_item().catalog
+
+    async def get_time_range(self, catalog_id: str):
+        return CatalogTimeRange(BEGIN, BEGIN + timedelta(days=365))
+
+    async def get_availability(self, catalog_id: str, begin: datetime, end: datetime):
+        return 1.0
+
+    async def read(self, begin, end, requests: list[ReadRequest], read_data, report_progress):
+
+        if self._context.source_configuration.read_delay > 0:
+            await asyncio.sleep(self._context.source_configuration.read_delay)
+
+        for request in requests:
+            set_status(request.status, 0, len(request.status))
+
+class _SyntheticExtensionHive:
+
+    def get_extensions(self) -> list[type]:
+        return [SyntheticSource]
+
+    async def load_packages(self, package_reference_map):
+        pass
+
+class _SyntheticPackageService:
+
+    _package_reference_map = { uuid.UUID(int=0): PackageReference("synthetic", {}) }
+
+    async def get_all(self):
+        return self._package_reference_map
+
+def run_agent(port: int):
+
+    from python.services import AgentService
+
+    logging.basicConfig(stream=sys.stderr, level=logging.WARNING)
+
+    agent_service = AgentService(
+        lambda: _SyntheticExtensionHive(), # pyright: ignore
+        _SyntheticPackageService(), # pyright: ignore
+        logging.getLogger(),
+        "127.0.0.1",
+        port
+    )
+
+    async def main():
+        await agent_service.load_packages()
+        await agent_service.accept_clients()
+
+    asyncio.run(main())
+
+#endregion
+
+#region Client
+
+def _create_catalog_item() -> CatalogItem:
+
+    representation = Representation(NexusDataType.FLOAT64, SAMPLE_PERIOD)
+
+    resource = ResourceBuilder("resource1") \
+        .add_representation(representation) \
+        .build()
+
+    catalog = ResourceCatalogBuilder("/SYNTHETIC") \
+        .add_resource(resource) \
+        .build()
+
+    return CatalogItem(catalog, resource, representation, None)
+
+class SimulatedClient:
+    """A minimal Nexus client speaking the agent's wire protocol."""
+
+    def __init__(self, port: int, api_level: int, read_samples: int, read_delay: float):
+        self._port = port
+        self._api_level = api_level
+        self._read_samples = read_samples
+        self._read_delay = read_delay
+        self._next_id = 0
+        self._catalog_item = _create_catalog_item()
+        self._catalog_item_id = -1
+
+    async def connect(self):
+
+        id = str(uuid.uuid4()).encode()
+
+        self._comm_reader, self._comm_writer = await asyncio.open_connection("127.0.0.1", self._port)
+        self._comm_writer.write(id + b"comm")
+
+        self._data_reader, self._data_writer = await asyncio.open_connection("127.0.0.1", self._port)
+        self._data_writer.write(id + b"data")
+
+        self._api_level = await self.call("initialize", f"{SyntheticSource.__module__}.{SyntheticSource.__name__}", self._api_level)
+        await self.call("setContext", { "sourceConfiguration": { "readDelay": self._read_delay } }, "Warning")
+
+        if self._api_level >= 2:
+            self._catalog_item_id = await self.call("registerCatalogItem", "resource1", self._catalog_item)
+
+    async def close(self):
+
+        for writer in (self._comm_writer, self._data_writer):
+            writer.close()
+
+    async def call(self, method: str, *params: Any) -> Any:
+
+        self._next_id += 1
+
+        request = JsonEncoder.encode({
+            "jsonrpc": "2.0",
+            "id": self._next_id,
+            "method": method,
+            "params": list(params)
+        }, _json_encoder_options)
+
+        encoded_request = json.dumps(request).encode()
+        self._comm_writer.write(struct.pack(">I", len(encoded_request)) + encoded_request)
+        await self._comm_writer.drain()
+
+        # skip notifications (log messages)
+        while True:
+
+            size = struct.unpack(">I", await self._comm_reader.readexactly(4))[0]
+            response = json.loads(await self._comm_reader.readexactly(size))
+
+            if response.get("id") == self._next_id:
+                break
+
+        if "error" in response:
+            raise Exception(response["error"]["message"])
+
+        return response["result"]
+
+    async def get_metadata(self):
+
+        method = random.choice(["getCatalogRegistrations", "getTimeRange", "getAvailability"])
+
+        if method == "getCatalogRegistrations":
+            await self.call(method, "/")
+
+        elif method == "getTimeRange":
+            await self.call(method, "/SYNTHETIC")
+
+        else:
+            await self.call(method, "/SYNTHETIC", BEGIN, BEGIN + timedelta(days=1))
+
+    async def read(self):
+
+        end = BEGIN + self._read_samples * SAMPLE_PERIOD
+        byte_count = self._read_samples * (self._catalog_item.representation.element_size + 1)
+
+        if self._api_level >= 2:
+
+            self._data_writer.write(READ_REQUEST_HEADER.pack(MESSAGE_TYPE_READ_SINGLE, to_ticks(BEGIN), to_ticks(end), self._catalog_item_id))
+            await self._data_writer.drain()
+
+            (status_code, message_length) = READ_RESPONSE_HEADER.unpack(await self._data_reader.readexactly(READ_RESPONSE_HEADER.size))
+
+            if status_code != 0:
+                raise Exception((await self._data_reader.readexactly(message_length)).decode())
+
+        else:
+            await self.call("readSingle", BEGIN, end, "resource1", self._catalog_item)
+
+        await self._data_reader.readexactly(byte_count)
+
+@dataclass
+class StageResult:
+    concurrency: int
+    calls: int
+    errors: int
+    elapsed: float
+    latencies: list[float]
+
+async def run_stage(port: int, concurrency: int, duration: float, args: argparse.Namespace) -> StageResult:
+
+    clients = [SimulatedClient(port, args.api_level, args.read_samples, args.read_delay) for _ in range(concurrency)]
+    await asyncio.gather(*(client.connect() for client in clients))
+
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def run_client(client: SimulatedClient):
+
+        nonlocal errors
+
+        while time.perf_counter() < deadline:
+
+            start = time.perf_counter()
+
+            try:
+                if random.random() < args.read_ratio:
+                    await client.read()
+
+                else:
+                    await client.get_metadata()
+
+            except Exception:
+                errors += 1
+
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(client) for client in clients))
+    elapsed = time.perf_counter() - start
+
+    await asyncio.gather(*(client.close() for client in clients))
+
+    return StageResult(concurrency, len(latencies), errors, elapsed, latencies)
+
+def _get_percentile(sorted_values: list[float], percentile: float) -> float:
+
+    if not sorted_values:
+        return float("nan")
+
+    index = min(len(sorted_values) - 1, int(percentile / 100 * len(sorted_values)))
+    return sorted_values[index]
+
+def _get_rss(pid: int) -> Optional[int]:
+
+    try:
+        with open(f"/proc/{pid}/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+
+    except OSError:
+        pass
+
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+
+    except ImportError:
+        return None
+
+async def wait_for_agent(port: int, timeout: float = 10):
+
+    deadline = time.perf_counter() + timeout
+
+    while True:
+
+        try:
+            # an invalid connection ID makes the agent close the probe connection
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"0" * 36 + b"comm")
+            writer.close()
+            return
+
+        except OSError:
+
+            if time.perf_counter() > deadline:
+                raise
+
+            await asyncio.sleep(0.1)
+
+async def run_load_test(args: argparse.Namespace):
+
+    agent_process = subprocess.Popen([sys.executable, __file__, "--agent", "--port", str(args.port)])
+
+    try:
+
+        await wait_for_agent(args.port)
+
+        print(f"{'clients':>8} {'calls':>9} {'errors':>7} {'calls/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'p999 ms':>9} {'agent RSS MiB':>14}")
+
+        for concurrency in args.concurrency:
+
+            result = await run_stage(args.port, concurrency, args.duration, args)
+            latencies = sorted(result.latencies)
+            rss = _get_rss(agent_process.pid)
+
+            print(
+                f"{result.concurrency:>8} "
+                f"{result.calls:>9} "
+                f"{result.errors:>7} "
+                f"{result.calls / result.elapsed:>10.0f} "
+                f"{_get_percentile(latencies, 50) * 1000:>9.2f} "
+                f"{_get_percentile(latencies, 99) * 1000:>9.2f} "
+                f"{_get_percentile(latencies, 99.9) * 1000:>9.2f} "
+                f"{'n/a' if rss is None else f'{rss / 1024 / 1024:.1f}':>14}"
+            )
+
+    finally:
+        agent_process.terminate()
+        agent_process.wait()
+
+#endregion
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=lambda value: [int(item) for item in value.split(",")], default=[1, 4, 16, 64], help="comma-separated list of client counts to ramp through")
+    parser.add_argument("--duration", type=float, default=10, help="duration of each stage in seconds")
+    parser.add_argument("--read-ratio", type=float, default=0.5, help="fraction of calls that are reads (the rest are metadata calls)")
+    parser.add_argument("--read-samples", type=int, default=86400, help="number of float64 samples per read")
+    parser.add_argument("--read-delay", type=float, default=0, help="simulated storage latency per read in seconds")
+    parser.add_argument("--api-level", type=int, default=2, choices=[1, 2], help="protocol API level to request")
+    parser.add_argument("--port", type=int, default=56199, help="port of the agent subprocess")
+    parser.add_argument("--agent", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.agent:
+        run_agent(args.port)
+
+    else:
+        asyncio.run(run_load_test(args))
@@ -0,0 +1,138 @@
+"""
+Compares the agent's JSON-RPC transport settings (event loop, TCP_NODELAY, socket
+buffer sizes and write buffer watermarks) on localhost.
+
+Each scenario emulates the data channel: the client sends a 4-byte size request and
+the server answers with a payload of that size, just like readSingle does.
+
+Usage: python benchmarks/python/socket_tuning.py [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "agent"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "remoting", "python"))
+
+from python.services import SocketOptions, configure_connection  # noqa: E402
+
+@dataclass(frozen=True)
+class Workload:
+    name: str
+    payload_size: int
+    count: int
+
+WORKLOADS = [
+    Workload("small (64 B)", 64, 5000),
+    Workload("medium (64 KiB)", 64 * 1024, 2000),
+    Workload("large (8 MiB)", 8 * 1024 * 1024, 50)
+]
+
+SCENARIOS: dict[str, SocketOptions] = {
+    "default (no tuning)":      SocketOptions(tcp_no_delay=False),
+    "TCP_NODELAY":              SocketOptions(tcp_no_delay=True),
+    "TCP_NODELAY + 4 MiB bufs": SocketOptions(tcp_no_delay=True, send_buffer_size=4 * 1024 * 1024, receive_buffer_size=4 * 1024 * 1024),
+    "TCP_NODELAY + watermarks": SocketOptions(tcp_no_delay=True, write_buffer_high_water_mark=1024 * 1024, write_buffer_low_water_mark=256 * 1024),
+    "all":                      SocketOptions(tcp_no_delay=True, send_buffer_size=4 * 1024 * 1024, receive_buffer_size=4 * 1024 * 1024,
+                                              write_buffer_high_water_mark=1024 * 1024, write_buffer_low_water_mark=256 * 1024)
+}
+
+async def _run_workload(options: SocketOptions, workload: Workload) -> float:
+
+    payload = bytes(workload.payload_size)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+
+        configure_connection(writer, options, is_data_connection=True)
+
+        try:
+            while True:
+                size = struct.unpack(">I", await reader.readexactly(4))[0]
+                writer.write(payload[:size])
+                await writer.drain()
+
+        except asyncio.IncompleteReadError:
+            pass
+
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host="127.0.0.1", port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    async with server:
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        configure_connection(writer, options, is_data_connection=True)
+
+        request = struct.pack(">I", workload.payload_size)
+        start = time.perf_counter()
+
+        for _ in range(workload.count):
+            writer.write(request)
+            await writer.drain()
+            await reader.readexactly(workload.payload_size)
+
+        elapsed = time.perf_counter() - start
+
+        writer.close()
+        await writer.wait_closed()
+
+    return elapsed
+
+def _get_loop_factories() -> dict[str, Callable[[], asyncio.AbstractEventLoop]]:
+
+    factories: dict[str, Callable[[], asyncio.AbstractEventLoop]] = {
+        "asyncio": asyncio.new_event_loop
+    }
+
+    try:
+        import uvloop
+        factories["uvloop"] = uvloop.new_event_loop
+
+    except ImportError:
+        print("uvloop is not installed, only the default event loop is benchmarked\n")
+
+    return factories
+
+def main(rounds: int, loop_name: Optional[str]):
+
+    loop_factories = _get_loop_factories()
+
+    print(f"{'loop':<8} {'scenario':<26} {'workload':<16} {'ops/s':>12} {'MiB/s':>10}")
+
+    for current_loop_name, loop_factory in loop_factories.items():
+
+        if loop_name is not None and current_loop_name != loop_name:
+            continue
+
+        for scenario_name, options in SCENARIOS.items():
+            for workload in WORKLOADS:
+
+                loop = loop_factory()
+
+                try:
+                    elapsed = min(loop.run_until_complete(_run_workload(options, workload)) for _ in range(rounds))
+
+                finally:
+                    loop.close()
+
+                ops_per_second = workload.count / elapsed
+                mib_per_second = workload.count * workload.payload_size / elapsed / 1024 / 1024
+
+                print(f"{current_loop_name:<8} {scenario_name:<26} {workload.name:<16} {ops_per_second:>12.0f} {mib_per_second:>10.1f}")
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3, help="number of rounds per scenario (best is reported)")
+    parser.add_argument("--loop", choices=["asyncio", "uvloop"], default=None, help="benchmark only the given event loop")
+    args = parser.parse_args()
+
+    main(args.rounds, args.loop)
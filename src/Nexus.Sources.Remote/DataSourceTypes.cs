@@ -10,6 +10,12 @@ namespace Nexus.Sources;
 internal interface IJsonRpcServer : IDataSource<JsonElement>
 {
     public Task<int> InitializeAsync(
+        string type,
+        int apiLevel,
+        CancellationToken cancellationToken
+    );
+
+    public Task ResetAsync(
         string type,
         CancellationToken cancellationToken
     );
@@ -21,18 +27,95 @@ internal interface IJsonRpcServer : IDataSource<JsonElement>
 
     public Task SetContextAsync(
         DataSourceContext<JsonElement> context, 
+        LogLevel minimumLogLevel,
         CancellationToken cancellationToken
     );
 
     public Task ReadSingleAsync(
         DateTime begin, 
         DateTime end, 
+        string originalResourceName, 
+        CatalogItem catalogItem, 
+        Aggregation? aggregation,
+        CancellationToken cancellationToken
+    );
+
+    public Task<CatalogTree> GetCatalogTreeAsync(
+        string path,
+        bool includeCatalogs,
+        CancellationToken cancellationToken
+    );
+
+    public Task<int> RegisterCatalogItemAsync(
         string originalResourceName, 
         CatalogItem catalogItem, 
         CancellationToken cancellationToken
     );
 }
 
+/// <summary>
+/// Specifies how the samples of a period are aggregated by the agent.
+/// </summary>
+public enum AggregationKind : byte
+{
+    /// <summary>
+    /// The mean of the valid samples.
+    /// </summary>
+    Mean,
+
+    /// <summary>
+    /// The minimum of the valid samples.
+    /// </summary>
+    Min,
+
+    /// <summary>
+    /// The maximum of the valid samples.
+    /// </summary>
+    Max,
+
+    /// <summary>
+    /// The first valid sample.
+    /// </summary>
+    First,
+
+    /// <summary>
+    /// The last valid sample.
+    /// </summary>
+    Last
+}
+
+/// <summary>
+/// Specifies the data type float64 data are transferred with.
+/// </summary>
+public enum TransferType : byte
+{
+    /// <summary>
+    /// The data type of the representation.
+    /// </summary>
+    Native,
+
+    /// <summary>
+    /// 32-bit floating point values.
+    /// </summary>
+    Float32,
+
+    /// <summary>
+    /// 16-bit integer values which are mapped linearly onto the value range of the transferred data.
+    /// </summary>
+    ScaledInt16
+}
+
+/// <summary>
+/// An aggregation that is applied by the agent before the data are transferred.
+/// </summary>
+/// <param name="Kind">The aggregation kind.</param>
+/// <param name="Period">The target period. Must be a multiple of the sample period.</param>
+public record Aggregation(AggregationKind Kind, TimeSpan Period);
+
+internal record CatalogTreeNode(string Path, CatalogRegistration[] Registrations);
+
+internal record CatalogTree(CatalogTreeNode[] Nodes, ResourceCatalog[]? Catalogs);
+
 internal record LogMessage(LogLevel LogLevel, string Message);
 
 internal class RemoteException(string message, Exception? innerException = default) : Exception(message, innerException)
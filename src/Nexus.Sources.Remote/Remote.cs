@@ -4,6 +4,7 @@ using Nexus.DataModel;
 using Nexus.Extensibility;
 using System.Buffers;
 using System.Reflection;
+using System.Runtime.InteropServices;
 using System.Text.Json;
 using System.Text.RegularExpressions;
 
@@ -13,7 +14,18 @@ public record RemoteSettings(
     Uri RemoteUrl,
     string RemoteType,
     JsonElement RemoteConfiguration
-);
+)
+{
+    /// <summary>
+    /// Enriches all catalogs on the agent during catalog discovery instead of on first access.
+    /// </summary>
+    public bool PreloadCatalogs { get; init; }
+
+    /// <summary>
+    /// Transfers float64 data with reduced precision to save network bandwidth. The data are widened back to float64 after the transfer.
+    /// </summary>
+    public TransferType TransferType { get; init; }
+}
 
 [ExtensionDescription(
     "Provides access to remote databases",
@@ -25,7 +37,17 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
 
     private ReadDataHandler? _readData;
 
-    private static readonly int API_LEVEL = 1;
+    private static readonly int API_LEVEL = 4;
+
+    private int _apiLevel;
+
+    private readonly Dictionary<string, int> _catalogItemIds = [];
+
+    private RemoteSession? _session;
+
+    private bool _isSessionFaulted;
+
+    private RemoteCatalogCache? _catalogCache;
 
     private RemoteCommunicator _communicator = default!;
     
@@ -58,7 +80,7 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
         var thisConfiguration = JsonSerializer
             .Deserialize<RemoteSettings>(configuration, Utilities.JsonSerializerOptions)!;
 
-        var (communicator, rpcServer) = await CreateRemoteCommunicatorAsync(
+        var session = await GetSessionAsync(
             thisConfiguration.RemoteUrl,
             thisConfiguration.RemoteType,
             (_, _, _) => throw new Exception("This should never happen."),
@@ -66,12 +88,22 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
             cancellationToken
         );
 
-        using var comm = communicator;
+        JsonElement upgradedRemoteConfiguration;
 
-        var upgradedRemoteConfiguration = await rpcServer.UpgradeSourceConfigurationAsync(
-            thisConfiguration.RemoteConfiguration,
-            cancellationToken
-        );
+        try
+        {
+            upgradedRemoteConfiguration = await session.RpcServer.UpgradeSourceConfigurationAsync(
+                thisConfiguration.RemoteConfiguration,
+                cancellationToken
+            );
+        }
+        catch
+        {
+            session.Communicator.Dispose();
+            throw;
+        }
+
+        RemoteSessionPool.Return(session);
 
         var upgradedThisConfiguration = thisConfiguration with 
         { 
@@ -88,7 +120,7 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
     {
         Context = context;
 
-        (_communicator, _rpcServer) = await CreateRemoteCommunicatorAsync(
+        _session = await GetSessionAsync(
             context.SourceConfiguration.RemoteUrl, 
             context.SourceConfiguration.RemoteType,
             HandleReadDataAsync,
@@ -96,6 +128,8 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
             cancellationToken
         );
 
+        (_communicator, _rpcServer, _apiLevel) = _session;
+
         logger.LogTrace("Set context to remote client");
 
         var resourceLocator = Context.ResourceLocator;
@@ -109,16 +143,53 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
 
         var timeoutTokenSource = new CancellationTokenSource(TimeSpan.FromMinutes(1));
 
+        // the agent discards filtered messages before encoding them
+        var minimumLogLevel = Enum
+            .GetValues<LogLevel>()
+            .FirstOrDefault(logger.IsEnabled, LogLevel.None);
+
         await _rpcServer.SetContextAsync(
             subContext, 
+            minimumLogLevel,
             timeoutTokenSource.Token
         );
+
+        if (_apiLevel >= 3)
+        {
+            var catalogCacheKey = string.Join('|',
+                context.SourceConfiguration.RemoteUrl,
+                context.SourceConfiguration.RemoteType,
+                resourceLocator,
+                sourceConfiguration.ValueKind == JsonValueKind.Undefined ? default : sourceConfiguration.GetRawText(),
+                JsonSerializer.Serialize(context.RequestConfiguration)
+            );
+
+            _catalogCache = RemoteCatalogCache.Get(catalogCacheKey);
+        }
     }
 
     public async Task<CatalogRegistration[]> GetCatalogRegistrationsAsync(
         string path,
         CancellationToken cancellationToken)
     {
+        if (_catalogCache is not null)
+        {
+            if (_catalogCache.TryGetRegistrations(path, out var cachedRegistrations))
+                return cachedRegistrations;
+
+            /* Discover the whole subtree at once, the child paths are then served from the cache */
+            var treeTimeoutTokenSource = new CancellationTokenSource(TimeSpan.FromMinutes(10));
+            cancellationToken.Register(treeTimeoutTokenSource.Cancel);
+
+            var catalogTree = await _rpcServer
+                .GetCatalogTreeAsync(path, Context.SourceConfiguration.PreloadCatalogs, treeTimeoutTokenSource.Token);
+
+            _catalogCache.Add(catalogTree);
+
+            if (_catalogCache.TryGetRegistrations(path, out cachedRegistrations))
+                return cachedRegistrations;
+        }
+
         var timeoutTokenSource = new CancellationTokenSource(TimeSpan.FromMinutes(1));
         cancellationToken.Register(timeoutTokenSource.Cancel);
 
@@ -132,6 +203,15 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
         ResourceCatalog catalog,
         CancellationToken cancellationToken)
     {
+        /* Preloaded catalogs have been enriched from an empty catalog */
+        if (_catalogCache is not null &&
+            catalog.Properties is null &&
+            catalog.Resources is null &&
+            _catalogCache.TryGetCatalog(catalog.Id, out var cachedCatalog))
+        {
+            return cachedCatalog;
+        }
+
         var timeoutTokenSource = new CancellationTokenSource(TimeSpan.FromMinutes(1));
         cancellationToken.Register(timeoutTokenSource.Cancel);
 
@@ -188,21 +268,56 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
 
             foreach (var (originalResourceName, catalogItem, data, status) in requests)
             {
-                cancellationToken.ThrowIfCancellationRequested();
+                await ReadSingleAsync(begin, end, originalResourceName, catalogItem, aggregation: null, data, status, cancellationToken);
+                progress.Report(++counter / requests.Length);
+            }
+        }
+        finally
+        {
+            _readData = null;
+        }
+    }
 
-                var timeoutTokenSource = new CancellationTokenSource(TimeSpan.FromMinutes(1));
-                cancellationToken.Register(timeoutTokenSource.Cancel);
+    /// <summary>
+    /// Reads data that are aggregated by the agent so that only one value per aggregation period is transferred.
+    /// Periods without any valid sample are NaN and their status is 0.
+    /// </summary>
+    /// <param name="begin">The beginning of the period to read.</param>
+    /// <param name="end">The end of the period to read.</param>
+    /// <param name="originalResourceName">The original resource name.</param>
+    /// <param name="catalogItem">The catalog item of the raw data.</param>
+    /// <param name="aggregation">The aggregation. The period must be a multiple of the sample period.</param>
+    /// <param name="data">The data buffer with one element per aggregation period.</param>
+    /// <param name="status">The status buffer with one element per aggregation period.</param>
+    /// <param name="readData">A delegate to read data from other resources.</param>
+    /// <param name="cancellationToken">A token to cancel the current operation.</param>
+    /// <exception cref="NotSupportedException">The agent does not support aggregated reads (API level &lt; 2).</exception>
+    public async Task ReadAggregatedAsync(
+        DateTime begin,
+        DateTime end,
+        string originalResourceName,
+        CatalogItem catalogItem,
+        Aggregation aggregation,
+        Memory<double> data,
+        Memory<byte> status,
+        ReadDataHandler readData,
+        CancellationToken cancellationToken)
+    {
+        /* Older agents would ignore the aggregation and send raw samples */
+        if (_apiLevel < 2)
+            throw new NotSupportedException("The agent does not support aggregated reads.");
 
-                var elementCount = data.Length / catalogItem.Representation.ElementSize;
+        var periodCount = (end - begin).Ticks / aggregation.Period.Ticks;
 
-                await _rpcServer
-                    .ReadSingleAsync(begin, end, originalResourceName, catalogItem, timeoutTokenSource.Token);
+        if (data.Length != periodCount || status.Length != periodCount)
+            throw new ArgumentException($"The data and status buffers must have a length of {periodCount} elements.");
 
-                await _communicator.ReadRawAsync(data, timeoutTokenSource.Token);
-                await _communicator.ReadRawAsync(status, timeoutTokenSource.Token);
+        _readData = readData;
 
-                progress.Report(++counter / requests.Length);
-            }
+        try
+        {
+            var byteData = new CastMemoryManager<double, byte>(data).Memory;
+            await ReadSingleAsync(begin, end, originalResourceName, catalogItem, aggregation, byteData, status, cancellationToken);
         }
         finally
         {
@@ -210,7 +325,113 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
         }
     }
 
-    private static async Task<(RemoteCommunicator, IJsonRpcServer)> CreateRemoteCommunicatorAsync(
+    private async Task ReadSingleAsync(
+        DateTime begin,
+        DateTime end,
+        string originalResourceName,
+        CatalogItem catalogItem,
+        Aggregation? aggregation,
+        Memory<byte> data,
+        Memory<byte> status,
+        CancellationToken cancellationToken)
+    {
+        cancellationToken.ThrowIfCancellationRequested();
+
+        var timeoutTokenSource = new CancellationTokenSource(TimeSpan.FromMinutes(1));
+        cancellationToken.Register(timeoutTokenSource.Cancel);
+
+        try
+        {
+            var transferType = GetTransferType(catalogItem, aggregation);
+
+            if (_apiLevel >= 2)
+            {
+                var catalogItemId = await GetCatalogItemIdAsync(originalResourceName, catalogItem, timeoutTokenSource.Token);
+
+                await _communicator
+                    .WriteReadRequestAsync(begin, end, catalogItemId, aggregation, transferType, timeoutTokenSource.Token);
+
+                await _communicator.ReadResponseHeaderAsync(timeoutTokenSource.Token);
+            }
+
+            else
+            {
+                await _rpcServer
+                    .ReadSingleAsync(begin, end, originalResourceName, catalogItem, aggregation, timeoutTokenSource.Token);
+            }
+
+            if (transferType == TransferType.Native)
+                await _communicator.ReadRawAsync(data, timeoutTokenSource.Token);
+
+            else
+                await ReadReducedAsync(transferType, data, timeoutTokenSource.Token);
+
+            await _communicator.ReadRawAsync(status, timeoutTokenSource.Token);
+        }
+        catch
+        {
+            /* The data stream may contain unread data now */
+            _isSessionFaulted = true;
+            throw;
+        }
+    }
+
+    private TransferType GetTransferType(CatalogItem catalogItem, Aggregation? aggregation)
+    {
+        /* Aggregated data are always float64 */
+        var isFloat64 = aggregation is not null || catalogItem.Representation.DataType == NexusDataType.FLOAT64;
+
+        return _apiLevel >= 4 && isFloat64
+            ? Context.SourceConfiguration.TransferType
+            : TransferType.Native;
+    }
+
+    private async Task ReadReducedAsync(
+        TransferType transferType,
+        Memory<byte> data,
+        CancellationToken cancellationToken)
+    {
+        var (scale, offset) = transferType == TransferType.ScaledInt16
+            ? await _communicator.ReadScaleHeaderAsync(cancellationToken)
+            : default;
+
+        var elementCount = data.Length / sizeof(double);
+        var transferElementSize = transferType == TransferType.Float32 ? sizeof(float) : sizeof(short);
+        var transferLength = elementCount * transferElementSize;
+
+        using var memoryOwner = MemoryPool<byte>.Shared.Rent(transferLength);
+        var transferData = memoryOwner.Memory[..transferLength];
+
+        await _communicator.ReadRawAsync(transferData, cancellationToken);
+
+        var target = MemoryMarshal.Cast<byte, double>(data.Span);
+
+        if (transferType == TransferType.Float32)
+            TransferConverter.WidenFloat32(MemoryMarshal.Cast<byte, float>(transferData.Span), target);
+
+        else
+            TransferConverter.WidenScaledInt16(MemoryMarshal.Cast<byte, short>(transferData.Span), scale, offset, target);
+    }
+
+    private async Task<int> GetCatalogItemIdAsync(
+        string originalResourceName,
+        CatalogItem catalogItem,
+        CancellationToken cancellationToken)
+    {
+        var key = $"{originalResourceName}|{catalogItem.ToPath()}";
+
+        if (!_catalogItemIds.TryGetValue(key, out var catalogItemId))
+        {
+            catalogItemId = await _rpcServer
+                .RegisterCatalogItemAsync(originalResourceName, catalogItem, cancellationToken);
+
+            _catalogItemIds[key] = catalogItemId;
+        }
+
+        return catalogItemId;
+    }
+
+    private static async Task<RemoteSession> GetSessionAsync(
         Uri remoteUrl,
         string remoteType,
         Func<string, DateTime, DateTime, Task> readData,
@@ -227,6 +448,41 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
         if (port == -1)
             port = DEFAULT_AGENT_PORT;
 
+        /* Reuse an idle session if possible */
+        while (RemoteSessionPool.TryRent(host, port, out var session))
+        {
+            var resetTimeoutTokenSource = new CancellationTokenSource(TimeSpan.FromSeconds(10));
+            cancellationToken.Register(resetTimeoutTokenSource.Cancel);
+
+            try
+            {
+                session.Communicator.Attach(readData, logger);
+                await session.RpcServer.ResetAsync(remoteType, resetTimeoutTokenSource.Token);
+
+                return session;
+            }
+            catch (Exception ex)
+            {
+                /* the agent has closed the connection or does not support resets */
+                logger.LogDebug(ex, "Unable to reuse remote session");
+                session.Communicator.Dispose();
+
+                cancellationToken.ThrowIfCancellationRequested();
+            }
+        }
+
+        return await CreateSessionAsync(host, port, remoteType, readData, logger, cancellationToken);
+    }
+
+    private static async Task<RemoteSession> CreateSessionAsync(
+        string host,
+        int port,
+        string remoteType,
+        Func<string, DateTime, DateTime, Task> readData,
+        ILogger logger,
+        CancellationToken cancellationToken
+    )
+    {
         var communicator = new RemoteCommunicator(
             host,
             port,
@@ -237,13 +493,21 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
         var timeoutTokenSource = new CancellationTokenSource(TimeSpan.FromMinutes(1));
         cancellationToken.Register(timeoutTokenSource.Cancel);
 
-        var rpcServer = await communicator.ConnectAsync(timeoutTokenSource.Token);
-        var apiVersion = await rpcServer.InitializeAsync(remoteType, timeoutTokenSource.Token);
+        try
+        {
+            var rpcServer = await communicator.ConnectAsync(timeoutTokenSource.Token);
+            var apiVersion = await rpcServer.InitializeAsync(remoteType, API_LEVEL, timeoutTokenSource.Token);
 
-        if (apiVersion < 1 || apiVersion > API_LEVEL)
-            throw new Exception($"The API level '{apiVersion}' is not supported.");
+            if (apiVersion < 1 || apiVersion > API_LEVEL)
+                throw new Exception($"The API level '{apiVersion}' is not supported.");
 
-        return (communicator, rpcServer);
+            return new RemoteSession(communicator, rpcServer, apiVersion);
+        }
+        catch
+        {
+            communicator.Dispose();
+            throw;
+        }
     }
 
     // copy from Nexus -> DataModelUtilities
@@ -294,9 +558,14 @@ public partial class Remote : IDataSource<RemoteSettings>, IUpgradableDataSource
     {
         if (!_disposedValue)
         {
-            if (disposing)
+            if (disposing && _session is not null)
             {
-                _communicator?.Dispose();
+                /* Keep healthy sessions for the next data source instance */
+                if (_isSessionFaulted)
+                    _session.Communicator.Dispose();
+
+                else
+                    RemoteSessionPool.Return(_session);
             }
 
             _disposedValue = true;
@@ -0,0 +1,65 @@
+using System.Collections.Concurrent;
+using System.Diagnostics.CodeAnalysis;
+using Nexus.DataModel;
+
+namespace Nexus.Sources;
+
+/// <summary>
+/// Keeps the catalog registrations (and optionally the enriched catalogs) that have been discovered
+/// with a single getCatalogTree call, so that the data source instances Nexus creates during catalog
+/// discovery do not need a round trip per path.
+/// </summary>
+internal class RemoteCatalogCache
+{
+    /* Covers a discovery run, later reloads see changes of the agent */
+    private static readonly TimeSpan MAX_AGE = TimeSpan.FromMinutes(1);
+
+    private static readonly ConcurrentDictionary<string, RemoteCatalogCache> _caches = new();
+
+    private readonly ConcurrentDictionary<string, CatalogRegistration[]> _registrations = new();
+
+    private readonly ConcurrentDictionary<string, ResourceCatalog> _catalogs = new();
+
+    private readonly DateTime _createdAt = DateTime.UtcNow;
+
+    public static RemoteCatalogCache Get(string key)
+    {
+        return _caches.AddOrUpdate(
+            key,
+            _ => new RemoteCatalogCache(),
+            (_, cache) => cache.IsExpired ? new RemoteCatalogCache() : cache
+        );
+    }
+
+    private bool IsExpired => DateTime.UtcNow - _createdAt >= MAX_AGE;
+
+    public void Add(CatalogTree catalogTree)
+    {
+        foreach (var (path, registrations) in catalogTree.Nodes)
+        {
+            _registrations[NormalizePath(path)] = registrations;
+        }
+
+        foreach (var catalog in catalogTree.Catalogs ?? [])
+        {
+            _catalogs[catalog.Id] = catalog;
+        }
+    }
+
+    public bool TryGetRegistrations(string path, [NotNullWhen(true)] out CatalogRegistration[]? registrations)
+    {
+        registrations = default;
+        return !IsExpired && _registrations.TryGetValue(NormalizePath(path), out registrations);
+    }
+
+    public bool TryGetCatalog(string catalogId, [NotNullWhen(true)] out ResourceCatalog? catalog)
+    {
+        catalog = default;
+        return !IsExpired && _catalogs.TryGetValue(catalogId, out catalog);
+    }
+
+    private static string NormalizePath(string path)
+    {
+        return path.EndsWith('/') ? path : path + '/';
+    }
+}
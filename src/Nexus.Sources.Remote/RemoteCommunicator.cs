@@ -1,4 +1,5 @@
-﻿using System.Net.Sockets;
+﻿using System.Buffers.Binary;
+using System.Net.Sockets;
 using System.Text;
 using Microsoft.Extensions.Logging;
 using StreamJsonRpc;
@@ -7,6 +8,26 @@ namespace Nexus.Sources;
 
 internal class RemoteCommunicator : IDisposable
 {
+    private const byte MESSAGE_TYPE_READ_SINGLE = 1;
+
+    private const byte MESSAGE_TYPE_READ_AGGREGATED = 2;
+
+    private const byte MESSAGE_TYPE_READ_SINGLE_REDUCED = 3;
+
+    private const byte MESSAGE_TYPE_READ_AGGREGATED_REDUCED = 4;
+
+    private const byte STATUS_CODE_SUCCESS = 0;
+
+    private const int READ_REQUEST_HEADER_SIZE = 21;
+
+    private const int AGGREGATION_HEADER_SIZE = 9;
+
+    private const int TRANSFER_TYPE_HEADER_SIZE = 1;
+
+    private const int READ_RESPONSE_HEADER_SIZE = 5;
+
+    private const int SCALE_HEADER_SIZE = 16;
+
     private readonly string _host;
 
     private readonly int _port;
@@ -21,9 +42,9 @@ internal class RemoteCommunicator : IDisposable
 
     private IJsonRpcServer _rpcServer = default!;
 
-    private readonly ILogger _logger;
+    private ILogger _logger;
 
-    private readonly Func<string, DateTime, DateTime, Task> _readData;
+    private Func<string, DateTime, DateTime, Task> _readData;
 
     public RemoteCommunicator(
         string host,
@@ -38,6 +59,19 @@ internal class RemoteCommunicator : IDisposable
         _logger = logger;
     }
 
+    public string Host => _host;
+
+    public int Port => _port;
+
+    /// <summary>
+    /// Rebinds the read data handler and the logger, e.g. when a pooled session is reused by a new data source instance.
+    /// </summary>
+    public void Attach(Func<string, DateTime, DateTime, Task> readData, ILogger logger)
+    {
+        _readData = readData;
+        _logger = logger;
+    }
+
     public async Task<IJsonRpcServer> ConnectAsync(CancellationToken cancellationToken)
     {
         var id = Guid.NewGuid().ToString();
@@ -71,7 +105,19 @@ internal class RemoteCommunicator : IDisposable
             _logger.Log(logLevel, "{Message}", message);
         }));
 
-        jsonRpc.AddLocalRpcMethod("readData", _readData);
+        jsonRpc.AddLocalRpcMethod("logBatch", new Action<LogMessage[], int>((messages, droppedCount) =>
+        {
+            foreach (var (logLevel, message) in messages)
+            {
+                _logger.Log(logLevel, "{Message}", message);
+            }
+
+            if (droppedCount > 0)
+                _logger.LogWarning("{DroppedCount} log messages have been dropped by the agent", droppedCount);
+        }));
+
+        jsonRpc.AddLocalRpcMethod("readData", new Func<string, DateTime, DateTime, Task>(
+            (resourcePath, begin, end) => _readData(resourcePath, begin, end)));
         jsonRpc.StartListening();
 
         _rpcServer = jsonRpc.Attach<IJsonRpcServer>(new JsonRpcProxyOptions()
@@ -101,6 +147,89 @@ internal class RemoteCommunicator : IDisposable
         return InternalWriteRawAsync(buffer, _dataStream, cancellationToken);
     }
 
+    public async Task WriteReadRequestAsync(
+        DateTime begin,
+        DateTime end,
+        int catalogItemId,
+        Aggregation? aggregation,
+        TransferType transferType,
+        CancellationToken cancellationToken
+    )
+    {
+        if (_dataStream is null)
+            throw new Exception("You need to connect before write any data");
+
+        var isReduced = transferType != TransferType.Native;
+
+        // uint8 message type, int64 begin ticks, int64 end ticks, int32 catalog item id (little-endian)
+        // followed by uint8 aggregation kind, int64 aggregation period ticks (aggregated reads only)
+        // followed by uint8 transfer type (reduced reads only)
+        var header = new byte[
+            READ_REQUEST_HEADER_SIZE + 
+            (aggregation is null ? 0 : AGGREGATION_HEADER_SIZE) + 
+            (isReduced ? TRANSFER_TYPE_HEADER_SIZE : 0)
+        ];
+
+        header[0] = (aggregation is null, isReduced) switch
+        {
+            (true, false) => MESSAGE_TYPE_READ_SINGLE,
+            (false, false) => MESSAGE_TYPE_READ_AGGREGATED,
+            (true, true) => MESSAGE_TYPE_READ_SINGLE_REDUCED,
+            (false, true) => MESSAGE_TYPE_READ_AGGREGATED_REDUCED
+        };
+
+        BinaryPrimitives.WriteInt64LittleEndian(header.AsSpan(1), begin.Ticks);
+        BinaryPrimitives.WriteInt64LittleEndian(header.AsSpan(9), end.Ticks);
+        BinaryPrimitives.WriteInt32LittleEndian(header.AsSpan(17), catalogItemId);
+
+        if (aggregation is not null)
+        {
+            header[READ_REQUEST_HEADER_SIZE] = (byte)aggregation.Kind;
+            BinaryPrimitives.WriteInt64LittleEndian(header.AsSpan(READ_REQUEST_HEADER_SIZE + 1), aggregation.Period.Ticks);
+        }
+
+        if (isReduced)
+            header[^1] = (byte)transferType;
+
+        await _dataStream.WriteAsync(header, cancellationToken);
+        await _dataStream.FlushAsync(cancellationToken);
+    }
+
+    public async Task ReadResponseHeaderAsync(CancellationToken cancellationToken)
+    {
+        if (_dataStream is null)
+            throw new Exception("You need to connect before read any data");
+
+        // uint8 status code, int32 error message length (little-endian)
+        var header = new byte[READ_RESPONSE_HEADER_SIZE];
+        await _dataStream.ReadExactlyAsync(header, cancellationToken);
+
+        if (header[0] != STATUS_CODE_SUCCESS)
+        {
+            var messageLength = BinaryPrimitives.ReadInt32LittleEndian(header.AsSpan(1));
+            var message = new byte[messageLength];
+
+            await _dataStream.ReadExactlyAsync(message, cancellationToken);
+
+            throw new RemoteException(Encoding.UTF8.GetString(message));
+        }
+    }
+
+    public async Task<(double Scale, double Offset)> ReadScaleHeaderAsync(CancellationToken cancellationToken)
+    {
+        if (_dataStream is null)
+            throw new Exception("You need to connect before read any data");
+
+        // float64 scale, float64 offset (little-endian)
+        var header = new byte[SCALE_HEADER_SIZE];
+        await _dataStream.ReadExactlyAsync(header, cancellationToken);
+
+        var scale = BinaryPrimitives.ReadDoubleLittleEndian(header);
+        var offset = BinaryPrimitives.ReadDoubleLittleEndian(header.AsSpan(8));
+
+        return (scale, offset);
+    }
+
     private static async Task InternalWriteRawAsync(
         ReadOnlyMemory<byte> buffer, 
         Stream target, 
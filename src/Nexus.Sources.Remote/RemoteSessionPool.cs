@@ -0,0 +1,66 @@
+using System.Collections.Concurrent;
+using System.Diagnostics.CodeAnalysis;
+
+namespace Nexus.Sources;
+
+internal record RemoteSession(
+    RemoteCommunicator Communicator,
+    IJsonRpcServer RpcServer,
+    int ApiLevel
+)
+{
+    public DateTime ReturnedAt { get; set; }
+}
+
+/// <summary>
+/// Keeps idle, already initialized connection pairs to agents so that new data source
+/// instances can skip the TCP connection and initialization handshake.
+/// </summary>
+internal static class RemoteSessionPool
+{
+    /* The agent closes connections which have been idle for more than a minute */
+    private static readonly TimeSpan MAX_IDLE_TIME = TimeSpan.FromSeconds(30);
+
+    private const int MAX_IDLE_SESSIONS_PER_AGENT = 16;
+
+    private static readonly ConcurrentDictionary<string, ConcurrentStack<RemoteSession>> _idleSessions = new();
+
+    public static bool TryRent(string host, int port, [NotNullWhen(true)] out RemoteSession? session)
+    {
+        if (_idleSessions.TryGetValue(GetKey(host, port), out var sessions))
+        {
+            while (sessions.TryPop(out session))
+            {
+                if (DateTime.UtcNow - session.ReturnedAt < MAX_IDLE_TIME)
+                    return true;
+
+                session.Communicator.Dispose();
+            }
+        }
+
+        session = default;
+        return false;
+    }
+
+    public static void Return(RemoteSession session)
+    {
+        var sessions = _idleSessions.GetOrAdd(
+            GetKey(session.Communicator.Host, session.Communicator.Port),
+            _ => new ConcurrentStack<RemoteSession>()
+        );
+
+        if (sessions.Count >= MAX_IDLE_SESSIONS_PER_AGENT)
+        {
+            session.Communicator.Dispose();
+            return;
+        }
+
+        session.ReturnedAt = DateTime.UtcNow;
+        sessions.Push(session);
+    }
+
+    private static string GetKey(string host, int port)
+    {
+        return $"{host}:{port}";
+    }
+}
@@ -0,0 +1,76 @@
+using System.Numerics;
+
+namespace Nexus.Sources;
+
+/// <summary>
+/// Widens reduced-precision transfer data back to float64.
+/// </summary>
+internal static class TransferConverter
+{
+    /* Marks non-finite values, see ScaledInt16 */
+    private const short INT16_NAN = short.MinValue;
+
+    public static void WidenFloat32(ReadOnlySpan<float> source, Span<double> target)
+    {
+        var i = 0;
+
+        if (Vector.IsHardwareAccelerated)
+        {
+            for (; i <= source.Length - Vector<float>.Count; i += Vector<float>.Count)
+            {
+                Vector.Widen(new Vector<float>(source[i..]), out var lower, out var upper);
+
+                lower.CopyTo(target[i..]);
+                upper.CopyTo(target[(i + Vector<double>.Count)..]);
+            }
+        }
+
+        for (; i < source.Length; i++)
+        {
+            target[i] = source[i];
+        }
+    }
+
+    public static void WidenScaledInt16(ReadOnlySpan<short> source, double scale, double offset, Span<double> target)
+    {
+        var i = 0;
+
+        if (Vector.IsHardwareAccelerated)
+        {
+            var scaleVector = new Vector<double>(scale);
+            var offsetVector = new Vector<double>(offset);
+
+            for (; i <= source.Length - Vector<short>.Count; i += Vector<short>.Count)
+            {
+                /* short -> int -> long -> double */
+                Vector.Widen(new Vector<short>(source[i..]), out var lower, out var upper);
+
+                WidenScaledInt32(lower, scaleVector, offsetVector, target[i..]);
+                WidenScaledInt32(upper, scaleVector, offsetVector, target[(i + Vector<int>.Count)..]);
+            }
+        }
+
+        for (; i < source.Length; i++)
+        {
+            target[i] = source[i] == INT16_NAN
+                ? double.NaN
+                : source[i] * scale + offset;
+        }
+    }
+
+    private static void WidenScaledInt32(Vector<int> source, Vector<double> scale, Vector<double> offset, Span<double> target)
+    {
+        Vector.Widen(source, out var lower, out var upper);
+
+        ScaleInt64(lower, scale, offset).CopyTo(target);
+        ScaleInt64(upper, scale, offset).CopyTo(target[Vector<long>.Count..]);
+    }
+
+    private static Vector<double> ScaleInt64(Vector<long> source, Vector<double> scale, Vector<double> offset)
+    {
+        var result = Vector.ConvertToDouble(source) * scale + offset;
+        var isNaN = Vector.AsVectorDouble(Vector.Equals(source, new Vector<long>(INT16_NAN)));
+
+        return Vector.ConditionalSelect(isNaN, new Vector<double>(double.NaN), result);
+    }
+}
@@ -1,41 +1,156 @@
 import asyncio
 import logging
 import sys
-from contextlib import asynccontextmanager
+import threading
+from contextlib import asynccontextmanager, suppress
+from typing import Optional, Tuple, cast
 
-from apollo3zehn_package_management import ExtensionHive, PackageService
+from apollo3zehn_package_management import (ExtensionHive, PackageController,
+                                            PackageReference, PackageService)
 from fastapi import FastAPI
 from nexus_extensibility import IDataSource
 
-from .options import (config_folder_path, json_rpc_listen_address,
-                      json_rpc_listen_port, packages_folder_path)
-from .routers import package_references
-from .services import AgentService
+from .options import (bulk_concurrency, bulk_concurrency_per_session,
+                      config_folder_path, json_rpc_listen_address,
+                      json_rpc_listen_port, json_rpc_receive_buffer_size,
+                      json_rpc_send_buffer_size, json_rpc_tcp_no_delay,
+                      json_rpc_use_uvloop,
+                      json_rpc_write_buffer_high_water_mark,
+                      json_rpc_write_buffer_low_water_mark,
+                      packages_folder_path, prefetch_memory_budget)
+from .routers import metrics, package_references
+from .services import AgentService, SocketOptions
 
 logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 logger = logging.getLogger()
 
-extension_hive = ExtensionHive[IDataSource](packages_folder_path, logger)
 package_service = PackageService(config_folder_path)
 
+socket_options = SocketOptions(
+    tcp_no_delay=json_rpc_tcp_no_delay,
+    send_buffer_size=json_rpc_send_buffer_size,
+    receive_buffer_size=json_rpc_receive_buffer_size,
+    write_buffer_high_water_mark=json_rpc_write_buffer_high_water_mark,
+    write_buffer_low_water_mark=json_rpc_write_buffer_low_water_mark
+)
+
+def restore_package(package_reference: PackageReference):
+    """
+    Restores a package and its virtual environment, like the extension hive does before it
+    imports the package. This blocks (e.g. pip install), so it is called on a worker thread.
+    """
+
+    package_controller = PackageController(package_reference, logger)
+    asyncio.run(package_controller._restore(packages_folder_path)) # pyright: ignore
+
 agent_service = AgentService(
-    extension_hive, 
-    package_service, 
-    logger, 
-    json_rpc_listen_address, 
-    json_rpc_listen_port
+    lambda: ExtensionHive[IDataSource](packages_folder_path, logger),
+    package_service,
+    logger,
+    json_rpc_listen_address,
+    json_rpc_listen_port,
+    socket_options,
+    prefetch_memory_budget,
+    bulk_concurrency,
+    bulk_concurrency_per_session,
+    restore_package
 )
 
 async def main():
-    await agent_service.load_packages()
-    await agent_service.accept_clients()
+    await agent_service.run()
+
+def run_on_uvloop() -> Optional[Tuple[asyncio.AbstractEventLoop, threading.Thread]]:
+    """
+    Runs the JSON-RPC server on a dedicated thread with its own uvloop event loop until the
+    loop is stopped. Returns the loop and the thread or None if uvloop is not installed.
+    """
+
+    try:
+        import uvloop
+
+    except ImportError:
+        logger.warning("uvloop is not installed, falling back to the default event loop")
+        return None
+
+    logger.info("Run JSON-RPC server on uvloop")
+
+    loop = uvloop.new_event_loop()
+
+    def run():
+
+        asyncio.set_event_loop(loop)
+
+        # the task is referenced by this frame until the loop is closed
+        task = loop.create_task(main())
+        task.add_done_callback(lambda _: loop.stop())
+
+        try:
+            loop.run_forever()
+
+        finally:
+
+            try:
+
+                # cancel the remaining tasks like uvloop.run
+                tasks = asyncio.all_tasks(loop)
+
+                for pending_task in tasks:
+                    pending_task.cancel()
+
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
 
-main_task_reference: asyncio.Task[None] # prevents task to be garbage collected
+            finally:
+                loop.close()
+
+        # raises the exception of main, if any
+        if not task.cancelled():
+            task.result()
+
+    thread = threading.Thread(target=run, name="json-rpc", daemon=True)
+    thread.start()
+
+    return (loop, thread)
+
+main_task_reference: Optional[asyncio.Task[None]] = None # prevents task to be garbage collected
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    main_task_reference = asyncio.create_task(main())
-    yield
+
+    global main_task_reference
+
+    uvloop_server = run_on_uvloop() if json_rpc_use_uvloop else None
+
+    if uvloop_server is None:
+        main_task_reference = asyncio.create_task(main())
+
+    try:
+        yield
+
+    finally:
+
+        if uvloop_server is None:
+
+            main_task = cast(asyncio.Task[None], main_task_reference)
+            main_task.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await main_task
+
+            main_task_reference = None
+
+        else:
+
+            (loop, thread) = uvloop_server
+
+            # the loop may already be closed if main has failed
+            with suppress(RuntimeError):
+                loop.call_soon_threadsafe(loop.stop)
+
+            await asyncio.to_thread(thread.join)
 
 app = FastAPI(lifespan=lifespan)
+app.state.agent_service = agent_service
 app.include_router(package_references.router)
+app.include_router(metrics.router)
@@ -13,4 +13,19 @@ config_folder_path = os.getenv("NEXUSAGENT_PATHS__CONFIG", default=os.path.join(
 packages_folder_path = os.getenv("NEXUSAGENT_PATHS__PACKAGES", default=os.path.join(platform_specific_root, "packages"))
 
 json_rpc_listen_address = os.getenv("NEXUSAGENT_SYSTEM__JSONRPCLISTENADDRESS", default="0.0.0.0")
-json_rpc_listen_port = int(os.getenv("NEXUSAGENT_SYSTEM__JSONRPCLISTENPORT", default="56145"))
\ No newline at end of file
+json_rpc_listen_port = int(os.getenv("NEXUSAGENT_SYSTEM__JSONRPCLISTENPORT", default="56145"))
+
+# JSON-RPC transport options
+json_rpc_use_uvloop = os.getenv("NEXUSAGENT_SYSTEM__JSONRPCUSEUVLOOP", default="false").lower() == "true"
+json_rpc_tcp_no_delay = os.getenv("NEXUSAGENT_SYSTEM__JSONRPCTCPNODELAY", default="true").lower() == "true"
+json_rpc_send_buffer_size = int(os.getenv("NEXUSAGENT_SYSTEM__JSONRPCSENDBUFFERSIZE", default="0"))
+json_rpc_receive_buffer_size = int(os.getenv("NEXUSAGENT_SYSTEM__JSONRPCRECEIVEBUFFERSIZE", default="0"))
+json_rpc_write_buffer_high_water_mark = int(os.getenv("NEXUSAGENT_SYSTEM__JSONRPCWRITEBUFFERHIGHWATERMARK", default="0"))
+json_rpc_write_buffer_low_water_mark = int(os.getenv("NEXUSAGENT_SYSTEM__JSONRPCWRITEBUFFERLOWWATERMARK", default="0"))
+
+# Read options
+prefetch_memory_budget = int(os.getenv("NEXUSAGENT_SYSTEM__PREFETCHMEMORYBUDGET", default=str(256 * 1024 * 1024)))
+
+# Scheduling options
+bulk_concurrency = int(os.getenv("NEXUSAGENT_SYSTEM__BULKCONCURRENCY", default=str(os.cpu_count() or 4)))
+bulk_concurrency_per_session = int(os.getenv("NEXUSAGENT_SYSTEM__BULKCONCURRENCYPERSESSION", default=str(max(1, bulk_concurrency // 2))))
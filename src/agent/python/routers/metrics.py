@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Request
+
+from ..services import AgentService
+
+router = APIRouter(
+    prefix="/api/v1/metrics",
+    tags=["Metrics"],
+)
+
+def _get_agent_service(request: Request) -> AgentService:
+    return request.app.state.agent_service
+
+@router.get("/", tags=["Metrics"], summary="Gets the metrics of the JSON-RPC server.")
+async def get(request: Request) -> dict[str, int]:
+
+    agent_service = _get_agent_service(request)
+
+    return {
+        "coalescedReads": agent_service.coalesced_read_count
+    }
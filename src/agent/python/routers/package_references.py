@@ -1,33 +1,34 @@
 from uuid import UUID
 
-from apollo3zehn_package_management import PackageReference, PackageService
-from fastapi import APIRouter, HTTPException
+from apollo3zehn_package_management import PackageReference
+from fastapi import APIRouter, HTTPException, Request
 
-from ..options import config_folder_path
+from ..services import AgentService
 
 router = APIRouter(
     prefix="/api/v1/packagereferences",
     tags=["PackageReferences"],
 )
 
-_package_service = PackageService(config_folder_path)
+def _get_agent_service(request: Request) -> AgentService:
+    return request.app.state.agent_service
 
 @router.get("/", tags=["PackageReferences"], summary="Gets the list of package references.")
-async def get() -> dict[UUID, PackageReference]:
-    return await _package_service.get_all()
+async def get(request: Request) -> dict[UUID, PackageReference]:
+    return await _get_agent_service(request).get_package_references()
 
 @router.post("/", tags=["PackageReferences"], summary="Creates a package reference.")
-async def create(package_reference: PackageReference) -> UUID:
-    return await _package_service.put(package_reference)
+async def create(request: Request, package_reference: PackageReference) -> UUID:
+    return await _get_agent_service(request).put_package_reference(package_reference)
 
 @router.put("/", tags=["PackageReferences"], summary="Updates a package reference.")
-async def update(id: UUID, package_reference: PackageReference):
+async def update(request: Request, id: UUID, package_reference: PackageReference):
 
-    success = await _package_service.try_update(id, package_reference)
+    success = await _get_agent_service(request).try_update_package_reference(id, package_reference)
 
     if not success:
         raise HTTPException(status_code=404, detail=f"The package reference with ID {id} does not exist.")
 
 @router.delete("/{id}", tags=["PackageReferences"], summary="Deletes a package reference.")
-async def delete(id: UUID):
-    return await _package_service.delete(id)
\ No newline at end of file
+async def delete(request: Request, id: UUID):
+    await _get_agent_service(request).delete_package_reference(id)
\ No newline at end of file
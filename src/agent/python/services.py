@@ -1,15 +1,24 @@
 import asyncio
+import concurrent.futures
+import copy
 import socket
+import sys
 import time
 import uuid
+from dataclasses import dataclass
 from datetime import timedelta
 from logging import Logger
-from typing import Any, Coroutine, Optional, cast
+from typing import Any, Callable, Coroutine, Optional, TypeVar, cast
 
-from apollo3zehn_package_management import ExtensionHive, PackageService
+from apollo3zehn_package_management import (ExtensionHive, PackageReference,
+                                            PackageService)
 from nexus_extensibility import IDataSource
+from nexus_remoting._coalescing import ReadCoalescer
+from nexus_remoting._prefetch import PrefetchBudget
 from nexus_remoting._remoting import RemoteCommunicator
+from nexus_remoting._scheduler import Scheduler
 
+T = TypeVar("T")
 
 class TcpClientPair:
     comm_reader: Optional[asyncio.StreamReader] = None
@@ -20,34 +29,239 @@ class TcpClientPair:
     watchdog_timer = time.time()
     task: Optional[asyncio.Task] = None
 
+@dataclass(frozen=True)
+class SocketOptions:
+    """Socket tuning options for the JSON-RPC connections. A value of 0 keeps the system default."""
+
+    tcp_no_delay: bool = True
+    send_buffer_size: int = 0
+    receive_buffer_size: int = 0
+    write_buffer_high_water_mark: int = 0
+    write_buffer_low_water_mark: int = 0
+
+def configure_connection(writer: asyncio.StreamWriter, options: SocketOptions, is_data_connection: bool):
+    """
+    Applies the socket options to a newly accepted connection. Buffer sizes and
+    write buffer watermarks are only applied to the data connection.
+    """
+
+    sock = cast(Optional[socket.socket], writer.get_extra_info("socket"))
+
+    if sock is None:
+        return
+
+    if sock.family in (socket.AF_INET, socket.AF_INET6):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if options.tcp_no_delay else 0)
+
+    if not is_data_connection:
+        return
+
+    if options.send_buffer_size > 0:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, options.send_buffer_size)
+
+    if options.receive_buffer_size > 0:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, options.receive_buffer_size)
+
+    if options.write_buffer_high_water_mark > 0:
+
+        writer.transport.set_write_buffer_limits(
+            high=options.write_buffer_high_water_mark,
+            low=options.write_buffer_low_water_mark if options.write_buffer_low_water_mark > 0 else None
+        )
+
 class AgentService:
 
     CLIENT_TIMEOUT = timedelta(minutes=1)
 
-    _background_tasks = set[asyncio.Task]()
-    _tcp_client_pairs: dict[uuid.UUID, TcpClientPair] = {}
-    _lock = asyncio.Lock()
-
     def __init__(
             self, 
-            extension_hive: ExtensionHive, 
+            create_extension_hive: Callable[[], ExtensionHive], 
             package_service: PackageService, 
             logger: Logger, 
             json_rpc_listen_address: str,
-            json_rpc_listen_port: int
+            json_rpc_listen_port: int,
+            socket_options: SocketOptions = SocketOptions(),
+            prefetch_memory_budget: int = 0,
+            bulk_concurrency: int = 4,
+            bulk_concurrency_per_session: int = 2,
+            restore_package: Optional[Callable[[PackageReference], None]] = None
         ):
         
-        self._extension_hive = extension_hive
+        self._create_extension_hive = create_extension_hive
+        self._restore_package = restore_package
         self._package_service = package_service
         self._logger = logger
         self._json_rpc_listen_address = json_rpc_listen_address
         self._json_rpc_listen_port = json_rpc_listen_port
+        self._socket_options = socket_options
+
+        self._background_tasks = set[asyncio.Task]()
+        self._tcp_client_pairs: dict[uuid.UUID, TcpClientPair] = {}
+        self._lock = asyncio.Lock()
+
+        # package reference ID -> (loaded package reference, extension hive)
+        # the dict is replaced on reload and never modified, so communicators can keep a snapshot of it
+        self._extension_hives: dict[uuid.UUID, tuple[PackageReference, ExtensionHive]] = {}
+        self._load_lock = asyncio.Lock()
+
+        # the package service and the locks are bound to the event loop of the JSON-RPC server
+        self._server_loop = concurrent.futures.Future[asyncio.AbstractEventLoop]()
+
+        # shared by all connections, prefetching is disabled if the budget is 0
+        self._prefetch_budget = PrefetchBudget(prefetch_memory_budget) if prefetch_memory_budget > 0 else None
+
+        # shared by all connections, so that metadata calls are not stuck behind bulk reads of other clients
+        self._scheduler = Scheduler(bulk_concurrency, bulk_concurrency_per_session)
+
+        # shared by all connections, e.g. for dashboards that are opened by several users at once
+        self._read_coalescer = ReadCoalescer()
+
+    @property
+    def coalesced_read_count(self) -> int:
+        """The number of reads that have been served by an identical concurrent read."""
+        return self._read_coalescer.coalesced_count
+
+    async def run(self):
+        """
+        Loads the packages and accepts clients. Package references are managed on the event
+        loop of this call from then on.
+        """
+
+        self._server_loop.set_result(asyncio.get_running_loop())
+
+        await self.load_packages()
+        await self.accept_clients()
+
+    async def get_package_references(self) -> dict[uuid.UUID, PackageReference]:
+        """
+        Gets all package references. Can be called from any event loop.
+        """
+
+        return await self._run_on_server_loop(self._package_service.get_all)
+
+    async def put_package_reference(self, package_reference: PackageReference) -> uuid.UUID:
+        """
+        Creates a package reference and loads the package. Can be called from any event loop.
+        """
+
+        async def put():
+
+            id = await self._package_service.put(package_reference)
+            await self.load_packages()
+
+            return id
+
+        return await self._run_on_server_loop(put)
+
+    async def try_update_package_reference(self, id: uuid.UUID, package_reference: PackageReference) -> bool:
+        """
+        Updates a package reference and reloads the package. Returns False if the package
+        reference does not exist. Can be called from any event loop.
+        """
+
+        async def try_update():
+
+            success = await self._package_service.try_update(id, package_reference)
+
+            if success:
+                await self.load_packages()
+
+            return success
+
+        return await self._run_on_server_loop(try_update)
+
+    async def delete_package_reference(self, id: uuid.UUID):
+        """
+        Deletes a package reference and unloads the package. Can be called from any event loop.
+        """
+
+        async def delete():
+            await self._package_service.delete(id)
+            await self.load_packages()
+
+        await self._run_on_server_loop(delete)
 
     async def load_packages(self):
+        """
+        Loads new or changed packages and drops removed ones. Connected clients keep
+        using the package versions they started with until they disconnect. A changed
+        package that fails to load or provides no extensions keeps its previous version.
+        """
+
+        async with self._load_lock:
+
+            self._logger.info("Load packages")
 
-        self._logger.info("Load packages")
-        package_reference_map = await self._package_service.get_all()
-        await self._extension_hive.load_packages(package_reference_map)
+            package_reference_map = dict(await self._package_service.get_all())
+            extension_hives = dict(self._extension_hives)
+
+            for id in list(extension_hives.keys()):
+
+                if id not in package_reference_map:
+                    self._logger.info("Unload package %s", id)
+                    del extension_hives[id]
+
+            for id, package_reference in package_reference_map.items():
+
+                current = extension_hives.get(id)
+
+                if current is not None and current[0] == package_reference:
+                    continue
+
+                self._logger.info("Load package %s", id)
+
+                # the restore (e.g. creating the virtual environment with pip) blocks, so it runs on
+                # the default executor and the extension hive finds the package already restored
+                if self._restore_package is not None:
+
+                    try:
+                        await asyncio.get_running_loop().run_in_executor(None, self._restore_package, package_reference)
+
+                    except Exception:
+
+                        if current is None:
+                            raise
+
+                        self._logger.exception("Package %s could not be restored, keep the previous version", id)
+                        continue
+
+                # otherwise the import would return the previous version, the previous
+                # modules are restored if the new version cannot be used
+                previous_modules = {} if current is None else _remove_modules(current[0])
+
+                try:
+                    extension_hive = self._create_extension_hive()
+                    await extension_hive.load_packages({ id: package_reference })
+
+                except Exception:
+
+                    if current is None:
+                        raise
+
+                    self._logger.exception("Package %s could not be loaded, keep the previous version", id)
+                    _restore_modules(current[0], previous_modules)
+
+                    continue
+
+                if current is not None and not extension_hive.get_extensions():
+                    self._logger.warning("Package %s provides no extensions, keep the previous version", id)
+                    _restore_modules(current[0], previous_modules)
+
+                    continue
+
+                extension_hives[id] = (copy.deepcopy(package_reference), extension_hive)
+
+            self._extension_hives = extension_hives
+
+    async def _run_on_server_loop(self, func: Callable[[], Coroutine[Any, Any, T]]) -> T:
+
+        loop = await asyncio.wrap_future(self._server_loop)
+
+        if loop is asyncio.get_running_loop():
+            return await func()
+
+        else:
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(func(), loop))
 
     async def accept_clients(self):
 
@@ -91,8 +305,13 @@ class AgentService:
             port=self._json_rpc_listen_port
         )
 
-        async with server:
-            await server.serve_forever()
+        try:
+            async with server:
+                await server.serve_forever()
+
+        # the scheduler is shared by all connections, so it lives as long as the server
+        finally:
+            self._scheduler.close()
 
     async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
 
@@ -122,6 +341,8 @@ class AgentService:
                 if id not in self._tcp_client_pairs:
                     self._tcp_client_pairs[id] = TcpClientPair()
 
+                configure_connection(writer, self._socket_options, is_data_connection=False)
+
                 self._tcp_client_pairs[id].comm_reader = reader
                 self._tcp_client_pairs[id].comm_writer = writer
 
@@ -131,6 +352,8 @@ class AgentService:
                 if id not in self._tcp_client_pairs:
                     self._tcp_client_pairs[id] = TcpClientPair()
 
+                configure_connection(writer, self._socket_options, is_data_connection=True)
+
                 self._tcp_client_pairs[id].data_reader = reader
                 self._tcp_client_pairs[id].data_writer = writer
                 
@@ -150,12 +373,17 @@ class AgentService:
 
                 self._logger.debug("Accept remoting client with connection ID %s", id)
 
+                extension_hives = self._extension_hives
+
                 pair.remote_communicator = RemoteCommunicator(
                     pair.comm_reader,
                     pair.comm_writer,
                     pair.data_reader,
                     pair.data_writer,
-                    get_data_source_type=lambda type_name: self._extension_hive.get_extension_type(type_name)
+                    get_data_source_type=lambda type_name: _get_extension_type(extension_hives, type_name),
+                    prefetch_budget=self._prefetch_budget,
+                    scheduler=self._scheduler,
+                    read_coalescer=self._read_coalescer
                 )
 
                 pair.task = self._create_task(pair.remote_communicator.run())
@@ -167,3 +395,34 @@ class AgentService:
         task.add_done_callback(self._background_tasks.discard)
 
         return task
+
+def _get_extension_type(extension_hives: dict[uuid.UUID, tuple[PackageReference, ExtensionHive]], full_name: str) -> type:
+
+    for _, extension_hive in extension_hives.values():
+        for extension_type in extension_hive.get_extensions():
+
+            if f"{extension_type.__module__}.{extension_type.__name__}" == full_name:
+                return extension_type
+
+    raise Exception(f"Could not find extension {full_name}.")
+
+def _remove_modules(package_reference: PackageReference) -> dict[str, Any]:
+
+    import_path = package_reference.configuration.get("import")
+
+    if not import_path:
+        return {}
+
+    root_module_name = import_path.split(".")[0]
+
+    return {
+        module_name: sys.modules.pop(module_name)
+        for module_name in list(sys.modules.keys())
+        if module_name == root_module_name or module_name.startswith(root_module_name + ".")
+    }
+
+def _restore_modules(package_reference: PackageReference, modules: dict[str, Any]):
+
+    # drop the modules of the failed version
+    _remove_modules(package_reference)
+    sys.modules.update(modules)
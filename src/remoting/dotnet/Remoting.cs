@@ -16,11 +16,14 @@ namespace Nexus.Remoting;
 internal class Logger(
     NetworkStream commStream, 
     Stopwatch watchdogTimer, 
+    LogLevel minimumLogLevel,
     CancellationToken cancellationToken
 ) : ILogger
 {
     private readonly Stopwatch _watchdogTimer = watchdogTimer;
 
+    private readonly LogLevel _minimumLogLevel = minimumLogLevel;
+
     private readonly NetworkStream _commStream = commStream;
 
     private readonly CancellationToken _cancellationToken = cancellationToken;
@@ -32,7 +35,7 @@ internal class Logger(
 
     public bool IsEnabled(LogLevel logLevel)
     {
-        return true;
+        return logLevel != LogLevel.None && logLevel >= _minimumLogLevel;
     }
 
     public void Log<TState>(
@@ -43,6 +46,9 @@ internal class Logger(
         Func<TState, Exception?, string> formatter
     )
     {
+        if (!IsEnabled(logLevel))
+            return;
+
         var notification = new JsonObject()
         {
             ["jsonrpc"] = "2.0",
@@ -214,6 +220,13 @@ public class RemoteCommunicator
             result = 1; // API version
         }
 
+        // reuses this connection for a new data source instance (session pooling)
+        else if (methodName == "reset")
+        {
+            _sourceTypeName = @params[0].ToString();
+            _dataSource = default;
+        }
+
         else if (methodName == "upgradeSourceConfiguration")
         {
             if (_sourceTypeName is null)
@@ -246,7 +259,12 @@ public class RemoteCommunicator
             var context = JsonSerializer
                 .Deserialize<DataSourceContext<JsonElement>>(rawContext, Utilities.JsonSerializerOptions)!;
 
-            var logger = new Logger(_commStream, _watchdogTimer, cancellationToken);
+            // newer clients send their minimum log level
+            var minimumLogLevel = @params.GetArrayLength() > 1
+                ? JsonSerializer.Deserialize<LogLevel>(@params[1], Utilities.JsonSerializerOptions)
+                : LogLevel.Trace;
+
+            var logger = new Logger(_commStream, _watchdogTimer, minimumLogLevel, cancellationToken);
             var dataSourceType = _getDataSourceType(_sourceTypeName);
             var dataSource = (IDataSource)Activator.CreateInstance(dataSourceType)!;
 
@@ -356,6 +374,11 @@ public class RemoteCommunicator
             var originalResourceName = @params[2].GetString()!;
 
             var catalogItem = JsonSerializer.Deserialize<CatalogItem>(@params[3], Utilities.JsonSerializerOptions)!;
+
+            /* The client would otherwise expect fewer bytes than are written to the data stream */
+            if (@params.GetArrayLength() > 4 && @params[4].ValueKind != JsonValueKind.Null)
+                throw new Exception("This agent does not support aggregated reads.");
+
             (data, status) = ExtensibilityUtilities.CreateBuffers(catalogItem.Representation, begin, end);
             var readRequest = new ReadRequest(originalResourceName, catalogItem, data, status);
 
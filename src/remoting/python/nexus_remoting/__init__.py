@@ -1 +1,6 @@
-from ._remoting import *
\ No newline at end of file
+from ._buffers import *
+from ._file_reader import *
+from ._file_regions import *
+from ._parallel_reads import *
+from ._remoting import *
+from ._time_index import *
\ No newline at end of file
@@ -0,0 +1,176 @@
+import enum
+import math
+from array import array
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Tuple
+
+from nexus_extensibility import NexusDataType, Representation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class AggregationKind(enum.IntEnum):
+    """Specifies how the samples of a period are aggregated (the value is used in binary frames)."""
+
+    Mean = 0
+    Min = 1
+    Max = 2
+    First = 3
+    Last = 4
+
+@dataclass(frozen=True)
+class Aggregation:
+    """An aggregation that is applied by the agent before the data are sent to Nexus."""
+
+    kind: AggregationKind
+    """The aggregation kind."""
+
+    period: timedelta
+    """The target period. Must be a multiple of the sample period."""
+
+# struct / array format characters of the Nexus data types
+_ELEMENT_FORMATS = {
+    NexusDataType.UINT8: "B",
+    NexusDataType.INT8: "b",
+    NexusDataType.UINT16: "H",
+    NexusDataType.INT16: "h",
+    NexusDataType.UINT32: "I",
+    NexusDataType.INT32: "i",
+    NexusDataType.UINT64: "Q",
+    NexusDataType.INT64: "q",
+    NexusDataType.FLOAT32: "f",
+    NexusDataType.FLOAT64: "d"
+}
+
+def get_samples_per_period(representation: Representation, aggregation: Aggregation, element_count: int) -> int:
+    """
+    Validates the aggregation against the representation and returns the number of samples per target period.
+    """
+
+    if aggregation.period <= timedelta(0) or aggregation.period % representation.sample_period != timedelta(0):
+        raise Exception(f"The aggregation period {aggregation.period} is not a multiple of the sample period {representation.sample_period}.")
+
+    samples_per_period = aggregation.period // representation.sample_period
+
+    if element_count % samples_per_period != 0:
+        raise Exception(f"The requested time range is not a multiple of the aggregation period {aggregation.period}.")
+
+    return samples_per_period
+
+def aggregate(
+    data: memoryview,
+    status: memoryview,
+    data_type: NexusDataType,
+    samples_per_period: int,
+    kind: AggregationKind
+) -> Tuple[memoryview, memoryview]:
+    """
+    Aggregates the valid samples of each period into a float64 value. Periods without any
+    valid sample are NaN and marked as invalid in the returned status buffer.
+
+        Args:
+            data: The raw data buffer.
+            status: The status buffer (1 = valid, 0 = invalid).
+            data_type: The data type of the raw data.
+            samples_per_period: The number of samples per target period.
+            kind: The aggregation kind.
+    """
+
+    element_format = _ELEMENT_FORMATS[data_type]
+    period_count = len(status) // samples_per_period
+
+    if numpy is not None:
+        return _aggregate_numpy(data, status, element_format, period_count, samples_per_period, kind)
+
+    else:
+        return _aggregate_python(data, status, element_format, period_count, samples_per_period, kind)
+
+def _aggregate_numpy(
+    data: memoryview,
+    status: memoryview,
+    element_format: str,
+    period_count: int,
+    samples_per_period: int,
+    kind: AggregationKind
+) -> Tuple[memoryview, memoryview]:
+
+    assert numpy is not None
+
+    values = numpy.frombuffer(data, dtype=element_format).reshape(period_count, samples_per_period)
+    is_valid = numpy.frombuffer(status, dtype=numpy.uint8).reshape(period_count, samples_per_period) != 0
+    valid_count = is_valid.sum(axis=1)
+    has_values = valid_count > 0
+
+    if kind == AggregationKind.Mean:
+        sums = numpy.where(is_valid, values, 0).sum(axis=1, dtype=numpy.float64)
+        result = sums / numpy.maximum(valid_count, 1)
+
+    elif kind == AggregationKind.Min:
+        result = numpy.where(is_valid, values.astype(numpy.float64), numpy.inf).min(axis=1)
+
+    elif kind == AggregationKind.Max:
+        result = numpy.where(is_valid, values.astype(numpy.float64), -numpy.inf).max(axis=1)
+
+    else:
+
+        if kind == AggregationKind.First:
+            indices = is_valid.argmax(axis=1)
+
+        else:
+            indices = samples_per_period - 1 - is_valid[:, ::-1].argmax(axis=1)
+
+        result = values[numpy.arange(period_count), indices].astype(numpy.float64)
+
+    result = numpy.where(has_values, result, numpy.nan)
+
+    return (memoryview(result).cast("B"), memoryview(has_values.astype(numpy.uint8)))
+
+def _aggregate_python(
+    data: memoryview,
+    status: memoryview,
+    element_format: str,
+    period_count: int,
+    samples_per_period: int,
+    kind: AggregationKind
+) -> Tuple[memoryview, memoryview]:
+
+    values = data.cast("B").cast(element_format)
+    result = array("d", bytes(8 * period_count))
+    result_status = bytearray(period_count)
+
+    for period in range(period_count):
+
+        offset = period * samples_per_period
+
+        period_values = [
+            value for (value, is_valid) in zip(
+                values[offset:offset + samples_per_period],
+                status[offset:offset + samples_per_period]
+            ) if is_valid
+        ]
+
+        if not period_values:
+            result[period] = math.nan
+            continue
+
+        if kind == AggregationKind.Mean:
+            result[period] = math.fsum(period_values) / len(period_values)
+
+        elif kind == AggregationKind.Min:
+            result[period] = min(period_values)
+
+        elif kind == AggregationKind.Max:
+            result[period] = max(period_values)
+
+        elif kind == AggregationKind.First:
+            result[period] = period_values[0]
+
+        else:
+            result[period] = period_values[-1]
+
+        result_status[period] = 1
+
+    return (memoryview(result).cast("B"), memoryview(result_status))
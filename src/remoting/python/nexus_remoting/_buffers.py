@@ -0,0 +1,156 @@
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional, Protocol, cast
+
+from nexus_extensibility import ReadDataHandler, ReadRequest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ["BufferedReadDataHandler", "get_sample_offset", "copy_samples", "set_status", "transform", "read_data_into"]
+
+class BufferedReadDataHandler(Protocol):
+    """
+    The read data handler passed by the agent. In addition to ReadDataHandler, it can
+    receive the data into a caller-provided buffer.
+    """
+
+    def __call__(self, resource_path: str, begin: datetime, end: datetime, buffer: Optional[memoryview] = None) -> Awaitable[memoryview]:
+        """
+        Reads the requested data.
+
+            Args:
+                resource_path: The path to the resource data to stream.
+                begin: Start date/time.
+                end: End date/time.
+                buffer: The buffer to receive the float64 data into (e.g. a region of ReadRequest.data). Defaults to a new buffer.
+        """
+        ...
+
+async def read_data_into(
+    read_data: ReadDataHandler,
+    resource_path: str,
+    begin: datetime,
+    end: datetime,
+    buffer: memoryview
+) -> memoryview:
+    """
+    Reads data from Nexus into the buffer (e.g. a region of ReadRequest.data). The received
+    chunks are copied into the buffer as they arrive instead of being joined into a separate
+    payload first. Returns the buffer as float64 view.
+
+        Args:
+            read_data: The read data handler passed to the read method.
+            resource_path: The path to the resource data to stream.
+            begin: Start date/time.
+            end: End date/time.
+            buffer: The buffer. Its length must match the length of the requested data.
+    """
+
+    return await cast(BufferedReadDataHandler, read_data)(resource_path, begin, end, buffer)
+
+def get_sample_offset(begin: datetime, timestamp: datetime, sample_period: timedelta) -> int:
+    """
+    Gets the number of samples between begin and the given timestamp.
+
+        Args:
+            begin: The beginning of the read request.
+            timestamp: The timestamp to compute the offset for (e.g. the begin of a file).
+            sample_period: The sample period.
+    """
+
+    return (timestamp - begin) // sample_period
+
+def copy_samples(
+    request: ReadRequest,
+    source: Any,
+    target_offset: int,
+    source_offset: int = 0,
+    count: Optional[int] = None
+) -> int:
+    """
+    Block-copies samples from a buffer (e.g. file content) into the data buffer of a read
+    request and marks the copied range as valid in its status buffer. The copied range is
+    clipped to the bounds of both buffers. The copy is a single slice assignment, so it
+    does not require NumPy. Returns the number of copied samples.
+
+        Args:
+            request: The read request.
+            source: The source buffer (bytes, bytearray, memoryview, mmap, ...).
+            target_offset: The offset in samples within the read request buffers. May be negative if the source begins before the request.
+            source_offset: The offset in samples within the source buffer.
+            count: The number of samples to copy. Defaults to all available samples.
+    """
+
+    element_size = request.catalog_item.representation.element_size
+    source_bytes = memoryview(source).cast("B")
+    target_bytes = request.data.cast("B") if request.data.format != "B" else request.data
+
+    if target_offset < 0:
+        source_offset -= target_offset
+        count = None if count is None else count + target_offset
+        target_offset = 0
+
+    available = min(
+        len(source_bytes) // element_size - source_offset,
+        len(request.status) - target_offset
+    )
+
+    count = available if count is None else min(count, available)
+
+    if count <= 0:
+        return 0
+
+    target_bytes[target_offset * element_size:(target_offset + count) * element_size] = \
+        source_bytes[source_offset * element_size:(source_offset + count) * element_size]
+
+    set_status(request.status, target_offset, count)
+
+    return count
+
+def set_status(status: memoryview, offset: int, count: int, value: int = 1):
+    """
+    Sets the status of a range of samples.
+
+        Args:
+            status: The status buffer.
+            offset: The offset in samples.
+            count: The number of samples.
+            value: The status value (1 = valid, 0 = invalid).
+    """
+
+    count = max(0, min(count, len(status) - offset))
+    status[offset:offset + count] = bytes([value]) * count
+
+def transform(
+    source: memoryview,
+    target: memoryview,
+    func: Callable[[Any], Any]
+):
+    """
+    Applies an elementwise transform (e.g. lambda x: x * 2) to the source buffer and writes
+    the result into the target buffer. When NumPy is installed, func is invoked once with an
+    ndarray, so it must only use operations that are valid for both scalars and arrays. In
+    both cases, a result that cannot be stored without changing its kind (e.g. float values
+    in an integer buffer) raises a TypeError instead of being truncated.
+
+        Args:
+            source: The typed source buffer (e.g. the result of read_data).
+            target: The typed target buffer (e.g. request.data.cast("d")).
+            func: The transform.
+    """
+
+    if len(source) != len(target):
+        raise Exception(f"The source buffer has {len(source)} elements but the target buffer has {len(target)} elements.")
+
+    if numpy is not None:
+        numpy.copyto(
+            numpy.frombuffer(target, dtype=target.format),
+            func(numpy.frombuffer(source, dtype=source.format)),
+            casting="same_kind"
+        )
+
+    else:
+        target[:] = array(target.format, map(func, source))
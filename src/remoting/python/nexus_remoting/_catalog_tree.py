@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from nexus_extensibility import (CatalogRegistration, IDataSource,
+                                 ResourceCatalog, ResourceCatalogBuilder)
+
+@dataclass(frozen=True)
+class CatalogTreeNode:
+    """The catalog registrations located under a path."""
+
+    path: str
+    """The parent path (a catalog ID followed by a slash, like Nexus requests it)."""
+
+    registrations: list[CatalogRegistration]
+    """The catalog registrations."""
+
+@dataclass(frozen=True)
+class CatalogTree:
+    """The catalog registrations of a subtree and optionally the enriched catalogs."""
+
+    nodes: list[CatalogTreeNode]
+    """The nodes of the subtree."""
+
+    catalogs: Optional[list[ResourceCatalog]]
+    """The enriched catalogs."""
+
+async def get_catalog_tree(
+    data_source: IDataSource,
+    path: str,
+    include_catalogs: bool
+) -> CatalogTree:
+    """
+    Walks the catalog registrations below path (e.g. "/" or "/A/B/"). Transient registrations
+    are returned but neither walked nor enriched because Nexus reloads them on each request.
+    The data source is called sequentially because data sources are not required to be safe
+    for concurrent calls.
+
+        Args:
+            data_source: The data source.
+            path: The root path.
+            include_catalogs: Enrich the catalogs of all non-transient registrations.
+    """
+
+    visited_paths = {path.rstrip("/")}
+    nodes: list[CatalogTreeNode] = []
+    catalogs: list[ResourceCatalog] = []
+
+    # (path to walk, catalog to enrich first), an explicit stack so that deep hierarchies
+    # do not hit the recursion limit
+    stack: list[Tuple[str, Optional[str]]] = [(path, None)]
+
+    while stack:
+
+        (current_path, current_catalog_id) = stack.pop()
+
+        if include_catalogs and current_catalog_id is not None:
+            catalogs.append(await data_source.enrich_catalog(ResourceCatalogBuilder(current_catalog_id).build()))
+
+        registrations = await data_source.get_catalog_registrations(current_path)
+        nodes.append(CatalogTreeNode(current_path, registrations))
+
+        children: list[Tuple[str, Optional[str]]] = []
+
+        for registration in registrations:
+
+            catalog_id = _get_catalog_id(current_path, registration.path)
+
+            if registration.is_transient or catalog_id in visited_paths:
+                continue
+
+            visited_paths.add(catalog_id)
+            children.append((catalog_id + "/", catalog_id))
+
+        # reversed to walk the children in the order of their registrations
+        stack.extend(reversed(children))
+
+    return CatalogTree(nodes, catalogs if include_catalogs else None)
+
+def _get_catalog_id(parent_path: str, path: str) -> str:
+
+    if path.startswith("/"):
+        return path
+
+    # relative to the parent catalog
+    return parent_path.rstrip("/") + "/" + path
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class ReadCoalescer:
+    """
+    Lets identical concurrent reads of all connections of an agent share a single read. The
+    first caller performs the read, later callers with the same key await its result.
+    """
+
+    def __init__(self):
+        self._reads: dict[Hashable, asyncio.Future] = {}
+        self._coalesced_count = 0
+
+    @property
+    def coalesced_count(self) -> int:
+        """The number of reads that have been served by the read of another caller."""
+        return self._coalesced_count
+
+    async def read(self, key: Hashable, read: Callable[[], Awaitable[Tuple[T, bool]]]) -> T:
+        """
+        Performs the read or awaits the identical read that is already in flight.
+
+            Args:
+                key: The key that identifies identical reads.
+                read: A func to perform the read. It returns the result and whether the result may be shared with other callers.
+        """
+
+        while True:
+
+            future = self._reads.get(key)
+
+            if future is None:
+                break
+
+            try:
+                (result, is_shareable) = await asyncio.shield(future)
+
+            except asyncio.CancelledError:
+
+                # the caller has been cancelled, not the read
+                if not future.cancelled():
+                    raise
+
+                # the connection of the first caller is gone, try again
+                continue
+
+            if not is_shareable:
+                break
+
+            self._coalesced_count += 1
+
+            return result
+
+        return (await self._read(key, read))[0]
+
+    async def _read(self, key: Hashable, read: Callable[[], Awaitable[Tuple[T, bool]]]) -> Tuple[T, bool]:
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_observe_exception)
+
+        # a read that is not shareable must not become the target of later callers
+        if key not in self._reads:
+            self._reads[key] = future
+
+        try:
+            result = await read()
+
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+        except BaseException as ex:
+            future.set_exception(ex)
+            raise
+
+        else:
+            future.set_result(result)
+            return result
+
+        finally:
+            if self._reads.get(key) is future:
+                del self._reads[key]
+
+def _observe_exception(future: "asyncio.Future[Any]"):
+
+    # a failed read without waiting callers is not an error of the coalescer
+    if not future.cancelled():
+        future.exception()
@@ -0,0 +1,193 @@
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from nexus_extensibility import ReadRequest
+
+from ._buffers import copy_samples
+
+__all__ = ["FileBlockReader"]
+
+@dataclass
+class _MappedFile:
+    file: BinaryIO
+    file_map: Optional[mmap.mmap]
+    size: int
+    modified: float
+
+class FileBlockReader:
+    """
+    Reads blocks from memory-mapped data files. Open maps are kept in an LRU cache so that
+    repeated windows over the same files do not reopen them. Sequential scans are supported
+    by read-ahead hints (madvise) where the platform provides them.
+
+    Files may grow while they are mapped (a changed size or modification time leads to a new
+    map), but they must not be truncated: accessing a mapped page beyond the end of a file
+    raises SIGBUS and terminates the agent. Files that are truncated or rewritten in place
+    should be read with regular file IO instead.
+    """
+
+    def __init__(self, max_open_files: int = 64, read_ahead_size: int = 4 * 1024 * 1024):
+        """
+        Initializes a new instance of the FileBlockReader.
+
+            Args:
+                max_open_files: The maximum number of files to keep mapped.
+                read_ahead_size: The number of bytes behind each requested block to prefetch.
+        """
+
+        self._max_open_files = max_open_files
+        self._read_ahead_size = read_ahead_size
+        self._files = OrderedDict[str, _MappedFile]()
+        self._lock = threading.Lock()
+
+    def read(self, file_path: str, offset: int = 0, length: Optional[int] = None) -> memoryview:
+        """
+        Gets a read-only view of a block of a file. The view is clipped to the file size.
+
+            Args:
+                file_path: The path of the file.
+                offset: The offset in bytes.
+                length: The length in bytes. Defaults to the rest of the file.
+        """
+
+        with self._lock:
+
+            mapped_file = self._get_mapped_file(file_path)
+
+            if mapped_file.file_map is None:
+                return memoryview(b"")
+
+            end = mapped_file.size if length is None else min(offset + length, mapped_file.size)
+
+            if offset >= end:
+                return memoryview(b"")
+
+            self._advise(mapped_file, offset, end)
+
+            return memoryview(mapped_file.file_map)[offset:end].toreadonly()
+
+    def copy_samples(
+        self,
+        request: ReadRequest,
+        file_path: str,
+        target_offset: int,
+        source_offset: int = 0,
+        count: Optional[int] = None
+    ) -> int:
+        """
+        Copies samples from a file into the buffers of a read request (see copy_samples).
+        Only the part of the file that falls into the requested range is touched.
+        Returns the number of copied samples.
+
+            Args:
+                request: The read request.
+                file_path: The path of the file.
+                target_offset: The offset in samples within the read request buffers.
+                source_offset: The offset in samples within the file.
+                count: The number of samples to copy. Defaults to all available samples.
+        """
+
+        element_size = request.catalog_item.representation.element_size
+
+        # only map what is needed to fill the request
+        skipped = max(0, -target_offset)
+        available = len(request.status) - max(0, target_offset)
+        length = available if count is None else min(count - skipped, available)
+
+        if length <= 0:
+            return 0
+
+        block = self.read(
+            file_path,
+            (source_offset + skipped) * element_size,
+            length * element_size
+        )
+
+        try:
+            return copy_samples(request, block, max(0, target_offset))
+
+        finally:
+            block.release()
+
+    def close(self):
+        """
+        Closes all mapped files.
+        """
+
+        with self._lock:
+            while self._files:
+                _, mapped_file = self._files.popitem()
+                self._close(mapped_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_mapped_file(self, file_path: str) -> _MappedFile:
+
+        stat = os.stat(file_path)
+        mapped_file = self._files.get(file_path)
+
+        if mapped_file is not None:
+
+            # reuse map if the file did not change in the meantime
+            if mapped_file.size == stat.st_size and mapped_file.modified == stat.st_mtime:
+                self._files.move_to_end(file_path)
+                return mapped_file
+
+            del self._files[file_path]
+            self._close(mapped_file)
+
+        file = open(file_path, "rb")
+
+        try:
+            file_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size > 0 else None
+
+        except OSError:
+            file.close()
+            raise
+
+        if file_map is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+            file_map.madvise(mmap.MADV_SEQUENTIAL)
+
+        # the size of the map, the file may have grown since the stat call
+        size = stat.st_size if file_map is None else min(stat.st_size, len(file_map))
+        mapped_file = _MappedFile(file, file_map, size, stat.st_mtime)
+        self._files[file_path] = mapped_file
+
+        while len(self._files) > self._max_open_files:
+            _, evicted = self._files.popitem(last=False)
+            self._close(evicted)
+
+        return mapped_file
+
+    def _advise(self, mapped_file: _MappedFile, begin: int, end: int):
+
+        if mapped_file.file_map is None or not hasattr(mmap, "MADV_WILLNEED"):
+            return
+
+        # madvise requires a page aligned start
+        aligned_begin = begin - begin % mmap.PAGESIZE
+        aligned_end = min(end + self._read_ahead_size, mapped_file.size)
+
+        mapped_file.file_map.madvise(mmap.MADV_WILLNEED, aligned_begin, aligned_end - aligned_begin)
+
+    @staticmethod
+    def _close(mapped_file: _MappedFile):
+
+        if mapped_file.file_map is not None:
+
+            try:
+                mapped_file.file_map.close()
+
+            # a caller still holds a view, the map is released with the last view
+            except BufferError:
+                pass
+
+        mapped_file.file.close()
@@ -0,0 +1,187 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from nexus_extensibility import CatalogItem
+
+from ._buffers import set_status
+
+__all__ = ["FileRegion", "IFileRegionDataSource"]
+
+@dataclass(frozen=True)
+class FileRegion:
+    """
+    A region of a file whose content is already in the wire layout of the requested
+    representation (little-endian samples of the representation's data type).
+    """
+
+    file_path: str
+    """The path of the file."""
+
+    file_offset: int
+    """The offset in bytes within the file."""
+
+    target_offset: int
+    """The offset in samples within the requested buffer. May be negative if the file begins before the request."""
+
+    count: int
+    """The number of samples."""
+
+class IFileRegionDataSource(ABC):
+    """
+    A data source that can describe the data of a read request as file regions. The agent
+    then streams these regions with sendfile instead of copying them through Python.
+    """
+
+    @abstractmethod
+    async def get_file_regions(
+        self,
+        begin: datetime,
+        end: datetime,
+        original_resource_name: str,
+        catalog_item: CatalogItem
+    ) -> Optional[list[FileRegion]]:
+        """
+        Gets the file regions that make up the requested data. Samples not covered by any
+        region are invalid. Return None to fall back to the read method.
+
+            Args:
+                begin: The beginning of the period to read.
+                end: The end of the period to read.
+                original_resource_name: The original resource name.
+                catalog_item: The catalog item to read.
+        """
+        pass
+
+class _FileRegionPayload:
+    """The data of a read request that is streamed from files. Gaps are sent from the data buffer."""
+
+    def __init__(self, regions: list[FileRegion], data: memoryview, status: memoryview, element_size: int):
+        self._regions = regions
+        self._data = data.cast("B") if data.format != "B" else data
+        self._status = status
+        self._element_size = element_size
+
+    async def write_to(self, writer: asyncio.StreamWriter):
+        """
+        Streams the data to the writer. The success header has already been written at this
+        point, so files that have been removed or truncated in the meantime are sent as
+        zeros and marked as invalid in the status buffer (which is written afterwards).
+        """
+
+        loop = asyncio.get_running_loop()
+        position = 0
+
+        for region in self._regions:
+
+            begin = region.target_offset * self._element_size
+            length = region.count * self._element_size
+
+            if position < begin:
+                writer.write(self._data[position:begin])
+
+            try:
+                file = open(region.file_path, "rb")
+
+            except OSError:
+                sent = 0
+
+            else:
+
+                with file:
+
+                    try:
+                        sent = await loop.sendfile(writer.transport, file, region.file_offset, length)
+
+                    # e.g. uvloop
+                    except NotImplementedError:
+                        file.seek(region.file_offset)
+                        chunk = file.read(length)
+                        writer.write(chunk)
+                        sent = len(chunk)
+
+            # keep the stream consistent
+            if sent < length:
+                writer.write(bytes(length - sent))
+                self._invalidate(region, sent)
+
+            position = begin + length
+
+        if position < len(self._data):
+            writer.write(self._data[position:])
+
+    def read(self) -> memoryview:
+        """Reads the file regions into the data buffer (e.g. to convert them) and returns it."""
+
+        self.copy_to(self._data)
+
+        return self._data
+
+    def copy_to(self, data: memoryview):
+        """Reads the file regions into the data buffer (e.g. to aggregate them)."""
+
+        target = data.cast("B") if data.format != "B" else data
+
+        for region in self._regions:
+
+            begin = region.target_offset * self._element_size
+            length = region.count * self._element_size
+
+            try:
+                with open(region.file_path, "rb") as file:
+                    file.seek(region.file_offset)
+                    read = file.readinto(target[begin:begin + length])
+
+            except OSError:
+                read = 0
+
+            if read < length:
+                self._invalidate(region, read)
+
+    def _invalidate(self, region: FileRegion, valid_length: int):
+
+        valid_count = valid_length // self._element_size
+        set_status(self._status, region.target_offset + valid_count, region.count - valid_count, 0)
+
+def _prepare_file_regions(regions: list[FileRegion], status: memoryview, element_size: int) -> list[FileRegion]:
+    """
+    Clips the regions to the buffer and to the file sizes, checks that they do not overlap
+    and marks them as valid in the status buffer.
+    """
+
+    prepared_regions: list[FileRegion] = []
+    file_sizes: dict[str, int] = {}
+
+    for region in sorted(regions, key=lambda region: region.target_offset):
+
+        file_offset = region.file_offset
+        target_offset = region.target_offset
+        count = region.count
+
+        if target_offset < 0:
+            file_offset -= target_offset * element_size
+            count += target_offset
+            target_offset = 0
+
+        file_size = file_sizes.get(region.file_path)
+
+        if file_size is None:
+            file_size = os.stat(region.file_path).st_size
+            file_sizes[region.file_path] = file_size
+
+        # a shorter file would corrupt the data stream
+        count = min(count, len(status) - target_offset, (file_size - file_offset) // element_size)
+
+        if count <= 0:
+            continue
+
+        if prepared_regions and target_offset < prepared_regions[-1].target_offset + prepared_regions[-1].count:
+            raise Exception(f"The file region of file {region.file_path} overlaps with the previous region.")
+
+        prepared_regions.append(FileRegion(region.file_path, file_offset, target_offset, count))
+        set_status(status, target_offset, count)
+
+    return prepared_regions
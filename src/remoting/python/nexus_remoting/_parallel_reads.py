@@ -0,0 +1,64 @@
+from abc import ABC
+from datetime import datetime, timedelta, timezone
+from typing import Tuple
+
+__all__ = ["IParallelDataSource"]
+
+class IParallelDataSource(ABC):
+    """
+    A data source whose read method may be invoked concurrently on worker threads for disjoint
+    time ranges of the same request (e.g. because every file is read independently). Large
+    reads are then split into time slices which are read in parallel into the shared buffers.
+    """
+
+    read_slice_period: timedelta = timedelta(days=1)
+    """Slice boundaries are aligned to multiples of this period (e.g. the file period)."""
+
+    max_read_slices: int = 4
+    """The maximum number of slices a single read is split into."""
+
+_EPOCH = datetime(1, 1, 1, tzinfo=timezone.utc)
+
+def get_read_slices(
+    begin: datetime,
+    end: datetime,
+    sample_period: timedelta,
+    slice_period: timedelta,
+    max_slices: int
+) -> list[Tuple[int, int]]:
+    """
+    Splits a read into at most max_slices time slices whose boundaries are multiples of
+    slice_period. Returns the (offset, count) pairs in samples.
+
+        Args:
+            begin: The beginning of the read.
+            end: The end of the read.
+            sample_period: The sample period.
+            slice_period: The period the slice boundaries are aligned to.
+            max_slices: The maximum number of slices.
+    """
+
+    element_count = (end - begin) // sample_period
+
+    # the first boundary after begin and the number of boundaries before end
+    first_boundary = begin + (-(begin - _EPOCH)) % slice_period
+
+    if first_boundary == begin:
+        first_boundary += slice_period
+
+    boundary_count = 0 if first_boundary >= end else (end - first_boundary - timedelta.resolution) // slice_period + 1
+
+    # use every n-th boundary to stay within max_slices
+    step = -(-(boundary_count + 1) // max(1, max_slices))
+    offsets = [0]
+
+    for index in range(step - 1, boundary_count, step):
+
+        offset = (first_boundary + index * slice_period - begin) // sample_period
+
+        if offsets[-1] < offset < element_count:
+            offsets.append(offset)
+
+    offsets.append(element_count)
+
+    return [(offset, next_offset - offset) for (offset, next_offset) in zip(offsets, offsets[1:])]
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Coroutine, Optional, Tuple
+
+_ReadWindow = Callable[[datetime, datetime], Coroutine[Any, Any, Tuple[memoryview, memoryview]]]
+
+class PrefetchBudget:
+    """Limits the memory of the prefetched windows of all connections of an agent."""
+
+    def __init__(self, max_size: int):
+        """
+        Initializes a new instance of the PrefetchBudget.
+
+            Args:
+                max_size: The maximum number of bytes of all prefetched windows.
+        """
+
+        self._max_size = max_size
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of all prefetched windows."""
+        return self._size
+
+    def try_acquire(self, size: int) -> bool:
+
+        if self._size + size > self._max_size:
+            return False
+
+        self._size += size
+
+        return True
+
+    def release(self, size: int):
+        self._size -= size
+
+@dataclass
+class _Window:
+    begin: datetime
+    end: datetime
+    size: int
+    created: float
+    task: Optional[asyncio.Task] = None
+
+class Prefetcher:
+    """
+    Detects sequential reads of a resource (the next begin equals the previous end and the
+    length is unchanged) and reads the following window in the background. Windows that end
+    in the future are not prefetched.
+    """
+
+    MAX_AGE = 60
+    MAX_TRACKED_RESOURCES = 256
+
+    def __init__(self, budget: PrefetchBudget):
+        self._budget = budget
+        self._last_windows = OrderedDict[str, Tuple[datetime, datetime]]()
+        self._windows: dict[str, _Window] = {}
+        self._pending: Optional[Tuple[str, _Window, _ReadWindow]] = None
+
+    async def take(self, key: str, begin: datetime, end: datetime) -> Optional[Tuple[memoryview, memoryview]]:
+        """
+        Gets the prefetched buffers of a window or None if the window has not been prefetched.
+        """
+
+        window = self._windows.pop(key, None)
+
+        if window is None or window.task is None:
+            return None
+
+        self._release(window)
+
+        if window.begin != begin or window.end != end:
+
+            # the read must not overlap with the regular read of this request
+            window.task.cancel()
+            await asyncio.wait([window.task])
+
+            return None
+
+        try:
+            return await window.task
+
+        # the request is served by a regular read
+        except Exception:
+            return None
+
+    def track(self, key: str, begin: datetime, end: datetime, size: int, read: _ReadWindow):
+        """
+        Records a read and schedules the next window if the access is sequential. The window
+        is read after start has been called (i.e. after the current response has been sent).
+
+            Args:
+                key: The resource key.
+                begin: The beginning of the current read.
+                end: The end of the current read.
+                size: The size of the buffers of a window in bytes.
+                read: A func to read a window.
+        """
+
+        previous = self._last_windows.pop(key, None)
+        self._last_windows[key] = (begin, end)
+
+        while len(self._last_windows) > self.MAX_TRACKED_RESOURCES:
+            self._last_windows.popitem(last=False)
+
+        self._remove_expired_windows()
+
+        if previous is None or previous[1] != begin or previous[1] - previous[0] != end - begin:
+            return
+
+        # data of a window that is not complete yet (e.g. live data) would be served outdated
+        if end + (end - begin) > datetime.now(timezone.utc):
+            return
+
+        if key in self._windows or not self._budget.try_acquire(size):
+            return
+
+        self._discard_pending()
+        self._pending = (key, _Window(end, end + (end - begin), size, time.monotonic()), read)
+
+    def start(self):
+        """
+        Starts reading the scheduled window.
+        """
+
+        if self._pending is None:
+            return
+
+        (key, window, read) = self._pending
+        self._pending = None
+
+        window.task = asyncio.create_task(read(window.begin, window.end))
+        window.task.add_done_callback(_observe_exception)
+        self._windows[key] = window
+
+    def clear(self):
+        """
+        Cancels and discards all windows. The budget of a window is released when its read
+        has finished.
+        """
+
+        self._discard_pending()
+
+        for window in self._windows.values():
+            self._discard(window)
+
+        self._windows.clear()
+        self._last_windows.clear()
+
+    async def reset(self):
+        """
+        Cancels and discards all windows and waits until their reads have finished (e.g.
+        before the data source is replaced).
+        """
+
+        tasks = [window.task for window in self._windows.values() if window.task is not None]
+
+        self.clear()
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def _remove_expired_windows(self):
+
+        now = time.monotonic()
+
+        for key, window in list(self._windows.items()):
+
+            if now - window.created > self.MAX_AGE:
+                del self._windows[key]
+                self._discard(window)
+
+    def _discard_pending(self):
+
+        if self._pending is not None:
+            self._budget.release(self._pending[1].size)
+            self._pending = None
+
+    def _discard(self, window: _Window):
+
+        self._release(window)
+
+        if window.task is not None:
+            window.task.cancel()
+
+    def _release(self, window: _Window):
+
+        # a cancelled read may still be running (e.g. the slices of a parallel read)
+        if window.task is None or window.task.done():
+            self._budget.release(window.size)
+
+        else:
+            window.task.add_done_callback(lambda _: self._budget.release(window.size))
+
+def _observe_exception(task: asyncio.Task):
+
+    # failed windows are discarded silently
+    if not task.cancelled():
+        task.exception()
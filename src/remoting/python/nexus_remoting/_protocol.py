@@ -0,0 +1,43 @@
+import struct
+from datetime import datetime, timedelta, timezone
+
+# API level 1: JSON-RPC 2.0 for all calls.
+# API level 2: JSON-RPC 2.0 for metadata calls, binary framing on the data channel for reads.
+# API level 3: adds getCatalogTree to discover all catalog registrations in a single call.
+# API level 4: adds reads with a reduced-precision transfer type (message types 3 and 4).
+API_LEVEL = 4
+
+# Binary framing (API level >= 2, little-endian)
+#
+# read request (client -> agent, data channel):
+#   uint8 message type, int64 begin ticks, int64 end ticks, int32 catalog item id
+#   followed by uint8 aggregation kind, int64 aggregation period ticks (message types 2 and 4)
+#   followed by uint8 transfer type (message types 3 and 4)
+#
+# read response (agent -> client, data channel):
+#   uint8 status code, int32 error message length
+#   followed by the UTF-8 error message (status code != 0) or by data and status (status code == 0)
+#   aggregated data are always float64 with one element per aggregation period
+#   data with the scaled int16 transfer type are preceded by float64 scale, float64 offset
+READ_REQUEST_HEADER = struct.Struct("<Bqqi")
+READ_RESPONSE_HEADER = struct.Struct("<Bi")
+AGGREGATION_HEADER = struct.Struct("<Bq")
+TRANSFER_TYPE_HEADER = struct.Struct("<B")
+SCALE_HEADER = struct.Struct("<dd")
+
+MESSAGE_TYPE_READ_SINGLE = 1
+MESSAGE_TYPE_READ_AGGREGATED = 2
+MESSAGE_TYPE_READ_SINGLE_REDUCED = 3
+MESSAGE_TYPE_READ_AGGREGATED_REDUCED = 4
+
+STATUS_CODE_SUCCESS = 0
+STATUS_CODE_ERROR = 1
+
+# .NET ticks are 100 ns intervals since 0001-01-01T00:00:00Z
+_TICKS_EPOCH = datetime(1, 1, 1, tzinfo=timezone.utc)
+
+def from_ticks(ticks: int) -> datetime:
+    return _TICKS_EPOCH + timedelta(microseconds=ticks // 10)
+
+def to_ticks(value: datetime) -> int:
+    return (value - _TICKS_EPOCH) // timedelta(microseconds=1) * 10
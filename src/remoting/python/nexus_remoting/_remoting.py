@@ -1,19 +1,40 @@
 import asyncio
+import contextlib
 import json
 import struct
+import threading
 import time
 import typing
 from datetime import datetime, timedelta
-from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, cast
+from typing import (Any, Awaitable, Callable, Dict, Optional, Tuple, Union,
+                    cast)
 from urllib.parse import urlparse
 
 from nexus_extensibility import (CatalogItem, DataSourceContext,
                                  ExtensibilityUtilities, IDataSource, ILogger,
-                                 IUpgradableDataSource, LogLevel, ReadRequest,
+                                 IUpgradableDataSource, LogLevel,
+                                 NexusDataType, ReadDataHandler, ReadRequest,
                                  ResourceCatalog)
 
+from ._aggregation import (Aggregation, AggregationKind, aggregate,
+                           get_samples_per_period)
+from ._catalog_tree import get_catalog_tree
+from ._coalescing import ReadCoalescer
 from ._encoder import (JsonEncoder, JsonEncoderOptions, to_camel_case,
                        to_snake_case)
+from ._file_regions import (IFileRegionDataSource, _FileRegionPayload,
+                            _prepare_file_regions)
+from ._parallel_reads import IParallelDataSource, get_read_slices
+from ._prefetch import PrefetchBudget, Prefetcher
+from ._protocol import (AGGREGATION_HEADER, API_LEVEL,
+                        MESSAGE_TYPE_READ_AGGREGATED,
+                        MESSAGE_TYPE_READ_AGGREGATED_REDUCED,
+                        MESSAGE_TYPE_READ_SINGLE,
+                        MESSAGE_TYPE_READ_SINGLE_REDUCED, READ_REQUEST_HEADER,
+                        READ_RESPONSE_HEADER, SCALE_HEADER, STATUS_CODE_ERROR,
+                        STATUS_CODE_SUCCESS, TRANSFER_TYPE_HEADER, from_ticks)
+from ._scheduler import Scheduler
+from ._transfer import TransferType, reduce_precision
 
 _json_encoder_options: JsonEncoderOptions = JsonEncoderOptions(
     property_name_encoder=to_camel_case,
@@ -23,32 +44,143 @@ _json_encoder_options: JsonEncoderOptions = JsonEncoderOptions(
 #                                                                                               zfill(26) ensures leading zeros when year is < 1000
 _json_encoder_options.encoders[datetime] = lambda value: value.strftime("%Y-%m-%dT%H:%M:%S.%f").zfill(26) + "0+00:00"
 
+# LogLevel.None in .NET, disables logging
+_LOG_LEVEL_NONE = 6
+
 class _Logger(ILogger):
 
-    _background_tasks = set[asyncio.Task]()
+    MAX_QUEUE_LENGTH = 1000
+    BATCH_SIZE = 100
+    FLUSH_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        tcp_comm_socket: asyncio.StreamWriter,
+        minimum_log_level: int = LogLevel.Trace,
+        use_batches: bool = False
+    ):
+        """
+        Initializes a new instance of the _Logger.
+
+            Args:
+                tcp_comm_socket: The comm channel writer.
+                minimum_log_level: Messages below this level are discarded before being encoded.
+                use_batches: Send "logBatch" notifications instead of one "log" notification per message.
+        """
 
-    def __init__(self, tcp_comm_socket: asyncio.StreamWriter):
         self._comm_writer = tcp_comm_socket
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._minimum_log_level = minimum_log_level
+        self._use_batches = use_batches
+        self._queue: list[Tuple[LogLevel, str]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._dropped_count = 0
+        self._unreported_dropped_count = 0
+
+    @property
+    def dropped_count(self) -> int:
+        """The total number of messages that were dropped because the queue was full."""
+        return self._dropped_count
+
+    def is_enabled(self, log_level: LogLevel) -> bool:
+        return log_level >= self._minimum_log_level
 
     def log(self, log_level: LogLevel, message: str):
 
-        notification = {
-            "jsonrpc": "2.0",
-            "method": "log",
-            "params": [log_level.name, message]
-        }
-        
-        task = asyncio.create_task(_send_to_server(notification, self._comm_writer))
-        self._background_tasks.add(task)
-        task.add_done_callback(self._background_tasks.discard)
+        if not self.is_enabled(log_level):
+            return
+
+        # data sources may log from worker threads (parallel reads)
+        if threading.get_ident() != self._thread_id:
+            self._loop.call_soon_threadsafe(self.log, log_level, message)
+            return
+
+        if len(self._queue) >= self.MAX_QUEUE_LENGTH:
+            self._dropped_count += 1
+            self._unreported_dropped_count += 1
+            return
+
+        self._queue.append((log_level, message))
+
+        if len(self._queue) >= self.BATCH_SIZE:
+            self.flush()
+
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.FLUSH_INTERVAL, self.flush)
+
+    def flush(self):
+        """
+        Sends all queued messages.
+        """
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._queue and self._unreported_dropped_count == 0:
+            return
+
+        # the comm channel is congested, keep queuing until the pending drain completes
+        if self._drain_task is not None:
+            return
+
+        messages = self._queue
+        dropped_count = self._unreported_dropped_count
+
+        self._queue = []
+        self._unreported_dropped_count = 0
+
+        if self._use_batches:
+
+            notifications = [{
+                "jsonrpc": "2.0",
+                "method": "logBatch",
+                "params": [
+                    [{ "logLevel": log_level.name, "message": message } for (log_level, message) in messages],
+                    dropped_count
+                ]
+            }]
+
+        else:
+
+            if dropped_count > 0:
+                messages.append((LogLevel.Warning, f"{dropped_count} log messages have been dropped."))
+
+            notifications = [{
+                "jsonrpc": "2.0",
+                "method": "log",
+                "params": [log_level.name, message]
+            } for (log_level, message) in messages]
+
+        # all notifications are written at once to preserve their order
+        for notification in notifications:
+            _write_to_server(notification, self._comm_writer)
+
+        self._drain_task = asyncio.create_task(self._comm_writer.drain())
+        self._drain_task.add_done_callback(self._on_drained)
+
+    def _on_drained(self, task: asyncio.Task):
+
+        self._drain_task = None
+
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        if self._queue or self._unreported_dropped_count > 0:
+            self.flush()
 
 class RemoteCommunicator:
     """A remote communicator."""
 
     _watchdog_timer = time.time()
-    _logger: ILogger
-    _source_type_name: str
-    _data_source: IDataSource
+    _logger: _Logger
+    _source_type_name: Optional[str] = None
+    _data_source: Optional[IDataSource] = None
+    _context_key: Optional[Tuple[type, str]] = None
+    _api_level = 1
+    _read_data_count = 0
 
     def __init__(
         self, 
@@ -56,7 +188,10 @@ class RemoteCommunicator:
         comm_writer: asyncio.StreamWriter,
         data_reader: asyncio.StreamReader, 
         data_writer: asyncio.StreamWriter,
-        get_data_source_type: Callable[[str], type]
+        get_data_source_type: Callable[[str], type],
+        prefetch_budget: Optional[PrefetchBudget] = None,
+        scheduler: Optional[Scheduler] = None,
+        read_coalescer: Optional[ReadCoalescer] = None
     ):
         """
         Initializes a new instance of the RemoteCommunicator.
@@ -65,6 +200,9 @@ class RemoteCommunicator:
                 comm_stream: The network stream for communications.
                 data_stream: The network stream for data.
                 get_data_source_type: A func to get a new data source instance by its type name.
+                prefetch_budget: The memory budget for prefetching sequential reads. Prefetching is disabled if None.
+                scheduler: The scheduler shared by all connections. All work runs unscheduled if None.
+                read_coalescer: The read coalescer shared by all connections. Identical concurrent reads are not coalesced if None.
         """
 
         self._comm_reader = comm_reader
@@ -72,6 +210,12 @@ class RemoteCommunicator:
         self._data_reader = data_reader
         self._data_writer = data_writer
         self._get_data_source_type = get_data_source_type
+        self._catalog_items: list[Tuple[str, CatalogItem]] = []
+        self._read_data_lock = asyncio.Lock()
+        self._data_source_lock = asyncio.Lock()
+        self._prefetcher = None if prefetch_budget is None else Prefetcher(prefetch_budget)
+        self._scheduler = scheduler
+        self._read_coalescer = read_coalescer
 
     @property
     def last_communication(self) -> timedelta:
@@ -83,72 +227,227 @@ class RemoteCommunicator:
         Starts the remoting operation.
         """
 
-        # loop
-        while (True):
+        comm_task: Optional[asyncio.Task[bytes]] = None
+        data_task: Optional[asyncio.Task[bytes]] = None
+
+        try:
+
+            # loop
+            while (True):
+
+                # with API level >= 2, read requests arrive as binary frames on the data channel
+                if comm_task is None:
+                    comm_task = asyncio.create_task(self._read_message(self._comm_reader))
 
-            # https://www.jsonrpc.org/specification
+                if data_task is None and self._api_level >= 2:
+                    data_task = asyncio.create_task(self._data_reader.readexactly(READ_REQUEST_HEADER.size))
 
-            # get request message
-            size = await self._read_size(self._comm_reader)
-            json_request = await asyncio.wait_for(self._comm_reader.readexactly(size), timeout=60)
+                pending_tasks = [task for task in (comm_task, data_task) if task is not None]
+                done, _ = await asyncio.wait(pending_tasks, timeout=60, return_when=asyncio.FIRST_COMPLETED)
 
-            request: Dict[str, Any] = json.loads(json_request)
+                if not done:
+                    raise asyncio.TimeoutError()
 
-            # process message
-            data: Optional[object] = None
-            status: Optional[memoryview] = None
-            response: Optional[Dict[str, Any]]
+                self._watchdog_timer = time.time()
 
-            if "jsonrpc" in request and request["jsonrpc"] == "2.0":
+                if data_task in done:
+                    await self._process_binary_request(data_task.result())
+                    data_task = None
 
-                if "id" in request:
+                if comm_task in done:
+
+                    # a JSON-RPC call may read from the data channel (readData), so stop
+                    # listening for binary requests (readexactly is cancellation safe)
+                    if data_task is not None:
+                        data_task.cancel()
+                        await asyncio.wait([data_task])
+
+                        if not data_task.cancelled():
+                            await self._process_binary_request(data_task.result())
+
+                        data_task = None
+
+                    await self._process_json_request(comm_task.result())
+                    comm_task = None
+
+                self._watchdog_timer = time.time()
+
+        finally:
+
+            for task in (comm_task, data_task):
+                if task is not None:
+                    task.cancel()
+
+            if self._prefetcher is not None:
+                self._prefetcher.clear()
+
+            # let the client know that this session is gone (e.g. a pooled idle session)
+            self._comm_writer.close()
+            self._data_writer.close()
+
+    async def _process_json_request(self, json_request: bytes):
+
+        # https://www.jsonrpc.org/specification
+
+        request: Dict[str, Any] = json.loads(json_request)
+
+        # process message
+        data: Optional[Union[memoryview, _FileRegionPayload]] = None
+        status: Optional[memoryview] = None
+        response: Optional[Dict[str, Any]]
 
-                    try:
+        if "jsonrpc" in request and request["jsonrpc"] == "2.0":
 
+            if "id" in request:
+
+                try:
+
+                    # reads lock the data source and are scheduled on their own (see _read_single)
+                    if request["method"] == "readSingle":
                         (result, data, status) = await self._process_invocation(request)
 
-                        response = {
-                            "result": result
-                        }
+                    else:
+
+                        # only count as interactive while running, otherwise a waiting call
+                        # would hold back the bulk work that owns the lock
+                        async with self._data_source_lock, self._interactive():
+                            (result, data, status) = await self._process_invocation(request)
 
-                    except Exception as ex:
-                        
-                        response = {
-                            "error": {
-                                "code": -1,
-                                "message": str(ex)
-                            }
+                    response = {
+                        "result": result
+                    }
+
+                except Exception as ex:
+                    
+                    response = {
+                        "error": {
+                            "code": -1,
+                            "message": str(ex)
                         }
+                    }
 
-                else:
-                    raise Exception(f"JSON-RPC 2.0 notifications are not supported.") 
+            else:
+                raise Exception(f"JSON-RPC 2.0 notifications are not supported.") 
 
-            else:              
-                raise Exception(f"JSON-RPC 2.0 message expected, but got something else.") 
-            
-            response["jsonrpc"] = "2.0"
-            response["id"] = request["id"]
+        else:              
+            raise Exception(f"JSON-RPC 2.0 message expected, but got something else.") 
+        
+        response["jsonrpc"] = "2.0"
+        response["id"] = request["id"]
+
+        # send response
+        await _send_to_server(response, self._comm_writer)
+
+        # send data
+        if data is not None and status is not None:
+            await self._write_data(data, status)
+
+    async def _process_binary_request(self, header: bytes):
+
+        (message_type, begin_ticks, end_ticks, catalog_item_id) = READ_REQUEST_HEADER.unpack(header)
+
+        aggregation_header: Optional[Tuple[int, int]] = None
+        transfer_type_header: Tuple[int] = (TransferType.Native,)
+
+        # the frame cannot be skipped without knowing its layout
+        if message_type not in (
+            MESSAGE_TYPE_READ_SINGLE,
+            MESSAGE_TYPE_READ_AGGREGATED,
+            MESSAGE_TYPE_READ_SINGLE_REDUCED,
+            MESSAGE_TYPE_READ_AGGREGATED_REDUCED
+        ):
+            raise Exception(f"Unknown binary message type '{message_type}'.")
+
+        if message_type in (MESSAGE_TYPE_READ_AGGREGATED, MESSAGE_TYPE_READ_AGGREGATED_REDUCED):
+
+            aggregation_header = AGGREGATION_HEADER.unpack(
+                await asyncio.wait_for(self._data_reader.readexactly(AGGREGATION_HEADER.size), timeout=60))
+
+        if message_type in (MESSAGE_TYPE_READ_SINGLE_REDUCED, MESSAGE_TYPE_READ_AGGREGATED_REDUCED):
+
+            transfer_type_header = TRANSFER_TYPE_HEADER.unpack(
+                await asyncio.wait_for(self._data_reader.readexactly(TRANSFER_TYPE_HEADER.size), timeout=60))
+
+        scale: Optional[Tuple[float, float]] = None
+
+        try:
+
+            aggregation = None if aggregation_header is None else Aggregation(
+                AggregationKind(aggregation_header[0]),
+                timedelta(microseconds=aggregation_header[1] // 10)
+            )
+
+            transfer_type = TransferType(transfer_type_header[0])
+
+            if catalog_item_id < 0 or catalog_item_id >= len(self._catalog_items):
+                raise Exception(f"Unknown catalog item ID '{catalog_item_id}'.")
+
+            (original_resource_name, catalog_item) = self._catalog_items[catalog_item_id]
+
+            # aggregated data are always float64
+            if transfer_type != TransferType.Native and aggregation is None and \
+                catalog_item.representation.data_type != NexusDataType.FLOAT64:
+                raise Exception(f"The transfer type {transfer_type.name} requires float64 data.")
+
+            (data, status) = await self._read_single(
+                from_ticks(begin_ticks),
+                from_ticks(end_ticks),
+                original_resource_name,
+                catalog_item,
+                aggregation
+            )
+
+            # reduce the payload before it is written to the network
+            if transfer_type != TransferType.Native:
 
-            # send response
-            await _send_to_server(response, self._comm_writer)
+                if isinstance(data, _FileRegionPayload):
+                    data = data.read()
 
-            # send data
-            if data is not None and status is not None:
+                (data, scale) = reduce_precision(data, status, transfer_type)
 
-                self._data_writer.write(data)
-                self._data_writer.write(status)
+        except Exception as ex:
 
-                await self._data_writer.drain()
+            message = str(ex).encode()
+
+            self._data_writer.write(READ_RESPONSE_HEADER.pack(STATUS_CODE_ERROR, len(message)))
+            self._data_writer.write(message)
+
+        else:
+
+            self._data_writer.write(READ_RESPONSE_HEADER.pack(STATUS_CODE_SUCCESS, 0))
+
+            if scale is not None:
+                self._data_writer.write(SCALE_HEADER.pack(*scale))
+
+            await self._write_data(data, status)
+
+        await self._data_writer.drain()
+
+    async def _write_data(self, data: Union[memoryview, _FileRegionPayload], status: memoryview):
+
+        if isinstance(data, _FileRegionPayload):
+            await data.write_to(self._data_writer)
+
+        else:
+            self._data_writer.write(data)
+
+        self._data_writer.write(status)
+
+        await self._data_writer.drain()
+
+        # the next window is read while the client processes this one
+        if self._prefetcher is not None:
+            self._prefetcher.start()
 
     async def _process_invocation(self, request: dict[str, Any]) \
         -> Tuple[
             Optional[Any], 
-            Optional[memoryview], 
+            Optional[Union[memoryview, _FileRegionPayload]], 
             Optional[memoryview]
         ]:
         
         result: Optional[Any] = None
-        data: Optional[memoryview] = None
+        data: Optional[Union[memoryview, _FileRegionPayload]] = None
         status: Optional[memoryview] = None
 
         method_name = request["method"]
@@ -157,7 +456,26 @@ class RemoteCommunicator:
         if method_name == "initialize":
             
             self._source_type_name = params[0]
-            result = 1 # API version
+
+            # older clients do not send their API level
+            requested_api_level = cast(int, params[1]) if len(params) > 1 else 1
+            self._api_level = max(1, min(requested_api_level, API_LEVEL))
+
+            result = self._api_level
+
+        # reuses this connection for a new data source instance (session pooling)
+        elif method_name == "reset":
+
+            if hasattr(self, "_logger"):
+                self._logger.flush()
+
+            if self._prefetcher is not None:
+                await self._prefetcher.reset()
+
+            self._source_type_name = params[0]
+            self._data_source = None
+            self._context_key = None
+            self._catalog_items = []
 
         elif method_name == "upgradeSourceConfiguration":
 
@@ -203,7 +521,14 @@ class RemoteCommunicator:
             request_configuration = raw_context["requestConfiguration"] \
                 if "requestConfiguration" in raw_context else None
 
-            self._logger = _Logger(self._comm_writer)
+            # newer clients send their minimum log level and understand batched log notifications
+            if len(params) > 1:
+                encoded_log_level = cast(str, params[1])
+                minimum_log_level = LogLevel[encoded_log_level] if encoded_log_level in LogLevel.__members__ else _LOG_LEVEL_NONE
+                self._logger = _Logger(self._comm_writer, minimum_log_level, use_batches=True)
+
+            else:
+                self._logger = _Logger(self._comm_writer)
 
             context = DataSourceContext(
                 resource_locator,
@@ -211,9 +536,16 @@ class RemoteCommunicator:
                 request_configuration
             )
 
+            # prefetched windows belong to the previous context
+            if self._prefetcher is not None:
+                await self._prefetcher.reset()
+
             self._data_source = cast(IDataSource, data_source_type())
             await self._data_source.set_context(context, self._logger)
 
+            # reads of connections with the same type (and package version) and context are identical
+            self._context_key = (data_source_type, json.dumps(raw_context, sort_keys=True))
+
         elif method_name == "getCatalogRegistrations":
 
             if self._data_source is None:
@@ -224,6 +556,17 @@ class RemoteCommunicator:
 
             result = registrations
 
+        # walks the registration tree in a single round trip (API level >= 3)
+        elif method_name == "getCatalogTree":
+
+            if self._data_source is None:
+                raise Exception("The data source context must be set before invoking other methods.")
+
+            path = cast(str, params[0])
+            include_catalogs = cast(bool, params[1]) if len(params) > 1 else False
+
+            result = await get_catalog_tree(self._data_source, path, include_catalogs)
+
         elif method_name == "enrichCatalog":
 
             if self._data_source is None:
@@ -265,15 +608,20 @@ class RemoteCommunicator:
             end = _json_encoder_options.decoders[datetime](datetime, params[1])
             original_resource_name = params[2]
             catalog_item = JsonEncoder.decode(CatalogItem, params[3], _json_encoder_options)
-            (data, status) = ExtensibilityUtilities.create_buffers(catalog_item.representation, begin, end)
-            read_request = ReadRequest(original_resource_name, catalog_item, data, status)
 
-            await self._data_source.read(
-                begin, 
-                end, 
-                [read_request], 
-                self._handle_read_data, 
-                self._handle_report_progress)
+            # newer clients may request an aggregation instead of the raw samples
+            aggregation = JsonEncoder.decode(Aggregation, params[4], _json_encoder_options) \
+                if len(params) > 4 and params[4] is not None else None
+
+            (data, status) = await self._read_single(begin, end, original_resource_name, catalog_item, aggregation)
+
+        elif method_name == "registerCatalogItem":
+
+            original_resource_name = cast(str, params[0])
+            catalog_item = JsonEncoder.decode(CatalogItem, params[1], _json_encoder_options)
+            self._catalog_items.append((original_resource_name, catalog_item))
+
+            result = len(self._catalog_items) - 1
 
         # Add cancellation support?
         # https://github.com/microsoft/vs-streamjsonrpc/blob/main/doc/sendrequest.md#cancellation
@@ -294,9 +642,253 @@ class RemoteCommunicator:
 
         return (result, data, status)
 
-    async def _handle_read_data(self, resource_path: str, begin: datetime, end: datetime) -> memoryview:
+    async def _read_single(
+        self,
+        begin: datetime,
+        end: datetime,
+        original_resource_name: str,
+        catalog_item: CatalogItem,
+        aggregation: Optional[Aggregation] = None
+    ) -> Tuple[Union[memoryview, _FileRegionPayload], memoryview]:
+
+        if self._read_coalescer is None or self._context_key is None:
+            return await self._read_single_uncoalesced(begin, end, original_resource_name, catalog_item, aggregation)
+
+        async def read():
+
+            read_data_count = self._read_data_count
+            result = await self._read_single_uncoalesced(begin, end, original_resource_name, catalog_item, aggregation)
+
+            # data from Nexus are subject to the permissions of the user who requested them
+            return (result, self._read_data_count == read_data_count)
+
+        # the buffers are not modified after the read, so all callers can write them to their data channels
+        key = (self._context_key, original_resource_name, catalog_item.to_path(), begin, end, aggregation)
+
+        return await self._read_coalescer.read(key, read)
+
+    async def _read_single_uncoalesced(
+        self,
+        begin: datetime,
+        end: datetime,
+        original_resource_name: str,
+        catalog_item: CatalogItem,
+        aggregation: Optional[Aggregation] = None
+    ) -> Tuple[Union[memoryview, _FileRegionPayload], memoryview]:
+
+        if self._data_source is None:
+            raise Exception("The data source context must be set before invoking other methods.")
+
+        representation = catalog_item.representation
+
+        # validate before reading to fail fast
+        samples_per_period = None if aggregation is None else \
+            get_samples_per_period(representation, aggregation, (end - begin) // representation.sample_period)
+
+        file_regions = None
+
+        if isinstance(self._data_source, IFileRegionDataSource):
+            async with self._data_source_lock:
+                file_regions = await self._data_source.get_file_regions(begin, end, original_resource_name, catalog_item)
+
+        if file_regions is not None:
+
+            (data, status) = ExtensibilityUtilities.create_buffers(representation, begin, end)
+
+            file_region_payload = _FileRegionPayload(
+                _prepare_file_regions(file_regions, status, representation.element_size),
+                data,
+                status,
+                representation.element_size
+            )
+
+            # stream the files without copying them through Python
+            if aggregation is None:
+                return (file_region_payload, status)
+
+            file_region_payload.copy_to(data)
+
+        else:
+
+            key = f"{original_resource_name}|{catalog_item.to_path()}"
+            prefetched = None if self._prefetcher is None else await self._prefetcher.take(key, begin, end)
+
+            if prefetched is None:
+
+                (data, status) = ExtensibilityUtilities.create_buffers(representation, begin, end)
+
+                async with self._data_source_lock:
+                    await self._fill_buffers(begin, end, original_resource_name, catalog_item, data, status, self._handle_read_data)
+
+            else:
+                (data, status) = prefetched
+
+            if self._prefetcher is not None:
+
+                self._prefetcher.track(
+                    key,
+                    begin,
+                    end,
+                    data.nbytes + status.nbytes,
+                    lambda begin, end: self._prefetch(begin, end, original_resource_name, catalog_item)
+                )
+
+        # reduce the payload before it is written to the network
+        if aggregation is not None and samples_per_period is not None:
+            (data, status) = aggregate(data, status, representation.data_type, samples_per_period, aggregation.kind)
+
+        return (data, status)
+
+    async def _prefetch(
+        self,
+        begin: datetime,
+        end: datetime,
+        original_resource_name: str,
+        catalog_item: CatalogItem
+    ) -> Tuple[memoryview, memoryview]:
+
+        (data, status) = ExtensibilityUtilities.create_buffers(catalog_item.representation, begin, end)
+
+        async with self._data_source_lock:
+            await self._fill_buffers(begin, end, original_resource_name, catalog_item, data, status, _handle_read_data_unavailable)
+
+        return (data, status)
+
+    async def _fill_buffers(
+        self,
+        begin: datetime,
+        end: datetime,
+        original_resource_name: str,
+        catalog_item: CatalogItem,
+        data: memoryview,
+        status: memoryview,
+        read_data: ReadDataHandler
+    ):
+
+        if self._data_source is None:
+            raise Exception("The data source context must be set before invoking other methods.")
+
+        sample_period = catalog_item.representation.sample_period
+
+        read_data = self._suspend_bulk_during(read_data)
+
+        slices = get_read_slices(
+            begin,
+            end,
+            sample_period,
+            self._data_source.read_slice_period,
+            self._data_source.max_read_slices
+        ) if isinstance(self._data_source, IParallelDataSource) else []
+
+        if len(slices) > 1:
+            await self._read_slices(begin, sample_period, original_resource_name, catalog_item, data, status, slices, read_data)
+
+        else:
+
+            read_request = ReadRequest(original_resource_name, catalog_item, data, status)
+
+            async with self._bulk():
+
+                await self._data_source.read(
+                    begin, 
+                    end, 
+                    [read_request], 
+                    read_data, 
+                    self._handle_report_progress)
+
+    async def _read_slices(
+        self,
+        begin: datetime,
+        sample_period: timedelta,
+        original_resource_name: str,
+        catalog_item: CatalogItem,
+        data: memoryview,
+        status: memoryview,
+        slices: list[Tuple[int, int]],
+        read_data: ReadDataHandler
+    ):
+
+        data_source = cast(IDataSource, self._data_source)
+        element_size = catalog_item.representation.element_size
+        loop = asyncio.get_running_loop()
+
+        # the comm and data channels are owned by this loop
+        async def read_data_on_loop(resource_path: str, begin: datetime, end: datetime, buffer: Optional[memoryview] = None):
+            future = asyncio.run_coroutine_threadsafe(read_data(resource_path, begin, end, buffer), loop) # pyright: ignore
+            return await asyncio.wrap_future(future)
+
+        def read_slice(offset: int, count: int):
+
+            slice_begin = begin + offset * sample_period
+            slice_end = slice_begin + count * sample_period
+
+            read_request = ReadRequest(
+                original_resource_name,
+                catalog_item,
+                data[offset * element_size:(offset + count) * element_size],
+                status[offset:offset + count]
+            )
+
+            asyncio.run(data_source.read(
+                slice_begin,
+                slice_end,
+                [read_request],
+                read_data_on_loop,
+                self._handle_report_progress))
+
+        executor = None if self._scheduler is None else self._scheduler.bulk_executor
+
+        async def run_slice(offset: int, count: int):
+
+            async with self._bulk():
+
+                future = loop.run_in_executor(executor, read_slice, offset, count)
+
+                try:
+                    await asyncio.shield(future)
+
+                # a running slice cannot be interrupted and keeps using the data source and the
+                # buffers, so the lock and the buffers must not be released before it has finished
+                except asyncio.CancelledError:
+                    await asyncio.wait([future])
+                    raise
+
+        # wait for all slices (even when cancelled), none of them may still use the channels afterwards
+        results = await asyncio.gather(
+            *(run_slice(offset, count) for (offset, count) in slices),
+            return_exceptions=True
+        )
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _handle_read_data(
+        self,
+        resource_path: str,
+        begin: datetime,
+        end: datetime,
+        buffer: Optional[memoryview] = None
+    ) -> memoryview:
+        """
+        Requests data from Nexus. If a buffer is provided (e.g. a region of ReadRequest.data),
+        the payload is copied into it as it arrives, otherwise a new buffer is allocated.
+        """
 
         self._logger.log(LogLevel.Debug, f"Read resource path {resource_path} from Nexus")
+        self._read_data_count += 1
+
+        # requests and responses of concurrent calls (parallel reads) must not interleave
+        async with self._read_data_lock:
+            return await self._read_data_from_server(resource_path, begin, end, buffer)
+
+    async def _read_data_from_server(
+        self,
+        resource_path: str,
+        begin: datetime,
+        end: datetime,
+        buffer: Optional[memoryview]
+    ) -> memoryview:
 
         read_data_request = {
             "jsonrpc": "2.0",
@@ -311,15 +903,58 @@ class RemoteCommunicator:
         await _send_to_server(read_data_request, self._comm_writer)
 
         size = await self._read_size(self._data_reader)
-        data = await asyncio.wait_for(self._data_reader.readexactly(size), timeout=600)
 
-        # 'cast' is required because of https://github.com/python/cpython/issues/126012
-        # see also https://github.com/nexus-main/nexus/issues/184
-        return cast(memoryview, memoryview(data).cast("d"))
+        if buffer is None:
+
+            data = await asyncio.wait_for(self._data_reader.readexactly(size), timeout=600)
+
+            # 'cast' is required because of https://github.com/python/cpython/issues/126012
+            # see also https://github.com/nexus-main/nexus/issues/184
+            return cast(memoryview, memoryview(data).cast("d"))
+
+        if buffer.nbytes != size:
+
+            # the payload must be consumed, otherwise all following frames are misaligned
+            await asyncio.wait_for(_discard_exactly(self._data_reader, size), timeout=600)
+
+            raise Exception(f"The provided buffer has a length of {buffer.nbytes} bytes but Nexus returned {size} bytes.")
+
+        await asyncio.wait_for(_read_exactly_into(self._data_reader, buffer), timeout=600)
+
+        return buffer if buffer.format == "d" else cast(memoryview, buffer.cast("B").cast("d"))
+
+    def _interactive(self) -> typing.AsyncContextManager:
+        return contextlib.nullcontext() if self._scheduler is None else self._scheduler.interactive()
+
+    def _bulk(self) -> typing.AsyncContextManager:
+        return contextlib.nullcontext() if self._scheduler is None else self._scheduler.bulk(self)
+
+    def _suspend_bulk_during(self, read_data: ReadDataHandler) -> ReadDataHandler:
+
+        scheduler = self._scheduler
+
+        if scheduler is None:
+            return read_data
+
+        # readData calls may lead to further reads on this agent, which must not wait for
+        # the bulk units that are held by the reads waiting for them
+        async def suspended_read_data(resource_path: str, begin: datetime, end: datetime, buffer: Optional[memoryview] = None):
+            async with scheduler.suspend_bulk(self):
+                return await read_data(resource_path, begin, end, buffer) # pyright: ignore
+
+        return suspended_read_data
 
     def _handle_report_progress(self, progress_value: float):
         pass # not implemented
 
+    async def _read_message(self, reader: asyncio.StreamReader) -> bytes:
+
+        # no timeout while waiting for the next message, the caller watches for inactivity
+        size_buffer = await reader.readexactly(4)
+        size = struct.unpack(">I", size_buffer)[0]
+
+        return await asyncio.wait_for(reader.readexactly(size), timeout=60)
+
     async def _read_size(self, reader: asyncio.StreamReader) -> int:
 
         size_buffer = await asyncio.wait_for(reader.readexactly(4), timeout=60)
@@ -327,8 +962,18 @@ class RemoteCommunicator:
 
         return size
 
+async def _handle_read_data_unavailable(resource_path: str, begin: datetime, end: datetime, buffer: Optional[memoryview] = None) -> memoryview:
+    # Nexus serves read data requests only while it waits for a read
+    raise Exception("Data from Nexus cannot be read during prefetching.")
+
 async def _send_to_server(message: Any, writer: asyncio.StreamWriter):
 
+    _write_to_server(message, writer)
+
+    await writer.drain()
+
+def _write_to_server(message: Any, writer: asyncio.StreamWriter):
+
     encoded = JsonEncoder.encode(message, _json_encoder_options)
     json_response = json.dumps(encoded)
     encoded_response = json_response.encode()
@@ -336,4 +981,32 @@ async def _send_to_server(message: Any, writer: asyncio.StreamWriter):
     writer.write(struct.pack(">I", len(encoded_response)))
     writer.write(encoded_response)
 
-    await writer.drain()
+async def _read_exactly_into(reader: asyncio.StreamReader, buffer: memoryview):
+
+    # readexactly would join the chunks into a new payload which is then copied into the
+    # buffer, here each chunk is copied into the buffer right away
+    target = buffer.cast("B") if buffer.format != "B" else buffer
+    offset = 0
+
+    while offset < len(target):
+
+        chunk = await reader.read(len(target) - offset)
+
+        if not chunk:
+            raise asyncio.IncompleteReadError(bytes(target[:offset]), len(target))
+
+        target[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+
+async def _discard_exactly(reader: asyncio.StreamReader, size: int):
+
+    remaining = size
+
+    while remaining > 0:
+
+        chunk = await reader.read(min(remaining, 64 * 1024))
+
+        if not chunk:
+            raise asyncio.IncompleteReadError(b"", size)
+
+        remaining -= len(chunk)
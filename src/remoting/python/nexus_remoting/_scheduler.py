@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Hashable
+
+class Scheduler:
+    """
+    Schedules the work of all connections of an agent. Interactive work (metadata and
+    availability requests) runs immediately and holds back new bulk work (reads) while it
+    is running. Bulk work is admitted in units (a read or a slice of a parallel read) that
+    are distributed round-robin across the waiting sessions, with a per-session cap so that
+    a single client cannot occupy all slots.
+    """
+
+    def __init__(self, max_bulk_concurrency: int, max_bulk_concurrency_per_session: int):
+        """
+        Initializes a new instance of the Scheduler.
+
+            Args:
+                max_bulk_concurrency: The maximum number of concurrent bulk work units of all sessions. This is also the size of the bulk executor.
+                max_bulk_concurrency_per_session: The maximum number of concurrent bulk work units of a single session.
+        """
+
+        self._max_bulk_concurrency = max_bulk_concurrency
+        self._max_bulk_concurrency_per_session = max_bulk_concurrency_per_session
+        self._interactive_count = 0
+        self._bulk_count = 0
+        self._session_bulk_counts: dict[Hashable, int] = {}
+        self._waiting = OrderedDict[Hashable, deque[asyncio.Future]]()
+
+        # bulk work must not exhaust the default executor which is shared with everything else
+        self._bulk_executor = ThreadPoolExecutor(max_bulk_concurrency, thread_name_prefix="nexus-bulk")
+
+    @property
+    def bulk_executor(self) -> ThreadPoolExecutor:
+        """The executor to run admitted bulk work units on (e.g. the slices of a parallel read)."""
+        return self._bulk_executor
+
+    def close(self):
+        """
+        Shuts down the bulk executor. Work units that are already running are not interrupted.
+        """
+
+        self._bulk_executor.shutdown(wait=False, cancel_futures=True)
+
+    @contextlib.asynccontextmanager
+    async def interactive(self) -> AsyncIterator[None]:
+        """
+        Marks the enclosed work as interactive. New bulk work units are not admitted until it
+        has finished.
+        """
+
+        self._interactive_count += 1
+
+        try:
+            yield
+
+        finally:
+            self._interactive_count -= 1
+            self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def bulk(self, session: Hashable) -> AsyncIterator[None]:
+        """
+        Waits until a bulk work unit of the session is admitted.
+
+            Args:
+                session: The session (e.g. the communicator of a connection).
+        """
+
+        await self._acquire(session)
+
+        try:
+            yield
+
+        finally:
+            self._release(session)
+
+    @contextlib.asynccontextmanager
+    async def suspend_bulk(self, session: Hashable) -> AsyncIterator[None]:
+        """
+        Gives back an admitted bulk work unit of the session while the enclosed work waits for
+        other work (e.g. readData calls which may lead to further reads on this agent) and
+        waits for its readmission afterwards.
+
+            Args:
+                session: The session (e.g. the communicator of a connection).
+        """
+
+        self._release(session)
+
+        try:
+            yield
+
+        finally:
+
+            try:
+                await self._acquire(session)
+
+            # the enclosing bulk context releases the unit in any case
+            except asyncio.CancelledError:
+                self._admit(session)
+                raise
+
+    async def _acquire(self, session: Hashable):
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(session, deque()).append(future)
+        self._dispatch()
+
+        try:
+            await future
+
+        except asyncio.CancelledError:
+
+            # admitted just before the cancellation
+            if future.done() and not future.cancelled():
+                self._release(session)
+
+            raise
+
+    def _admit(self, session: Hashable):
+        self._bulk_count += 1
+        self._session_bulk_counts[session] = self._session_bulk_counts.get(session, 0) + 1
+
+    def _release(self, session: Hashable):
+
+        self._bulk_count -= 1
+        self._session_bulk_counts[session] -= 1
+
+        if self._session_bulk_counts[session] == 0:
+            del self._session_bulk_counts[session]
+
+        self._dispatch()
+
+    def _dispatch(self):
+
+        while self._interactive_count == 0 and self._bulk_count < self._max_bulk_concurrency:
+
+            # the first waiting session below its cap, sessions are rotated after each admission
+            session = next((
+                session for session in self._waiting
+                if self._session_bulk_counts.get(session, 0) < self._max_bulk_concurrency_per_session
+            ), None)
+
+            if session is None:
+                return
+
+            queue = self._waiting.pop(session)
+            future = queue.popleft()
+
+            if queue:
+                self._waiting[session] = queue
+
+            # the waiter has been cancelled
+            if future.done():
+                continue
+
+            self._admit(session)
+            future.set_result(None)
@@ -0,0 +1,450 @@
+import asyncio
+import bisect
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple, cast
+
+__all__ = ["FileTimeIndex"]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_VERSION = 2
+
+# directories modified within this period may still change within the same mtime tick
+_MTIME_GRANULARITY = 2.0
+
+@dataclass
+class _Directory:
+    modified: Optional[float]
+    directories: list[str]
+    files: list[str]
+    timestamps: list[int]
+
+class FileTimeIndex:
+    """
+    A sorted index of the start times of the files of a file-based data source. The start
+    times are parsed from the file names once. Afterwards, only directories whose
+    modification time has changed are scanned again and merged into the index, so that time
+    range, availability and file lookups do not need to walk the whole data tree. The index
+    can be persisted to survive agent restarts. Changed directories are appended to the index
+    file, which is compacted from time to time. When the index is used on an event loop, the
+    directories are scanned on the default executor and the previous snapshot is served
+    meanwhile.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        file_name_format: str,
+        file_period: timedelta,
+        index_file_path: Optional[str] = None,
+        refresh_interval: timedelta = timedelta(seconds=10)
+    ):
+        """
+        Initializes a new instance of the FileTimeIndex.
+
+            Args:
+                root: The root directory of the data files.
+                file_name_format: The strptime format of the file names (e.g. "%Y-%m-%d_%H-%M-%S.dat"). Other files are ignored. The start times are interpreted as UTC.
+                file_period: The period covered by a single file.
+                index_file_path: The path of the file to persist the index to. Defaults to no persistence.
+                refresh_interval: The minimum period between two checks for changed directories.
+        """
+
+        self._root = root
+        self._file_name_format = file_name_format
+        self._file_period = file_period
+        self._index_file_path = index_file_path
+        self._refresh_interval = refresh_interval.total_seconds()
+
+        self._lock = threading.Lock()
+        self._directories: dict[str, _Directory] = {}
+        self._last_refresh: Optional[float] = None
+        self._timestamps = array("q")
+        self._file_paths: list[str] = []
+
+        # scans run outside of _lock so that snapshots can be served meanwhile
+        self._refresh_lock = threading.Lock()
+        self._is_refresh_scheduled = False
+
+        # the directories to persist (None = removed), guarded by _lock
+        self._pending_directories: dict[str, Optional[_Directory]] = {}
+        self._is_save_scheduled = False
+
+        # the number of records in the index file, None if it must be rewritten, guarded by _save_lock
+        self._save_lock = threading.Lock()
+        self._record_count: Optional[int] = None
+
+        if index_file_path is not None:
+            self._load(index_file_path)
+
+    def get_time_range(self) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Gets the start times of the first and the last file or None if there are no files.
+        """
+
+        (timestamps, _) = self._get_snapshot()
+
+        if not timestamps:
+            return None
+
+        return (_to_datetime(timestamps[0]), _to_datetime(timestamps[-1]))
+
+    def get_availability(self, begin: datetime, end: datetime) -> float:
+        """
+        Gets the number of files starting within the period divided by the number of files
+        that fit into the period.
+
+            Args:
+                begin: The beginning of the period.
+                end: The end of the period.
+        """
+
+        (timestamps, _) = self._get_snapshot()
+
+        count = bisect.bisect_left(timestamps, _to_timestamp(end)) - \
+            bisect.bisect_left(timestamps, _to_timestamp(begin))
+
+        return count / ((end - begin) / self._file_period)
+
+    def find_files(self, begin: datetime, end: datetime) -> list[Tuple[datetime, str]]:
+        """
+        Gets the start times and paths of all files that overlap with the period, ordered by
+        start time.
+
+            Args:
+                begin: The beginning of the period.
+                end: The end of the period.
+        """
+
+        (timestamps, file_paths) = self._get_snapshot()
+
+        first = bisect.bisect_right(timestamps, _to_timestamp(begin - self._file_period))
+        last = bisect.bisect_left(timestamps, _to_timestamp(end))
+
+        return [
+            (_to_datetime(timestamps[index]), os.path.join(self._root, file_paths[index]))
+            for index in range(first, last)
+        ]
+
+    def refresh(self):
+        """
+        Scans all directories that have changed since the last refresh and persists the
+        index if it has changed.
+        """
+
+        self._refresh()
+        self._save()
+
+    async def refresh_async(self):
+        """
+        Scans all directories that have changed since the last refresh on the default executor
+        and persists the index if it has changed.
+        """
+
+        await asyncio.get_running_loop().run_in_executor(None, self.refresh)
+
+    def _get_snapshot(self) -> Tuple[array, list[str]]:
+
+        try:
+            loop = asyncio.get_running_loop()
+
+        except RuntimeError:
+            loop = None
+
+        with self._lock:
+
+            is_refresh_required = self._last_refresh is None or \
+                (not self._is_refresh_scheduled and time.monotonic() - self._last_refresh >= self._refresh_interval)
+
+            # there is no previous snapshot to serve before the first refresh
+            is_refresh_deferred = is_refresh_required and loop is not None and self._last_refresh is not None
+            self._is_refresh_scheduled = self._is_refresh_scheduled or is_refresh_deferred
+
+        if is_refresh_required and not is_refresh_deferred:
+            self._refresh()
+
+        with self._lock:
+
+            snapshot = (self._timestamps, self._file_paths)
+            is_save_required = bool(self._pending_directories) and not self._is_save_scheduled
+            self._is_save_scheduled = self._is_save_scheduled or is_save_required
+
+        # do not block the event loop with the directory scan
+        if is_refresh_deferred:
+            cast(asyncio.AbstractEventLoop, loop).run_in_executor(None, self._refresh_in_background)
+
+        if is_save_required:
+            self._schedule_save()
+
+        return snapshot
+
+    def _refresh_in_background(self):
+
+        try:
+            self._refresh()
+
+        finally:
+
+            with self._lock:
+                self._is_refresh_scheduled = False
+
+        self._save()
+
+    def _refresh(self):
+
+        # refreshes must not overtake each other, only they modify the index
+        with self._refresh_lock:
+
+            directories: dict[str, _Directory] = {}
+            changed_paths: set[str] = set()
+
+            self._update_directory("", directories, changed_paths)
+
+            removed_paths = self._directories.keys() - directories.keys()
+            changed_paths.update(removed_paths)
+
+            entries = self._get_entries(directories, changed_paths, removed_paths)
+
+            # snapshots are used outside of the lock, so they are replaced instead of modified
+            snapshot = None if entries is None else \
+                (array("q", (timestamp for timestamp, _ in entries)), [file_path for _, file_path in entries])
+
+            with self._lock:
+
+                self._directories = directories
+                self._last_refresh = time.monotonic()
+
+                if self._index_file_path is not None:
+                    self._pending_directories.update((path, directories.get(path)) for path in changed_paths)
+
+                if snapshot is not None:
+                    (self._timestamps, self._file_paths) = snapshot
+
+    def _get_entries(
+        self,
+        directories: dict[str, _Directory],
+        changed_paths: set[str],
+        removed_paths: set[str]
+    ) -> Optional[list[Tuple[int, str]]]:
+
+        # a loaded index has not been sorted yet
+        if self._last_refresh is None:
+
+            entries = sorted(
+                (timestamp, os.path.join(relative_path, file_name))
+                for relative_path, directory in directories.items()
+                for timestamp, file_name in zip(directory.timestamps, directory.files)
+            )
+
+        elif changed_paths:
+
+            # only the entries of changed directories are sorted, the rest is merged
+            kept_entries = (
+                (timestamp, file_path)
+                for timestamp, file_path in zip(self._timestamps, self._file_paths)
+                if os.path.dirname(file_path) not in changed_paths
+            )
+
+            added_entries = sorted(
+                (timestamp, os.path.join(relative_path, file_name))
+                for relative_path in changed_paths - removed_paths
+                for timestamp, file_name in zip(directories[relative_path].timestamps, directories[relative_path].files)
+            )
+
+            entries = list(heapq.merge(kept_entries, added_entries))
+
+        else:
+            entries = None
+
+        return entries
+
+    def _update_directory(self, relative_path: str, directories: dict[str, _Directory], changed_paths: set[str]):
+
+        path = os.path.join(self._root, relative_path)
+
+        try:
+            modified = os.stat(path).st_mtime
+
+        except FileNotFoundError:
+            return
+
+        previous_directory = self._directories.get(relative_path)
+        directory = previous_directory
+
+        if directory is None or directory.modified is None or directory.modified != modified:
+
+            directory = self._scan_directory(path, modified)
+
+            # recently modified directories are scanned on every refresh, mostly without changes
+            if directory != previous_directory:
+                changed_paths.add(relative_path)
+
+        directories[relative_path] = directory
+
+        for name in directory.directories:
+            self._update_directory(os.path.join(relative_path, name), directories, changed_paths)
+
+    def _scan_directory(self, path: str, modified: float) -> _Directory:
+
+        # a change within the same mtime tick would go unnoticed, so scan it again next time
+        if time.time() - modified < _MTIME_GRANULARITY:
+            directory = _Directory(None, [], [], [])
+
+        else:
+            directory = _Directory(modified, [], [], [])
+
+        with os.scandir(path) as entries:
+
+            for entry in entries:
+
+                if entry.is_dir():
+                    directory.directories.append(entry.name)
+
+                elif entry.is_file():
+
+                    try:
+                        file_begin = datetime \
+                            .strptime(entry.name, self._file_name_format) \
+                            .replace(tzinfo=timezone.utc)
+
+                    except ValueError:
+                        continue
+
+                    directory.files.append(entry.name)
+                    directory.timestamps.append(_to_timestamp(file_begin))
+
+        return directory
+
+    def _load(self, index_file_path: str):
+
+        try:
+            with open(index_file_path, "r") as file:
+                lines = file.read().splitlines()
+
+            header = json.loads(lines[0])
+
+        except (OSError, ValueError, IndexError):
+            return
+
+        # rebuild the index from scratch
+        if not isinstance(header, dict) or \
+            header.get("version") != _VERSION or \
+            header.get("root") != self._root or \
+            header.get("fileNameFormat") != self._file_name_format:
+            return
+
+        # each record holds the latest state of a directory or only its path if it has been removed
+        for line in lines[1:]:
+
+            try:
+                (relative_path, *values) = json.loads(line)
+
+            # a record that was being written when the process was terminated
+            except ValueError:
+                break
+
+            if values:
+                self._directories[relative_path] = _Directory(*values)
+
+            else:
+                self._directories.pop(relative_path, None)
+
+        self._record_count = len(lines) - 1
+
+    def _schedule_save(self):
+
+        try:
+            loop = asyncio.get_running_loop()
+
+        except RuntimeError:
+            self._save()
+
+        # do not block the event loop with file IO
+        else:
+            loop.run_in_executor(None, self._save)
+
+    def _save(self):
+
+        if self._index_file_path is None:
+            return
+
+        # saves must not overtake each other
+        with self._save_lock:
+
+            with self._lock:
+
+                pending_directories = self._pending_directories
+                self._pending_directories = {}
+                self._is_save_scheduled = False
+
+                # the index file only grows, so it is rewritten once most of its records are outdated
+                is_rewrite_required = self._record_count is None or \
+                    self._record_count + len(pending_directories) > 2 * len(self._directories) + 100
+
+                directories = dict(self._directories) if is_rewrite_required else None
+
+            if not pending_directories:
+                return
+
+            try:
+
+                if directories is None:
+
+                    with open(self._index_file_path, "a") as file:
+                        file.writelines(_to_record(relative_path, directory) for relative_path, directory in pending_directories.items())
+
+                    self._record_count = cast(int, self._record_count) + len(pending_directories)
+
+                else:
+                    self._rewrite(self._index_file_path, directories)
+                    self._record_count = len(directories)
+
+            # the index is rebuilt from the directories after a restart
+            except OSError:
+                self._record_count = None
+
+    def _rewrite(self, index_file_path: str, directories: dict[str, _Directory]):
+
+        header = {
+            "version": _VERSION,
+            "root": self._root,
+            "fileNameFormat": self._file_name_format
+        }
+
+        # replace atomically so that a crash or another process does not leave a corrupt index behind
+        (file_descriptor, temporary_file_path) = tempfile.mkstemp(
+            prefix=os.path.basename(index_file_path),
+            dir=os.path.dirname(index_file_path) or None
+        )
+
+        try:
+
+            with os.fdopen(file_descriptor, "w") as file:
+                file.write(json.dumps(header) + "\n")
+                file.writelines(_to_record(relative_path, directory) for relative_path, directory in directories.items())
+
+            os.replace(temporary_file_path, index_file_path)
+
+        except BaseException:
+            os.remove(temporary_file_path)
+            raise
+
+def _to_record(relative_path: str, directory: Optional[_Directory]) -> str:
+
+    values = [] if directory is None else \
+        [directory.modified, directory.directories, directory.files, directory.timestamps]
+
+    return json.dumps([relative_path, *values], separators=(",", ":")) + "\n"
+
+def _to_timestamp(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+def _to_datetime(timestamp: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=timestamp)
@@ -0,0 +1,111 @@
+import enum
+import math
+from array import array
+from typing import Optional, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TransferType(enum.IntEnum):
+    """Specifies the data type float64 data are transferred with (the value is used in binary frames)."""
+
+    Native = 0
+    Float32 = 1
+    ScaledInt16 = 2
+
+# marks non-finite values, the range of valid values is symmetric
+_INT16_NAN = -32768
+_INT16_MAX = 32767
+
+def reduce_precision(
+    data: memoryview,
+    status: memoryview,
+    transfer_type: TransferType
+) -> Tuple[memoryview, Optional[Tuple[float, float]]]:
+    """
+    Converts float64 data into the transfer type. For ScaledInt16, the values are mapped
+    linearly onto the range of the valid and finite samples (value = raw * scale + offset)
+    and all other samples are sent as -32768 (NaN). Returns the converted data and the
+    scale and offset (ScaledInt16 only).
+
+        Args:
+            data: The float64 data buffer.
+            status: The status buffer (1 = valid, 0 = invalid).
+            transfer_type: The transfer type.
+    """
+
+    if transfer_type == TransferType.Native:
+        return (data, None)
+
+    if numpy is not None:
+        return _reduce_precision_numpy(data, status, transfer_type)
+
+    else:
+        return _reduce_precision_python(data, status, transfer_type)
+
+def _get_scale(lower: float, upper: float) -> Tuple[float, float]:
+    return ((upper - lower) / (2 * _INT16_MAX), lower / 2 + upper / 2)
+
+def _reduce_precision_numpy(
+    data: memoryview,
+    status: memoryview,
+    transfer_type: TransferType
+) -> Tuple[memoryview, Optional[Tuple[float, float]]]:
+
+    assert numpy is not None
+
+    values = numpy.frombuffer(data, dtype=numpy.float64)
+
+    if transfer_type == TransferType.Float32:
+        return (memoryview(values.astype(numpy.float32)).cast("B"), None)
+
+    is_usable = (numpy.frombuffer(status, dtype=numpy.uint8) != 0) & numpy.isfinite(values)
+    usable_values = values[is_usable]
+
+    (scale, offset) = _get_scale(float(usable_values.min()), float(usable_values.max())) \
+        if usable_values.size > 0 else (0.0, 0.0)
+
+    if scale > 0:
+
+        with numpy.errstate(invalid="ignore"):
+            raw = numpy.rint((values - offset) / scale).clip(-_INT16_MAX, _INT16_MAX)
+
+    else:
+        raw = numpy.zeros_like(values)
+
+    result = numpy.where(is_usable, raw, _INT16_NAN).astype("<i2")
+
+    return (memoryview(result).cast("B"), (scale, offset))
+
+def _reduce_precision_python(
+    data: memoryview,
+    status: memoryview,
+    transfer_type: TransferType
+) -> Tuple[memoryview, Optional[Tuple[float, float]]]:
+
+    values = data.cast("B").cast("d")
+
+    if transfer_type == TransferType.Float32:
+        return (memoryview(array("f", values)).cast("B"), None)
+
+    usable_values = [
+        value for (value, is_valid) in zip(values, status)
+        if is_valid and math.isfinite(value)
+    ]
+
+    (scale, offset) = _get_scale(min(usable_values), max(usable_values)) \
+        if usable_values else (0.0, 0.0)
+
+    result = array("h", bytes(2 * len(values)))
+
+    for (index, (value, is_valid)) in enumerate(zip(values, status)):
+
+        if not is_valid or not math.isfinite(value):
+            result[index] = _INT16_NAN
+
+        elif scale > 0:
+            result[index] = max(-_INT16_MAX, min(_INT16_MAX, round((value - offset) / scale)))
+
+    return (memoryview(result).cast("B"), (scale, offset))
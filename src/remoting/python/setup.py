@@ -48,5 +48,10 @@ setuptools.setup(
     python_requires=">=3.10",
     install_requires=[
         "nexus-extensibility>=2.0.0b50"
-    ]
+    ],
+    extras_require={
+        "numpy": [
+            "numpy"
+        ]
+    }
 )
@@ -91,8 +91,41 @@ public class RemoteTests(RemoteTestsFixture fixture)
     }
 
     [Theory]
-    [InlineData(DOTNET)] 
-    [InlineData(PYTHON)] 
+    [InlineData(DOTNET)]
+    [InlineData(PYTHON)]
+    public async Task CanPreloadCatalogs(string language)
+    {
+        await _fixture.Initialize;
+
+        // Arrange
+        var context = CreateContext(language);
+
+        context = context with
+        {
+            SourceConfiguration = context.SourceConfiguration with { PreloadCatalogs = true }
+        };
+
+        var registrationsDataSource = new Remote() as IDataSource<RemoteSettings>;
+        var catalogDataSource = new Remote() as IDataSource<RemoteSettings>;
+
+        await registrationsDataSource.SetContextAsync(context, NullLogger.Instance, CancellationToken.None);
+        await catalogDataSource.SetContextAsync(context, NullLogger.Instance, CancellationToken.None);
+
+        // Act
+        var registrations = await registrationsDataSource.GetCatalogRegistrationsAsync("/", CancellationToken.None);
+        var catalog = await catalogDataSource.EnrichCatalogAsync(new ResourceCatalog("/A/B/C"), CancellationToken.None);
+
+        // Assert
+        var actualPaths = registrations.Select(registration => registration.Path).ToList();
+        var actualIds = catalog.Resources!.Select(resource => resource.Id).ToList();
+
+        Assert.True(new List<string>() { "/A/B/C", "/D/E/F" }.SequenceEqual(actualPaths));
+        Assert.True(new List<string>() { "resource1", "resource2" }.SequenceEqual(actualIds));
+    }
+
+    [Theory]
+    [InlineData(DOTNET)]
+    [InlineData(PYTHON)]
     public async Task CanProvideTimeRange(string language)
     {
         await _fixture.Initialize;
@@ -111,6 +144,37 @@ public class RemoteTests(RemoteTestsFixture fixture)
         Assert.Equal(expectedEnd, end);
     }
 
+    [Theory]
+    [InlineData(DOTNET)] 
+    [InlineData(PYTHON)] 
+    public async Task CanReuseSession(string language)
+    {
+        await _fixture.Initialize;
+
+        // Arrange
+        var context = CreateContext(language);
+
+        using (var previousDataSource = new Remote())
+        {
+            await ((IDataSource<RemoteSettings>)previousDataSource)
+                .SetContextAsync(context, NullLogger.Instance, CancellationToken.None);
+        }
+
+        using var remote = new Remote();
+        var dataSource = remote as IDataSource<RemoteSettings>;
+
+        var expectedBegin = new DateTime(2019, 12, 31, 12, 00, 00, DateTimeKind.Utc);
+        var expectedEnd = new DateTime(2020, 01, 02, 09, 50, 00, DateTimeKind.Utc);
+
+        // Act
+        await dataSource.SetContextAsync(context, NullLogger.Instance, CancellationToken.None);
+        var (begin, end) = await dataSource.GetTimeRangeAsync("/A/B/C", CancellationToken.None);
+
+        // Assert
+        Assert.Equal(expectedBegin, begin);
+        Assert.Equal(expectedEnd, end);
+    }
+
     [Theory]
     [InlineData(DOTNET)] 
     [InlineData(PYTHON)] 
@@ -131,9 +195,12 @@ public class RemoteTests(RemoteTestsFixture fixture)
     }
 
     [Theory]
-    [InlineData(DOTNET)] 
-    [InlineData(PYTHON)] 
-    public async Task CanReadFullDay(string language)
+    [InlineData(DOTNET, 0)]
+    [InlineData(DOTNET, 1)]
+    /* resource1 is streamed from file regions, resource2 is read by the data source */
+    [InlineData(PYTHON, 0)]
+    [InlineData(PYTHON, 1)]
+    public async Task CanReadFullDay(string language, int resourceIndex)
     {
         await _fixture.Initialize;
 
@@ -143,7 +210,7 @@ public class RemoteTests(RemoteTestsFixture fixture)
         await dataSource.SetContextAsync(context, NullLogger.Instance, CancellationToken.None);
 
         var catalog = await dataSource.EnrichCatalogAsync(new ResourceCatalog("/A/B/C"), CancellationToken.None);
-        var resource = catalog.Resources![0];
+        var resource = catalog.Resources![resourceIndex];
         var representation = resource.Representations![0];
 
         var catalogItem = new CatalogItem(
@@ -310,6 +377,149 @@ public class RemoteTests(RemoteTestsFixture fixture)
         Assert.True(expectedStatus.SequenceEqual(status.ToArray()));
     }
 
+    [Fact]
+    public async Task CanReadAggregated()
+    {
+        // Arrange
+        await _fixture.Initialize;
+
+        var dataSource = new Remote();
+        var context = CreateContext(PYTHON);
+
+        await dataSource.SetContextAsync(context, NullLogger.Instance, CancellationToken.None);
+
+        var catalog = await dataSource.EnrichCatalogAsync(new ResourceCatalog("/A/B/C"), CancellationToken.None);
+        var resource = catalog.Resources![0];
+        var representation = resource.Representations![0];
+
+        var catalogItem = new CatalogItem(
+            catalog with { Resources = default! },
+            resource with { Representations = default! },
+            representation,
+            default);
+
+        /* The file 2020-01-01_00-00-00.dat contains the unix timestamps of its samples */
+        var begin = new DateTime(2020, 01, 01, 0, 0, 0, DateTimeKind.Utc);
+        var end = new DateTime(2020, 01, 01, 0, 20, 0, DateTimeKind.Utc);
+        var aggregation = new Aggregation(AggregationKind.Mean, TimeSpan.FromMinutes(1));
+
+        var data = new double[20];
+        var status = new byte[20];
+
+        var fileBegin = new DateTimeOffset(begin).ToUnixTimeSeconds();
+
+        var expectedData = Enumerable
+            .Range(0, 20)
+            .Select(period => period < 10 ? fileBegin + period * 60 + 29.5 : double.NaN)
+            .ToArray();
+
+        var expectedStatus = Enumerable
+            .Range(0, 20)
+            .Select(period => period < 10 ? (byte)1 : (byte)0)
+            .ToArray();
+
+        // Act
+        await dataSource.ReadAggregatedAsync(begin, end, resource.Id, catalogItem, aggregation, data, status, default!, CancellationToken.None);
+
+        // Assert
+        Assert.True(expectedData.SequenceEqual(data));
+        Assert.True(expectedStatus.SequenceEqual(status));
+    }
+
+    [Theory]
+    /* float32 rounds the unix timestamps (~1.6e9) to multiples of 128, scaled int16 splits their range (540 s) into 65534 steps */
+    [InlineData(TransferType.Float32, 64.0)]
+    [InlineData(TransferType.ScaledInt16, 0.01)]
+    public async Task CanReadReducedPrecision(TransferType transferType, double tolerance)
+    {
+        // Arrange
+        await _fixture.Initialize;
+
+        var begin = new DateTime(2020, 01, 01, 0, 0, 0, DateTimeKind.Utc);
+        var end = new DateTime(2020, 01, 01, 0, 20, 0, DateTimeKind.Utc);
+        var aggregation = new Aggregation(AggregationKind.Mean, TimeSpan.FromMinutes(1));
+
+        /* Aggregated data are float64, so they are transferred with the configured transfer type */
+        async Task<(double[], byte[])> ReadAsync(TransferType transferType)
+        {
+            var dataSource = new Remote();
+            var context = CreateContext(PYTHON);
+
+            context = context with
+            {
+                SourceConfiguration = context.SourceConfiguration with { TransferType = transferType }
+            };
+
+            await dataSource.SetContextAsync(context, NullLogger.Instance, CancellationToken.None);
+
+            var catalog = await dataSource.EnrichCatalogAsync(new ResourceCatalog("/A/B/C"), CancellationToken.None);
+            var resource = catalog.Resources![0];
+            var representation = resource.Representations![0];
+
+            var catalogItem = new CatalogItem(
+                catalog with { Resources = default! },
+                resource with { Representations = default! },
+                representation,
+                default);
+
+            var data = new double[20];
+            var status = new byte[20];
+
+            await dataSource.ReadAggregatedAsync(begin, end, resource.Id, catalogItem, aggregation, data, status, default!, CancellationToken.None);
+
+            return (data, status);
+        }
+
+        var (expectedData, expectedStatus) = await ReadAsync(TransferType.Native);
+
+        // Act
+        var (actualData, actualStatus) = await ReadAsync(transferType);
+
+        // Assert
+        Assert.True(expectedStatus.SequenceEqual(actualStatus));
+
+        for (int i = 0; i < expectedData.Length; i++)
+        {
+            if (double.IsNaN(expectedData[i]))
+                Assert.True(double.IsNaN(actualData[i]));
+
+            else
+                Assert.InRange(actualData[i], expectedData[i] - tolerance, expectedData[i] + tolerance);
+        }
+    }
+
+    [Fact]
+    public async Task ReadAggregatedThrowsForOldAgents()
+    {
+        // Arrange
+        await _fixture.Initialize;
+
+        var dataSource = new Remote();
+        var context = CreateContext(DOTNET);
+
+        await dataSource.SetContextAsync(context, NullLogger.Instance, CancellationToken.None);
+
+        var catalog = await dataSource.EnrichCatalogAsync(new ResourceCatalog("/A/B/C"), CancellationToken.None);
+        var resource = catalog.Resources![0];
+        var representation = resource.Representations![0];
+
+        var catalogItem = new CatalogItem(
+            catalog with { Resources = default! },
+            resource with { Representations = default! },
+            representation,
+            default);
+
+        var begin = new DateTime(2020, 01, 01, 0, 0, 0, DateTimeKind.Utc);
+        var end = new DateTime(2020, 01, 01, 0, 10, 0, DateTimeKind.Utc);
+        var aggregation = new Aggregation(AggregationKind.Mean, TimeSpan.FromMinutes(1));
+
+        // Act
+        Task Action() => dataSource.ReadAggregatedAsync(begin, end, resource.Id, catalogItem, aggregation, new double[10], new byte[10], default!, CancellationToken.None);
+
+        // Assert
+        await Assert.ThrowsAsync<NotSupportedException>(Action);
+    }
+
     private static DataSourceContext<RemoteSettings> CreateContext(string language)
     {
         return new DataSourceContext<RemoteSettings>(
@@ -0,0 +1,84 @@
+using Xunit;
+
+namespace Nexus.Sources.Tests;
+
+public class TransferConverterTests
+{
+    /* The lengths cover empty spans, spans shorter than a vector and vectorized spans with a remainder */
+    [Theory]
+    [InlineData(0)]
+    [InlineData(1)]
+    [InlineData(7)]
+    [InlineData(16)]
+    [InlineData(33)]
+    [InlineData(100)]
+    public void CanWidenFloat32(int length)
+    {
+        // Arrange
+        var source = Enumerable
+            .Range(0, length)
+            .Select(value => value % 5 == 4 ? float.NaN : value * 0.1f - 1.5f)
+            .ToArray();
+
+        var expected = source
+            .Select(value => (double)value)
+            .ToArray();
+
+        var actual = new double[length];
+
+        // Act
+        TransferConverter.WidenFloat32(source, actual);
+
+        // Assert
+        Assert.Equal(expected, actual);
+    }
+
+    [Theory]
+    [InlineData(0)]
+    [InlineData(1)]
+    [InlineData(7)]
+    [InlineData(16)]
+    [InlineData(33)]
+    [InlineData(100)]
+    public void CanWidenScaledInt16(int length)
+    {
+        // Arrange
+        var scale = 0.25;
+        var offset = -10.0;
+
+        /* short.MinValue marks NaN, both within the vectorized part and the remainder */
+        var source = Enumerable
+            .Range(0, length)
+            .Select(value => value % 5 == 4 || value == length - 1 ? short.MinValue : (short)(value * 300 - short.MaxValue))
+            .ToArray();
+
+        var expected = source
+            .Select(value => value == short.MinValue ? double.NaN : value * scale + offset)
+            .ToArray();
+
+        var actual = new double[length];
+
+        // Act
+        TransferConverter.WidenScaledInt16(source, scale, offset, actual);
+
+        // Assert
+        Assert.Equal(expected, actual);
+    }
+
+    [Fact]
+    public void CanWidenScaledInt16Limits()
+    {
+        // Arrange
+        var source = new short[] { -short.MaxValue, 0, short.MaxValue, short.MinValue };
+        var actual = new double[source.Length];
+
+        // Act
+        TransferConverter.WidenScaledInt16(source, scale: 2.0, offset: 1.0, actual);
+
+        // Assert
+        Assert.Equal(-2.0 * short.MaxValue + 1.0, actual[0]);
+        Assert.Equal(1.0, actual[1]);
+        Assert.Equal(2.0 * short.MaxValue + 1.0, actual[2]);
+        Assert.True(double.IsNaN(actual[3]));
+    }
+}
@@ -1,17 +1,21 @@
 from abc import abstractmethod
-import glob
+import hashlib
 import os
+import tempfile
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Any, Callable
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
 from urllib.request import url2pathname
 
-from nexus_extensibility import (CatalogRegistration, CatalogTimeRange,
+from nexus_extensibility import (CatalogItem, CatalogRegistration, CatalogTimeRange,
                                  DataSourceContext, IDataSource,
                                  IUpgradableDataSource, LogLevel,
                                  NexusDataType, ReadDataHandler, ReadRequest,
                                  Representation, ResourceBuilder,
                                  ResourceCatalog, ResourceCatalogBuilder)
+from nexus_remoting import (FileBlockReader, FileRegion, FileTimeIndex,
+                            IFileRegionDataSource, get_sample_offset,
+                            set_status, transform)
 
 
 @dataclass(frozen=True)
@@ -24,9 +28,11 @@ class TestBase(IUpgradableDataSource):
     async def upgrade_source_configuration(self, configuration: Any) -> Any:
         configuration["foo"] = configuration["logMessage"]
 
-class Test(TestBase, IDataSource[TestSettings]):
+class Test(TestBase, IFileRegionDataSource, IDataSource[TestSettings]):
     
     _root: str
+    _file_reader = FileBlockReader()
+    _time_indices: dict[str, FileTimeIndex] = {}
 
     async def upgrade_source_configuration(self, configuration: Any) -> Any:
 
@@ -46,6 +52,7 @@ class Test(TestBase, IDataSource[TestSettings]):
             raise Exception(f"Expected 'file' URI scheme, but got '{context.resource_locator.scheme}'.")
 
         self._root = context.resource_locator.path
+        self._time_index = await self._get_time_index(url2pathname(self._root))
 
         logger.log(LogLevel.Information, self._context.source_configuration.log_message)
 
@@ -112,11 +119,12 @@ class Test(TestBase, IDataSource[TestSettings]):
         if catalog_id != "/A/B/C":
             raise Exception("Unknown catalog identifier.")
 
-        file_paths = glob.glob(url2pathname(self._root) + "/**/*.dat", recursive=True)
-        file_names = [os.path.basename(file_path) for file_path in file_paths]
-        date_times = sorted([datetime.strptime(fileName, '%Y-%m-%d_%H-%M-%S.dat') for fileName in file_names])
-        begin = date_times[0].replace(tzinfo = timezone.utc)
-        end = date_times[-1].replace(tzinfo = timezone.utc)
+        time_range = self._time_index.get_time_range()
+
+        if time_range is None:
+            raise Exception("There are no data files.")
+
+        (begin, end) = time_range
 
         return CatalogTimeRange(begin, end)
 
@@ -125,15 +133,33 @@ class Test(TestBase, IDataSource[TestSettings]):
         if catalog_id != "/A/B/C":
             raise Exception("Unknown catalog identifier.")
 
-        period_per_file = timedelta(minutes = 10)
-        max_file_count = (end - begin).total_seconds() / period_per_file.total_seconds()
-        file_paths = glob.glob(url2pathname(self._root) + "/**/*.dat", recursive=True)
-        file_names = [os.path.basename(file_path) for file_path in file_paths]
-        date_times = [datetime.strptime(fileName, "%Y-%m-%d_%H-%M-%S.dat").replace(tzinfo=timezone.utc) for fileName in file_names]
-        filtered_date_times = [current for current in date_times if current >= begin and current < end]
-        actual_file_count = len(filtered_date_times)
-        
-        return actual_file_count / max_file_count
+        return self._time_index.get_availability(begin, end)
+
+    async def get_file_regions(
+        self,
+        begin: datetime,
+        end: datetime,
+        original_resource_name: str,
+        catalog_item: CatalogItem) -> Optional[list[FileRegion]]:
+
+        # resource2 is read by the read method to keep that path covered
+        if catalog_item.catalog.id != "/A/B/C" or catalog_item.resource.id != "resource1":
+            return None
+
+        # The test files already contain 8 byte little-endian samples (see _read_local_files),
+        # so they can be streamed by the agent without being copied into the request buffers.
+        sample_period = catalog_item.representation.sample_period
+        element_size = catalog_item.representation.element_size
+
+        return [
+            FileRegion(
+                file_path,
+                0,
+                get_sample_offset(begin, file_begin, sample_period),
+                os.path.getsize(file_path) // element_size
+            )
+            for file_begin, file_path in self._time_index.find_files(begin, end)
+        ]
 
     def read(self, 
         begin: datetime, 
@@ -167,51 +193,21 @@ class Test(TestBase, IDataSource[TestSettings]):
         # ...
         # The data itself is made up of progressing timestamps (unix time represented 
         # stored as 8 byte little-endian integers) with a sample rate of 1 Hz.
-        for request in requests:
-        
-            samples_per_second = int(1 / request.catalog_item.representation.sample_period.total_seconds())
-            seconds_per_file = 600
-            type_size = 8
-
-            # go
-            current_begin = begin
-
-            while current_begin < end:
-
-                # find files
-                search_pattern = url2pathname(self._root) + \
-                    f"/{current_begin.strftime('%Y-%m')}/{current_begin.strftime('%Y-%m-%d')}/*.dat"
-
-                file_paths = glob.glob(search_pattern, recursive=True)
+        # The file start times are looked up in the time index instead of globbing
+        # the day folders on every read.
+        file_entries = self._time_index.find_files(begin, end)
 
-                # for each file found in target folder
-                for file_path in file_paths:
-
-                    fileName = os.path.basename(file_path)
-
-                    file_begin = datetime \
-                        .strptime(fileName, '%Y-%m-%d_%H-%M-%S.dat') \
-                        .replace(tzinfo=timezone.utc)
-                    
-                    # if file date/time is within the limits
-                    if file_begin >= current_begin and file_begin < end:
-
-                        # compute target offset and file length
-                        target_offset = int((file_begin - begin).total_seconds()) * samples_per_second
-                        file_length = samples_per_second * seconds_per_file
+        for request in requests:
 
-                        # load and copy binary data
-                        with open(file_path, "rb") as file:
-                            file_data = file.read()
+            sample_period = request.catalog_item.representation.sample_period
 
-                        for i in range(0, file_length * type_size):    
-                            request.data[(target_offset * type_size) + i] = file_data[i]
+            for file_begin, file_path in file_entries:
 
-                        # set status to 1 for all written data
-                        for i in range(0, file_length):    
-                            request.status[target_offset + i] = 1
+                # compute target offset
+                target_offset = get_sample_offset(begin, file_begin, sample_period)
 
-                current_begin += timedelta(days = 1)
+                # copy binary data (this also sets the status to 1 for all written data)
+                self._file_reader.copy_samples(request, file_path, target_offset)
 
     async def _read_and_modify_nexus_data(
         self, 
@@ -225,8 +221,28 @@ class Test(TestBase, IDataSource[TestSettings]):
             data_from_nexus = await read_data("/need/more/data/1_s", begin, end)
             double_data = request.data.cast("d")
 
-            for i in range(0, len(double_data)):
-                double_data[i] = data_from_nexus[i] * 2
+            transform(data_from_nexus, double_data, lambda value: value * 2)
+            set_status(request.status, 0, len(request.status))
+
+    @classmethod
+    async def _get_time_index(cls, root: str) -> FileTimeIndex:
+
+        time_index = cls._time_indices.get(root)
+
+        if time_index is None:
+
+            # persist the index so that a restarted agent does not need to scan the whole tree again
+            index_file_name = f"nexus-time-index-{hashlib.sha256(root.encode()).hexdigest()[:16]}.json"
+
+            time_index = FileTimeIndex(
+                root,
+                "%Y-%m-%d_%H-%M-%S.dat",
+                timedelta(minutes=10),
+                index_file_path=os.path.join(tempfile.gettempdir(), index_file_name)
+            )
+
+            # the first scan must not block the event loop, later ones run in the background
+            await time_index.refresh_async()
+            cls._time_indices[root] = time_index
 
-            for i in range(0, len(request.status)):
-                request.status[i] = 1
\ No newline at end of file
+        return time_index
\ No newline at end of file
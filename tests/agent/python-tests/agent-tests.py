@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import socket
+import sys
+import threading
+import types
+import uuid
+
+from apollo3zehn_package_management import PackageReference
+from services import AgentService, SocketOptions, configure_connection
+
+
+class _PackageService:
+
+    def __init__(self, package_references: dict[uuid.UUID, PackageReference]):
+        self.package_references = package_references
+        self.threads: list[threading.Thread] = []
+
+    async def get_all(self):
+        self.threads.append(threading.current_thread())
+        return self.package_references
+
+class _ExtensionHive:
+
+    def __init__(self):
+        self._extensions = []
+
+    async def load_packages(self, package_reference_map: dict[uuid.UUID, PackageReference]):
+
+        for package_reference in package_reference_map.values():
+
+            if package_reference.configuration["version"] == "broken":
+                sys.modules["agent_test_package"] = types.ModuleType("agent_test_package")
+                raise Exception("The package could not be loaded.")
+
+            module = types.ModuleType("agent_test_package")
+            module.Extension = type("Extension", (), {}) # pyright: ignore
+            sys.modules["agent_test_package"] = module
+
+            self._extensions.append(module.Extension) # pyright: ignore
+
+    def get_extensions(self):
+        return self._extensions
+
+def _create_agent_service(package_service: _PackageService, restore_package=None) -> AgentService:
+
+    return AgentService(
+        lambda: _ExtensionHive(), # pyright: ignore
+        package_service, # pyright: ignore
+        logging.getLogger(),
+        "127.0.0.1",
+        0,
+        restore_package=restore_package
+    )
+
+def can_keep_previous_package_version_test():
+
+    async def test():
+
+        # Arrange
+        id = uuid.uuid4()
+        package_reference = PackageReference("local", { "import": "agent_test_package", "version": "1" })
+        package_service = _PackageService({ id: package_reference })
+        agent_service = _create_agent_service(package_service)
+
+        await agent_service.load_packages()
+        previous_module = sys.modules["agent_test_package"]
+        previous_extension_hives = agent_service._extension_hives
+
+        # Act
+        package_service.package_references = { id: PackageReference("local", { "import": "agent_test_package", "version": "broken" }) }
+        await agent_service.load_packages()
+
+        # Assert
+        assert sys.modules["agent_test_package"] is previous_module
+        assert agent_service._extension_hives == previous_extension_hives
+
+    try:
+        asyncio.run(test())
+
+    finally:
+        sys.modules.pop("agent_test_package", None)
+
+def can_restore_package_off_the_loop_test():
+
+    async def test():
+
+        # Arrange
+        id = uuid.uuid4()
+        package_reference = PackageReference("local", { "import": "agent_test_package", "version": "1" })
+        package_service = _PackageService({ id: package_reference })
+        restore_threads: list[threading.Thread] = []
+
+        def restore_package(package_reference: PackageReference):
+            assert "agent_test_package" not in sys.modules
+            restore_threads.append(threading.current_thread())
+
+        agent_service = _create_agent_service(package_service, restore_package)
+
+        # Act
+        await agent_service.load_packages()
+
+        # Assert
+        assert len(restore_threads) == 1
+        assert restore_threads[0] is not threading.current_thread()
+        assert id in agent_service._extension_hives
+
+    try:
+        asyncio.run(test())
+
+    finally:
+        sys.modules.pop("agent_test_package", None)
+
+def can_confine_package_service_to_server_loop_test():
+
+    # Arrange
+    package_service = _PackageService({})
+    agent_service = _create_agent_service(package_service)
+
+    server_loop = asyncio.new_event_loop()
+    server_thread = threading.Thread(target=server_loop.run_forever)
+    server_thread.start()
+
+    try:
+
+        agent_service._server_loop.set_result(server_loop)
+
+        # Act
+        actual = asyncio.run(agent_service.get_package_references())
+
+    finally:
+        server_loop.call_soon_threadsafe(server_loop.stop)
+        server_thread.join()
+        server_loop.close()
+
+    # Assert
+    assert actual == {}
+    assert package_service.threads == [server_thread]
+
+def can_configure_accepted_connection_test():
+
+    async def test():
+
+        # Arrange
+        options = SocketOptions(
+            tcp_no_delay=True,
+            send_buffer_size=64 * 1024,
+            receive_buffer_size=64 * 1024,
+            write_buffer_high_water_mark=1024 * 1024,
+            write_buffer_low_water_mark=256 * 1024
+        )
+
+        accepted = asyncio.get_running_loop().create_future()
+
+        async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+
+            # Act
+            configure_connection(writer, options, is_data_connection=True)
+            accepted.set_result(writer)
+
+        server = await asyncio.start_server(handle_client, host="127.0.0.1", port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+
+            (_, client_writer) = await asyncio.open_connection("127.0.0.1", port)
+            writer: asyncio.StreamWriter = await accepted
+            sock: socket.socket = writer.get_extra_info("socket")
+
+            # Assert
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+
+            # the kernel may double the requested size
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) >= options.send_buffer_size
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= options.receive_buffer_size
+
+            assert writer.transport.get_write_buffer_limits() == (256 * 1024, 1024 * 1024) # pyright: ignore
+
+            client_writer.close()
+            writer.close()
+
+    asyncio.run(test())
@@ -1,2 +1,856 @@
+import asyncio
+import json
+import math
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Optional
+
+import nexus_remoting._buffers
+from nexus_extensibility import CatalogRegistration, LogLevel, NexusDataType
+from nexus_remoting._aggregation import AggregationKind, aggregate
+from nexus_remoting._buffers import (copy_samples, get_sample_offset, set_status,
+                                     transform)
+from nexus_remoting._catalog_tree import get_catalog_tree
+from nexus_remoting._coalescing import ReadCoalescer
+from nexus_remoting._prefetch import PrefetchBudget, Prefetcher
+from nexus_remoting._file_reader import FileBlockReader
+from nexus_remoting._parallel_reads import get_read_slices
+from nexus_remoting._file_regions import (FileRegion, _FileRegionPayload,
+                                          _prepare_file_regions)
+from nexus_remoting._protocol import from_ticks, to_ticks
+from nexus_remoting._remoting import RemoteCommunicator, _Logger
+from nexus_remoting._scheduler import Scheduler
+from nexus_remoting._time_index import FileTimeIndex
+from nexus_remoting._transfer import TransferType, reduce_precision
+
+
+class _Writer:
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+def _read_messages(data: bytes) -> list:
+
+    messages = []
+    offset = 0
+
+    while offset < len(data):
+        (length,) = struct.unpack_from(">I", data, offset)
+        messages.append(json.loads(data[offset + 4:offset + 4 + length]))
+        offset += 4 + length
+
+    return messages
+
+def _create_communicator(data_reader: asyncio.StreamReader, scheduler: Optional[Scheduler] = None) -> RemoteCommunicator:
+
+    writer = _Writer()
+
+    return RemoteCommunicator(
+        asyncio.StreamReader(),
+        writer, # pyright: ignore
+        data_reader,
+        writer, # pyright: ignore
+        get_data_source_type=lambda _: object,
+        scheduler=scheduler
+    )
+
 def dummy_test():
-    pass
\ No newline at end of file
+    pass
+
+def can_roundtrip_ticks_test():
+
+    # Arrange
+    value = datetime(2020, 1, 2, 3, 4, 5, 678900, tzinfo=timezone.utc)
+    expected_ticks = 637135310456789000
+
+    # Act
+    actual_ticks = to_ticks(value)
+    actual_value = from_ticks(actual_ticks)
+
+    # Assert
+    assert actual_ticks == expected_ticks
+    assert actual_value == value
+
+def can_aggregate_valid_samples_test():
+
+    # Arrange
+    data = memoryview(struct.pack("<8h", 1, 2, 3, 4, 5, 6, 7, 8))
+    status = memoryview(bytes([0, 1, 1, 0, 0, 0, 0, 0]))
+
+    expected = {
+        AggregationKind.Mean: 2.5,
+        AggregationKind.Min: 2,
+        AggregationKind.Max: 3,
+        AggregationKind.First: 2,
+        AggregationKind.Last: 3
+    }
+
+    for kind, expected_value in expected.items():
+
+        # Act
+        (actual_data, actual_status) = aggregate(data, status, NexusDataType.INT16, 4, kind)
+        actual_values = struct.unpack("<2d", actual_data)
+
+        # Assert
+        assert actual_values[0] == expected_value
+        assert math.isnan(actual_values[1])
+        assert bytes(actual_status) == bytes([1, 0])
+
+def can_find_files_in_time_index_test():
+
+    # Arrange
+    with tempfile.TemporaryDirectory() as root:
+
+        folder_path = os.path.join(root, "2020-01-01")
+        os.mkdir(folder_path)
+
+        for file_name in ["2020-01-01_00-20-00.dat", "2020-01-01_00-00-00.dat", "2020-01-01_00-10-00.dat", "readme.txt"]:
+            open(os.path.join(folder_path, file_name), "wb").close()
+
+        # recently modified directories are always scanned again
+        for path in [folder_path, root]:
+            os.utime(path, (0, 0))
+
+        index_file_path = os.path.join(root, "index.json")
+        FileTimeIndex(root, "%Y-%m-%d_%H-%M-%S.dat", timedelta(minutes=10), index_file_path).refresh()
+
+        # a file that is only found by scanning the directory again
+        open(os.path.join(folder_path, "2020-01-01_00-30-00.dat"), "wb").close()
+
+        for path in [folder_path, root]:
+            os.utime(path, (0, 0))
+
+        # Act
+        time_index = FileTimeIndex(root, "%Y-%m-%d_%H-%M-%S.dat", timedelta(minutes=10), index_file_path)
+
+        actual_time_range = time_index.get_time_range()
+        actual_availability = time_index.get_availability(datetime(2020, 1, 1, tzinfo=timezone.utc), datetime(2020, 1, 1, 1, tzinfo=timezone.utc))
+        actual_files = time_index.find_files(datetime(2020, 1, 1, 0, 15, tzinfo=timezone.utc), datetime(2020, 1, 1, 0, 20, tzinfo=timezone.utc))
+
+        # Assert
+        assert actual_time_range == (datetime(2020, 1, 1, 0, 0, tzinfo=timezone.utc), datetime(2020, 1, 1, 0, 20, tzinfo=timezone.utc))
+        assert actual_availability == 0.5
+        assert actual_files == [(datetime(2020, 1, 1, 0, 10, tzinfo=timezone.utc), os.path.join(folder_path, "2020-01-01_00-10-00.dat"))]
+
+def can_merge_changed_directories_into_time_index_test():
+
+    # Arrange
+    with tempfile.TemporaryDirectory() as root:
+
+        folder_paths = [os.path.join(root, "2020-01-01"), os.path.join(root, "2020-01-02")]
+
+        for folder_path in folder_paths:
+
+            os.mkdir(folder_path)
+            file_name = f"{os.path.basename(folder_path)}_00-00-00.dat"
+            open(os.path.join(folder_path, file_name), "wb").close()
+
+        index_file_path = os.path.join(root, "index.json")
+        time_index = FileTimeIndex(root, "%Y-%m-%d_%H-%M-%S.dat", timedelta(minutes=10), index_file_path)
+        time_index.refresh()
+
+        # Act
+        open(os.path.join(folder_paths[0], "2020-01-01_00-10-00.dat"), "wb").close()
+        os.remove(os.path.join(folder_paths[1], "2020-01-02_00-00-00.dat"))
+        os.rmdir(folder_paths[1])
+
+        time_index.refresh()
+        actual_files = time_index.find_files(datetime(2020, 1, 1, tzinfo=timezone.utc), datetime(2020, 1, 3, tzinfo=timezone.utc))
+        actual_reloaded_files = FileTimeIndex(root, "%Y-%m-%d_%H-%M-%S.dat", timedelta(minutes=10), index_file_path) \
+            .find_files(datetime(2020, 1, 1, tzinfo=timezone.utc), datetime(2020, 1, 3, tzinfo=timezone.utc))
+
+        # Assert
+        expected_files = [
+            (datetime(2020, 1, 1, 0, 0, tzinfo=timezone.utc), os.path.join(folder_paths[0], "2020-01-01_00-00-00.dat")),
+            (datetime(2020, 1, 1, 0, 10, tzinfo=timezone.utc), os.path.join(folder_paths[0], "2020-01-01_00-10-00.dat"))
+        ]
+
+        assert actual_files == expected_files
+        assert actual_reloaded_files == expected_files
+
+def can_serve_previous_snapshot_during_time_index_refresh_test():
+
+    async def test():
+
+        with tempfile.TemporaryDirectory() as root:
+
+            # Arrange
+            open(os.path.join(root, "2020-01-01_00-00-00.dat"), "wb").close()
+
+            time_index = FileTimeIndex(root, "%Y-%m-%d_%H-%M-%S.dat", timedelta(minutes=10), refresh_interval=timedelta(0))
+            await time_index.refresh_async()
+
+            open(os.path.join(root, "2020-01-01_00-10-00.dat"), "wb").close()
+
+            # Act
+            actual_time_range_1 = time_index.get_time_range()
+
+            while time_index._is_refresh_scheduled:
+                await asyncio.sleep(0.01)
+
+            actual_time_range_2 = time_index.get_time_range()
+
+            # Assert
+            assert actual_time_range_1 == (datetime(2020, 1, 1, 0, 0, tzinfo=timezone.utc), datetime(2020, 1, 1, 0, 0, tzinfo=timezone.utc))
+            assert actual_time_range_2 == (datetime(2020, 1, 1, 0, 0, tzinfo=timezone.utc), datetime(2020, 1, 1, 0, 10, tzinfo=timezone.utc))
+
+    asyncio.run(test())
+
+def can_reduce_precision_test():
+
+    # Arrange
+    data = memoryview(struct.pack("<4d", -1.0, 3.0, math.nan, 1.0))
+    status = memoryview(bytes([1, 1, 1, 0]))
+
+    # Act
+    (actual_data, actual_scale) = reduce_precision(data, status, TransferType.ScaledInt16)
+    (scale, offset) = actual_scale # pyright: ignore
+    actual_values = [value * scale + offset for value in struct.unpack("<4h", actual_data)[:2]]
+
+    # Assert
+    assert struct.unpack("<4h", actual_data)[2:] == (-32768, -32768)
+    assert actual_values == [-1.0, 3.0]
+
+def can_coalesce_identical_reads_test():
+
+    # Arrange
+    read_count = 0
+    coalescer = ReadCoalescer()
+
+    async def read():
+
+        nonlocal read_count
+        read_count += 1
+        await asyncio.sleep(0.01)
+
+        return ("data", True)
+
+    async def read_concurrently():
+        return await asyncio.gather(coalescer.read("key", read), coalescer.read("key", read))
+
+    # Act
+    actual = asyncio.run(read_concurrently())
+
+    # Assert
+    assert actual == ["data", "data"]
+    assert read_count == 1
+    assert coalescer.coalesced_count == 1
+
+def can_read_data_into_buffer_test():
+
+    async def test():
+
+        # Arrange
+        data_reader = asyncio.StreamReader()
+        communicator = _create_communicator(data_reader)
+
+        for values in [(1.0, 2.0), (3.0, 4.0, 5.0), (6.0,)]:
+            data_reader.feed_data(struct.pack(">I", 8 * len(values)) + struct.pack(f"<{len(values)}d", *values))
+
+        buffer = memoryview(bytearray(16))
+        too_small_buffer = memoryview(bytearray(16))
+        begin = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+        # Act
+        actual1 = await communicator._read_data_from_server("/a/b/1_s", begin, begin, buffer)
+
+        try:
+            await communicator._read_data_from_server("/a/b/1_s", begin, begin, too_small_buffer)
+            raise AssertionError("An exception was expected.")
+
+        except Exception as ex:
+            assert "length" in str(ex)
+
+        actual3 = await communicator._read_data_from_server("/a/b/1_s", begin, begin, None)
+
+        # Assert
+        assert list(actual1) == [1.0, 2.0]
+        assert actual1.obj is buffer.obj
+        assert list(actual3) == [6.0]
+
+    asyncio.run(test())
+
+def can_clip_file_regions_test():
+
+    with tempfile.TemporaryDirectory() as root:
+
+        # Arrange
+        file_path = os.path.join(root, "data.dat")
+
+        with open(file_path, "wb") as file:
+            file.write(struct.pack("<6q", 1, 2, 3, 4, 5, 6))
+
+        status = memoryview(bytearray(4))
+
+        regions = [
+            # begins before the buffer
+            FileRegion(file_path, 0, -2, 3),
+            # exceeds the file
+            FileRegion(file_path, 32, 1, 3),
+            # exceeds the buffer
+            FileRegion(file_path, 0, 3, 6)
+        ]
+
+        # Act
+        actual = _prepare_file_regions(regions, status, 8)
+
+        # Assert
+        assert actual == [
+            FileRegion(file_path, 16, 0, 1),
+            FileRegion(file_path, 32, 1, 2),
+            FileRegion(file_path, 0, 3, 1)
+        ]
+
+        assert bytes(status) == bytes([1, 1, 1, 1])
+
+def can_detect_overlapping_file_regions_test():
+
+    with tempfile.TemporaryDirectory() as root:
+
+        # Arrange
+        file_path = os.path.join(root, "data.dat")
+
+        with open(file_path, "wb") as file:
+            file.write(bytes(8 * 4))
+
+        status = memoryview(bytearray(4))
+        regions = [FileRegion(file_path, 0, 0, 2), FileRegion(file_path, 0, 1, 2)]
+
+        # Act
+        try:
+            _prepare_file_regions(regions, status, 8)
+            raise AssertionError("An exception was expected.")
+
+        # Assert
+        except Exception as ex:
+            assert "overlaps" in str(ex)
+
+def can_stream_file_regions_test():
+
+    async def test(root: str):
+
+        # Arrange
+        file_path1 = os.path.join(root, "data1.dat")
+        file_path2 = os.path.join(root, "data2.dat")
+
+        for file_path in [file_path1, file_path2]:
+            with open(file_path, "wb") as file:
+                file.write(struct.pack("<2q", 1, 2))
+
+        (data, status) = (memoryview(bytearray(8 * 5)), memoryview(bytearray(5)))
+        regions = _prepare_file_regions([FileRegion(file_path1, 0, 1, 2), FileRegion(file_path2, 0, 3, 2)], status, 8)
+        payload = _FileRegionPayload(regions, data, status, 8)
+
+        # the file is removed after the success header has been written
+        os.remove(file_path2)
+
+        (socket1, socket2) = socket.socketpair()
+        (_, writer) = await asyncio.open_connection(sock=socket1)
+        (reader, _) = await asyncio.open_connection(sock=socket2)
+
+        # Act
+        await payload.write_to(writer)
+        await writer.drain()
+        actual_data = await reader.readexactly(8 * 5)
+
+        writer.close()
+
+        # Assert
+        assert struct.unpack("<5q", actual_data) == (0, 1, 2, 0, 0)
+        assert bytes(status) == bytes([0, 1, 1, 0, 0])
+
+    with tempfile.TemporaryDirectory() as root:
+        asyncio.run(test(root))
+
+def can_wait_for_cancelled_prefetch_test():
+
+    async def test():
+
+        # Arrange
+        budget = PrefetchBudget(100)
+        prefetcher = Prefetcher(budget)
+        is_finished = False
+
+        async def read(begin: datetime, end: datetime):
+
+            nonlocal is_finished
+
+            try:
+                await asyncio.sleep(10)
+
+            # e.g. running slices of a parallel read
+            finally:
+                await asyncio.sleep(0.01)
+                is_finished = True
+
+        begin = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        hour = timedelta(hours=1)
+
+        prefetcher.track("key", begin, begin + hour, 10, read)
+        prefetcher.track("key", begin + hour, begin + 2 * hour, 10, read)
+        prefetcher.start()
+        await asyncio.sleep(0.01)
+
+        # Act
+        actual = await prefetcher.take("key", begin + 2 * hour, begin + 4 * hour)
+
+        # Assert
+        assert actual is None
+        assert is_finished
+        assert budget.size == 0
+
+    asyncio.run(test())
+
+def can_wait_for_running_slices_on_cancellation_test():
+
+    # Arrange
+    release = threading.Event()
+    finished_slices = []
+
+    class _DataSource:
+
+        async def read(self, begin, end, requests, read_data, report_progress):
+            release.wait()
+            finished_slices.append(begin)
+
+    async def test():
+
+        communicator = _create_communicator(asyncio.StreamReader())
+        communicator._data_source = _DataSource() # pyright: ignore
+
+        begin = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        catalog_item = SimpleNamespace(representation=SimpleNamespace(element_size=8))
+        (data, status) = (memoryview(bytearray(8 * 2)), memoryview(bytearray(2)))
+
+        task = asyncio.create_task(communicator._read_slices(
+            begin, timedelta(seconds=1), "resource1", catalog_item, data, status, [(0, 1), (1, 1)], None)) # pyright: ignore
+
+        await asyncio.sleep(0.1)
+
+        # Act
+        task.cancel()
+        await asyncio.sleep(0.1)
+        is_done_while_running = task.done()
+
+        release.set()
+        await asyncio.wait([task])
+
+        # Assert
+        assert not is_done_while_running
+        assert task.cancelled()
+        assert len(finished_slices) == 2
+
+    asyncio.run(test())
+
+def can_read_blocks_from_growing_file_test():
+
+    with tempfile.TemporaryDirectory() as root:
+
+        # Arrange
+        file_path = os.path.join(root, "data.dat")
+        empty_file_path = os.path.join(root, "empty.dat")
+
+        with open(file_path, "wb") as file:
+            file.write(struct.pack("<2q", 1, 2))
+
+        open(empty_file_path, "wb").close()
+
+        with FileBlockReader() as reader:
+
+            # Act
+            actual1 = bytes(reader.read(file_path, 8, 16))
+            actual_empty = bytes(reader.read(empty_file_path))
+
+            with open(file_path, "ab") as file:
+                file.write(struct.pack("<q", 3))
+
+            # a changed size leads to a new map
+            os.utime(file_path, (0, 0))
+            actual2 = bytes(reader.read(file_path, 8))
+
+        # Assert
+        assert actual1 == struct.pack("<q", 2)
+        assert actual_empty == b""
+        assert actual2 == struct.pack("<2q", 2, 3)
+
+def can_copy_samples_from_file_test():
+
+    with tempfile.TemporaryDirectory() as root:
+
+        # Arrange
+        file_path = os.path.join(root, "data.dat")
+
+        with open(file_path, "wb") as file:
+            file.write(struct.pack("<4q", 1, 2, 3, 4))
+
+        request = SimpleNamespace(
+            catalog_item=SimpleNamespace(representation=SimpleNamespace(element_size=8)),
+            data=memoryview(bytearray(8 * 3)),
+            status=memoryview(bytearray(3))
+        )
+
+        with FileBlockReader() as reader:
+
+            # Act
+            actual_count = reader.copy_samples(request, file_path, -2) # pyright: ignore
+
+        # Assert
+        assert actual_count == 2
+        assert struct.unpack("<3q", request.data) == (3, 4, 0)
+        assert bytes(request.status) == bytes([1, 1, 0])
+
+def can_get_sample_offset_test():
+
+    # Arrange
+    begin = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    # Act
+    actual1 = get_sample_offset(begin, begin + timedelta(minutes=10), timedelta(seconds=1))
+    actual2 = get_sample_offset(begin, begin - timedelta(seconds=2), timedelta(milliseconds=500))
+
+    # Assert
+    assert actual1 == 600
+    assert actual2 == -4
+
+def can_copy_samples_and_set_status_test():
+
+    # Arrange
+    request = SimpleNamespace(
+        catalog_item=SimpleNamespace(representation=SimpleNamespace(element_size=2)),
+        data=memoryview(bytearray(2 * 4)),
+        status=memoryview(bytearray(4))
+    )
+
+    source = struct.pack("<4h", 1, 2, 3, 4)
+
+    # Act
+    actual_count1 = copy_samples(request, source, -1, count=2) # pyright: ignore
+    actual_count2 = copy_samples(request, source, 2, source_offset=1) # pyright: ignore
+    set_status(request.status, 1, 10, 0)
+
+    # Assert
+    assert actual_count1 == 1
+    assert actual_count2 == 2
+    assert struct.unpack("<4h", request.data) == (2, 0, 2, 3)
+    assert bytes(request.status) == bytes([1, 0, 0, 0])
+
+def can_transform_with_and_without_numpy_test():
+
+    # Arrange
+    source = memoryview(struct.pack("<3d", 1.0, 2.0, 3.0)).cast("d")
+    numpy = nexus_remoting._buffers.numpy
+
+    for use_numpy in [True, False]:
+
+        nexus_remoting._buffers.numpy = numpy if use_numpy else None
+
+        try:
+
+            target = memoryview(bytearray(8 * 3)).cast("d")
+            integer_target = memoryview(bytearray(8 * 3)).cast("q")
+
+            # Act
+            transform(source, target, lambda value: value * 2)
+
+            # Assert
+            assert list(target) == [2.0, 4.0, 6.0]
+
+            try:
+                transform(source, integer_target, lambda value: value * 2.5)
+                raise AssertionError("An exception was expected.")
+
+            except TypeError:
+                pass
+
+        finally:
+            nexus_remoting._buffers.numpy = numpy
+
+def can_schedule_interactive_work_before_bulk_work_test():
+
+    async def test():
+
+        # Arrange
+        scheduler = Scheduler(1, 1)
+        events = []
+        interactive_started = asyncio.Event()
+        release_interactive = asyncio.Event()
+
+        async def bulk(session: str, duration: float):
+            async with scheduler.bulk(session):
+                events.append(f"bulk {session}")
+                await asyncio.sleep(duration)
+
+        async def interactive():
+            async with scheduler.interactive():
+                events.append("interactive")
+                interactive_started.set()
+                await release_interactive.wait()
+
+        # Act
+        bulk_task1 = asyncio.create_task(bulk("a", 0.05))
+        await asyncio.sleep(0)
+        bulk_task2 = asyncio.create_task(bulk("b", 0))
+        interactive_task = asyncio.create_task(interactive())
+
+        # the running bulk unit finishes while the interactive work is still running
+        await interactive_started.wait()
+        await bulk_task1
+        await asyncio.sleep(0.05)
+        events.append("interactive finished")
+        release_interactive.set()
+
+        await asyncio.gather(bulk_task2, interactive_task)
+        scheduler.close()
+
+        # Assert
+        assert events == ["bulk a", "interactive", "interactive finished", "bulk b"]
+
+    asyncio.run(test())
+
+def can_walk_catalog_tree_sequentially_test():
+
+    # Arrange
+    class _DataSource:
+
+        def __init__(self):
+            self.is_busy = False
+
+        async def get_catalog_registrations(self, path: str):
+
+            assert not self.is_busy
+            self.is_busy = True
+            await asyncio.sleep(0)
+            self.is_busy = False
+
+            return {
+                "/": [CatalogRegistration("/A", ""), CatalogRegistration("/B", "", is_transient=True)],
+                "/A/": [CatalogRegistration("C", ""), CatalogRegistration("/A", "")]
+            }.get(path, [])
+
+        async def enrich_catalog(self, catalog):
+
+            assert not self.is_busy
+            self.is_busy = True
+            await asyncio.sleep(0)
+            self.is_busy = False
+
+            return catalog
+
+    # Act
+    actual = asyncio.run(get_catalog_tree(_DataSource(), "/", include_catalogs=True)) # pyright: ignore
+
+    # Assert
+    assert [node.path for node in actual.nodes] == ["/", "/A/", "/A/C/"]
+    assert [catalog.id for catalog in actual.catalogs] == ["/A", "/A/C"] # pyright: ignore
+
+def can_walk_deep_catalog_tree_test():
+
+    # Arrange
+    depth = 2 * sys.getrecursionlimit()
+
+    class _DataSource:
+
+        async def get_catalog_registrations(self, path: str):
+
+            level = path.count("/") - 1
+
+            # every catalog also registers its parent, which must not be walked again
+            return [CatalogRegistration("C", ""), CatalogRegistration("/C", "")] if level < depth else []
+
+        async def enrich_catalog(self, catalog):
+            return catalog
+
+    # Act
+    actual = asyncio.run(get_catalog_tree(_DataSource(), "/", include_catalogs=True)) # pyright: ignore
+
+    # Assert
+    assert len(actual.nodes) == depth + 1
+    assert len(actual.catalogs) == depth # pyright: ignore
+    assert actual.nodes[-1].path == "/C" * depth + "/"
+
+def can_get_read_slices_test():
+
+    # Arrange
+    begin = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    day = timedelta(days=1)
+    second = timedelta(seconds=1)
+
+    # Act
+    actual1 = get_read_slices(begin, begin + 4 * day, second, day, 4)
+    actual2 = get_read_slices(begin, begin + 4 * day, second, day, 2)
+    actual3 = get_read_slices(begin + day / 2, begin + day / 2 + day, second, day, 4)
+    actual4 = get_read_slices(begin + timedelta(hours=1), begin + timedelta(hours=2), second, day, 4)
+
+    # Assert
+    assert actual1 == [(0, 86400), (86400, 86400), (172800, 86400), (259200, 86400)]
+    assert actual2 == [(0, 172800), (172800, 172800)]
+    assert actual3 == [(0, 43200), (43200, 43200)]
+    assert actual4 == [(0, 3600)]
+
+def can_get_read_slices_with_uneven_sample_period_test():
+
+    # Arrange
+    begin = datetime(2020, 1, 1, 12, tzinfo=timezone.utc)
+    end = datetime(2020, 1, 4, 12, tzinfo=timezone.utc)
+    sample_period = timedelta(seconds=7)
+
+    # Act
+    actual = get_read_slices(begin, end, sample_period, timedelta(days=1), 4)
+
+    # Assert (the slices are disjoint and cover all samples, the boundaries are rounded down to the sample period)
+    assert actual == [(0, 6171), (6171, 12343), (18514, 12343), (30857, 6171)]
+    assert sum(count for _, count in actual) == (end - begin) // sample_period
+
+def can_raise_errors_of_read_slices_test():
+
+    # Arrange
+    finished_slices = []
+
+    class _DataSource:
+
+        async def read(self, begin, end, requests, read_data, report_progress):
+
+            if begin.second == 1:
+                raise ValueError("The slice could not be read.")
+
+            await asyncio.sleep(0.01)
+            finished_slices.append(begin)
+
+    async def test():
+
+        communicator = _create_communicator(asyncio.StreamReader())
+        communicator._data_source = _DataSource() # pyright: ignore
+
+        begin = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        catalog_item = SimpleNamespace(representation=SimpleNamespace(element_size=8))
+        (data, status) = (memoryview(bytearray(8 * 2)), memoryview(bytearray(2)))
+
+        # Act
+        try:
+            await communicator._read_slices(
+                begin, timedelta(seconds=1), "resource1", catalog_item, data, status, [(0, 1), (1, 1)], None) # pyright: ignore
+
+            raise AssertionError("An exception was expected.")
+
+        # Assert
+        except ValueError as ex:
+            assert str(ex) == "The slice could not be read."
+
+        # the other slice is not abandoned
+        assert finished_slices == [begin]
+
+    asyncio.run(test())
+
+def can_log_in_batches_test():
+
+    async def test():
+
+        # Arrange
+        writer = _Writer()
+        logger = _Logger(writer, LogLevel.Information, use_batches=True) # pyright: ignore
+        logger.FLUSH_INTERVAL = 0.01
+
+        # Act
+        logger.log(LogLevel.Debug, "dropped")
+        logger.log(LogLevel.Information, "message 1")
+        logger.log(LogLevel.Warning, "message 2")
+
+        is_sent_before_flush_interval = len(writer.data) > 0
+        await asyncio.sleep(0.05)
+        actual_messages1 = _read_messages(writer.data)
+
+        # a full batch is sent immediately
+        writer.data.clear()
+
+        for index in range(logger.BATCH_SIZE):
+            logger.log(LogLevel.Information, f"message {index}")
+
+        actual_messages2 = _read_messages(writer.data)
+
+        # Assert
+        assert not is_sent_before_flush_interval
+
+        assert actual_messages1 == [{
+            "jsonrpc": "2.0",
+            "method": "logBatch",
+            "params": [[
+                { "logLevel": "Information", "message": "message 1" },
+                { "logLevel": "Warning", "message": "message 2" }
+            ], 0]
+        }]
+
+        assert len(actual_messages2) == 1
+        assert len(actual_messages2[0]["params"][0]) == logger.BATCH_SIZE
+
+    asyncio.run(test())
+
+def can_read_nested_data_with_single_bulk_unit_test():
+
+    # Arrange
+    class _DataSource:
+
+        async def read(self, begin, end, requests, read_data, report_progress):
+            await read_data("/a/b/1_s", begin, end)
+            requests[0].status[:] = b"\x01"
+
+    async def test():
+
+        scheduler = Scheduler(1, 1)
+        communicator = _create_communicator(asyncio.StreamReader(), scheduler)
+        communicator._data_source = _DataSource() # pyright: ignore
+
+        # e.g. Nexus reads another resource of this agent to serve the readData call
+        async def read_data(resource_path: str, begin: datetime, end: datetime, buffer: Optional[memoryview] = None):
+            async with scheduler.bulk("other session"):
+                return memoryview(bytes(8)).cast("d")
+
+        begin = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        catalog_item = SimpleNamespace(representation=SimpleNamespace(element_size=8, sample_period=timedelta(seconds=1)))
+        (data, status) = (memoryview(bytearray(8)), memoryview(bytearray(1)))
+
+        # Act
+        await asyncio.wait_for(
+            communicator._fill_buffers(begin, begin + timedelta(seconds=1), "resource1", catalog_item, data, status, read_data), # pyright: ignore
+            timeout=5
+        )
+
+        scheduler.close()
+
+        # Assert
+        assert bytes(status) == b"\x01"
+        assert scheduler._bulk_count == 0
+
+    asyncio.run(test())
+
+def can_skip_prefetching_windows_that_end_in_the_future_test():
+
+    # Arrange
+    budget = PrefetchBudget(100)
+    prefetcher = Prefetcher(budget)
+    minute = timedelta(minutes=1)
+
+    async def read(begin: datetime, end: datetime):
+        raise AssertionError("The window must not be read.")
+
+    # the next window would end 30 seconds after now
+    begin = datetime.now(timezone.utc) - 2 * minute + timedelta(seconds=30)
+
+    # Act
+    prefetcher.track("key", begin, begin + minute, 10, read)
+    prefetcher.track("key", begin + minute, begin + 2 * minute, 10, read)
+
+    # Assert
+    assert prefetcher._pending is None
+    assert budget.size == 0